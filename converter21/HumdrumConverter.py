@@ -9,14 +9,20 @@
 # Copyright:     (c) 2021-2023 Greg Chapman
 # License:       MIT, see LICENSE
 # ------------------------------------------------------------------------------
+import typing as t
 from pathlib import Path
 
 from music21 import common
 from music21 import stream
 from music21.converter.subConverters import SubConverter
 
-from converter21.humdrum import HumdrumFile
-from converter21.humdrum import HumdrumWriter
+from converter21.shared import PhaseTimings
+from converter21.shared import ParseCache
+
+# converter21.humdrum is big, so it is only imported when a Humdrum file is actually
+# read or written (registering this subconverter doesn't need it).
+if t.TYPE_CHECKING:
+    from converter21.humdrum import HumdrumFile
 
 class HumdrumConverter(SubConverter):
     '''
@@ -37,17 +43,49 @@ class HumdrumConverter(SubConverter):
         dataString: str,
         number: int | None = None,
         acceptSyntaxErrors: bool = False,
+        collectTimings: bool = False,
+        keepSoundingPitch: bool = False,
+        parseCache: ParseCache | None = None,
         **_keywords
     ) -> stream.Score:
         '''
         Create HumdrumFile object from a string, and create a music21 Stream from it.
+        If collectTimings is True, the returned score's c21_timings attribute will be
+        a list of PhaseTiming (the wall time of each phase of the conversion).
+        If keepSoundingPitch is True, the score is left at sounding pitch (see
+        HumdrumFile.keepSoundingPitch).
+        If parseCache is specified, the score is fetched from (or added to) that cache.
         '''
+        if parseCache is not None:
+            return self._parseViaCache(
+                parseCache,
+                dataString,
+                lambda: self.parseData(
+                    dataString,
+                    number,
+                    acceptSyntaxErrors=acceptSyntaxErrors,
+                    collectTimings=collectTimings,
+                    keepSoundingPitch=keepSoundingPitch
+                ),
+                collectTimings,
+                acceptSyntaxErrors=acceptSyntaxErrors,
+                keepSoundingPitch=keepSoundingPitch
+            )
+
+        from converter21.humdrum import HumdrumFile
+
         # print("parsing krn string", file=sys.stderr)
         try:
-            hf = HumdrumFile(acceptSyntaxErrors=acceptSyntaxErrors)
-            hf.readString(dataString)
+            timings = PhaseTimings()
+            with timings.phase('read'):
+                hf = HumdrumFile(acceptSyntaxErrors=acceptSyntaxErrors)
+                hf.readString(dataString)
+            hf.phaseTimings = timings
+            hf.keepSoundingPitch = keepSoundingPitch
             self.stream = hf.createMusic21Stream()
             self.stream.c21_parse_err = hf.parseError  # type: ignore
+            if collectTimings:
+                self.stream.c21_timings = timings.phases  # type: ignore
             self.humdrumFile = hf
         except Exception as e:
             if not acceptSyntaxErrors:
@@ -66,18 +104,69 @@ class HumdrumConverter(SubConverter):
         filePath: str | Path,
         number: int | None = None,
         acceptSyntaxErrors: bool = False,
+        collectTimings: bool = False,
+        keepSoundingPitch: bool = False,
+        parseCache: ParseCache | None = None,
         **_keywords
     ) -> stream.Score:
         '''
         Create HumdrumFile object from a file path, and create a music21 Stream from it.
         Note that normally, implementing parseData is sufficient, but Humdrum files
         may be utf-8 or latin-1, so we need to handle various text encodings ourselves.
+        If collectTimings is True, the returned score's c21_timings attribute will be
+        a list of PhaseTiming (the wall time of each phase of the conversion).
+        If keepSoundingPitch is True, the score is left at sounding pitch (see
+        HumdrumFile.keepSoundingPitch).
+        If parseCache is specified, the score is fetched from (or added to) that cache.
         '''
+        if parseCache is not None:
+            with open(filePath, 'rb') as f:
+                dataBytes: bytes = f.read()
+            return self._parseViaCache(
+                parseCache,
+                dataBytes,
+                lambda: self._parseFileOrBytes(
+                    filePath,
+                    dataBytes,
+                    acceptSyntaxErrors,
+                    collectTimings,
+                    keepSoundingPitch
+                ),
+                collectTimings,
+                acceptSyntaxErrors=acceptSyntaxErrors,
+                keepSoundingPitch=keepSoundingPitch
+            )
+
+        return self._parseFileOrBytes(
+            filePath, None, acceptSyntaxErrors, collectTimings, keepSoundingPitch
+        )
+
+    def _parseFileOrBytes(
+        self,
+        filePath: str | Path,
+        dataBytes: bytes | None,
+        acceptSyntaxErrors: bool,
+        collectTimings: bool,
+        keepSoundingPitch: bool
+    ) -> stream.Score:
+        # Parses the file at filePath, or (if we have already read the file) its dataBytes.
+        from converter21.humdrum import HumdrumFile
+
         # print("parsing krn file", file=sys.stderr)
         try:
-            hf = HumdrumFile(fileName=filePath, acceptSyntaxErrors=acceptSyntaxErrors)
+            timings = PhaseTimings()
+            with timings.phase('read'):
+                if dataBytes is None:
+                    hf = HumdrumFile(fileName=filePath, acceptSyntaxErrors=acceptSyntaxErrors)
+                else:
+                    hf = HumdrumFile(acceptSyntaxErrors=acceptSyntaxErrors)
+                    hf.readBytes(dataBytes)
+            hf.phaseTimings = timings
+            hf.keepSoundingPitch = keepSoundingPitch
             self.stream = hf.createMusic21Stream()
             self.stream.c21_parse_err = hf.parseError  # type: ignore
+            if collectTimings:
+                self.stream.c21_timings = timings.phases  # type: ignore
             self.humdrumFile = hf
         except Exception as e:
             if not acceptSyntaxErrors:
@@ -90,6 +179,38 @@ class HumdrumConverter(SubConverter):
 
         return self.stream
 
+    def _parseViaCache(
+        self,
+        parseCache: ParseCache,
+        data: str | bytes,
+        parse: t.Callable[[], stream.Score],
+        collectTimings: bool,
+        **parseOptions: t.Any
+    ) -> stream.Score:
+        # parseOptions are the parse options that change the parse result (they are
+        # part of the cache key).  Note that on a cache hit, there is no self.humdrumFile.
+        timings = PhaseTimings()
+        key: str = parseCache.makeKey(data, 'humdrum', **parseOptions)
+        with timings.phase('cache read'):
+            cached: stream.Stream | None = parseCache.get(key)
+
+        if cached is not None:
+            if t.TYPE_CHECKING:
+                assert isinstance(cached, stream.Score)
+            self.humdrumFile = None
+            self.stream = cached
+        else:
+            score: stream.Score = parse()
+            # the cached score should not carry this parse's timings
+            timings.phases.extend(score.__dict__.pop('c21_timings', []))
+            with timings.phase('cache write'):
+                parseCache.put(key, score)
+            self.stream = score
+
+        if collectTimings:
+            self.stream.c21_timings = timings.phases  # type: ignore
+        return self.stream
+
     # pylint: disable=arguments-differ
     def write(
         self,
@@ -100,6 +221,7 @@ class HumdrumConverter(SubConverter):
         makeNotation=True,
         addRecipSpine=False,
         expandTremolos=True,
+        parallelStaves=False,
         **keywords
     ):
         if fp is None:
@@ -110,10 +232,13 @@ class HumdrumConverter(SubConverter):
         if not fp.suffix:
             fp = fp.with_suffix('.krn')
 
+        from converter21.humdrum import HumdrumWriter
+
         hdw = HumdrumWriter(obj)
         hdw.makeNotation = makeNotation
         hdw.addRecipSpine = addRecipSpine
         hdw.expandTremolos = expandTremolos
+        hdw.parallelStaves = parallelStaves
 
         with open(fp, 'w', encoding='utf8') as f:
             hdw.write(f)
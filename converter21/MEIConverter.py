@@ -18,8 +18,10 @@ from music21 import common
 
 from music21.converter.subConverters import SubConverter
 
-from converter21.mei import MeiReader
-from converter21.mei import MeiWriter
+from converter21.shared import ParseCache
+
+# converter21.mei is big, so it is only imported when a MEI file is actually read
+# or written (registering this subconverter doesn't need it).
 
 class MEIConverter(SubConverter):
     '''
@@ -33,22 +35,47 @@ class MEIConverter(SubConverter):
 
     def parseData(
         self,
-        dataString: str,
-        number: int | None = None
+        dataString: str | bytes,
+        number: int | None = None,
+        **keywords,
     ) -> stream.Score | stream.Part | stream.Opus:
         '''
-        Convert a string with an MEI document into its corresponding music21 elements.
+        Convert a string (or bytes) with an MEI document into its corresponding
+        music21 elements.
 
-        * dataString: The string with XML to convert.
+        * dataString: The string (or bytes) with XML to convert.
 
         * number: Unused in this class. Default is ``None``.
 
+        * releaseMeasureElements: If True, the MEI tree's <measure> elements are freed
+            as they are converted, to save memory on very large documents.  Default
+            is ``False``.
+
+        * parseCache: If specified (a ParseCache), the music21 elements are fetched
+            from that cache, or converted and then added to it.  Default is ``None``.
+
         Returns the music21 objects corresponding to the MEI file.
         '''
-        if dataString.startswith('mei:'):
+        if isinstance(dataString, str) and dataString.startswith('mei:'):
             dataString = dataString[4:]
 
-        self.stream = MeiReader(dataString).run()
+        parseCache: ParseCache | None = keywords.get('parseCache', None)
+        cacheKey: str = ''
+        cached: stream.Stream | None = None
+        if parseCache is not None:
+            cacheKey = parseCache.makeKey(dataString, 'mei')
+            cached = parseCache.get(cacheKey)
+
+        if cached is not None:
+            self.stream = cached
+        else:
+            from converter21.mei import MeiReader
+            self.stream = MeiReader(
+                dataString,
+                releaseMeasureElements=keywords.get('releaseMeasureElements', False)
+            ).run()
+            if parseCache is not None:
+                parseCache.put(cacheKey, self.stream)
 
         output: stream.Stream = self.stream
 
@@ -73,24 +100,18 @@ class MEIConverter(SubConverter):
 
         * number: Unused in this class. Default is ``None``.
 
+        * releaseMeasureElements, parseCache: See parseData.
+
         Returns the music21 objects corresponding to the MEI file.
         '''
-        # In Python 3 we try the three most likely encodings to work. (UTF-16 is outputted from
-        # "sibmei", the Sibelius-to-MEI exporter).  And sometimes latin-1 characters can work
-        # their way in.
-        dataStream: str
-        try:
-            with open(filePath, 'rt', encoding='utf-8') as f:
-                dataStream = f.read()
-        except UnicodeDecodeError:
-            try:
-                with open(filePath, 'rt', encoding='utf-16') as f:
-                    dataStream = f.read()
-            except UnicodeError:
-                with open(filePath, 'rt', encoding='latin-1') as f:
-                    dataStream = f.read()
-
-        self.parseData(dataStream, number)
+        # We read the file as bytes, and let the XML parser determine the encoding from
+        # the XML declaration (or BOM).  That handles UTF-8 and UTF-16 (which is outputted
+        # from "sibmei", the Sibelius-to-MEI exporter).  MeiReader falls back to latin-1
+        # if that fails, since sometimes latin-1 characters can work their way in.
+        with open(filePath, 'rb') as f:
+            dataBytes: bytes = f.read()
+
+        self.parseData(dataBytes, number, **keywords)
 
         if t.TYPE_CHECKING:
             # self.stream is a property defined in SubConverter, and it's not
@@ -108,6 +129,7 @@ class MEIConverter(SubConverter):
         subformats=None,
         makeNotation=True,
         meiVersion='5',
+        parallelStaves=False,
         **keywords
     ):
         if fp is None:
@@ -118,9 +140,12 @@ class MEIConverter(SubConverter):
         if not fp.suffix:
             fp = fp.with_suffix('.mei')
 
+        from converter21.mei import MeiWriter
+
         meiw = MeiWriter(obj)
         meiw.makeNotation = makeNotation
         meiw.meiVersion = meiVersion
+        meiw.parallelStaves = parallelStaves
 
         with open(fp, 'wt', encoding='utf-8') as f:
             meiw.write(f)
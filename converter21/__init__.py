@@ -18,14 +18,25 @@ __all__ = [
 ]
 
 import typing as t
+import importlib
 from enum import IntEnum, auto
 
+# HumdrumConverter and MEIConverter are small; they only import the (big) humdrum and
+# mei subpackages when they actually read or write something.  The subpackages
+# themselves are imported on first access (e.g. converter21.humdrum.HumdrumFile).
 from .HumdrumConverter import HumdrumConverter
 from .MEIConverter import MEIConverter
 from .shared import M21Utilities
 from .shared import StreamFreezer
 from .shared import StreamThawer
 
+_LAZY_SUBMODULES: tuple[str, ...] = ('humdrum', 'mei')
+
+def __getattr__(name: str) -> t.Any:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 class Music21VersionException(Exception):
     # raised if the version of music21 is not recent enough
     pass
@@ -11,75 +11,81 @@
 # ------------------------------------------------------------------------------
 #
 import argparse
+import functools
 import os
 import sys
 
 from music21 import converter
 from music21.base import VERSION_STR
 import converter21
+from converter21 import batchconvert
+from converter21.shared import PhaseTimings
+from converter21.shared import ParseCache
+
+@functools.cache
+def _subConvertersList(direction: str) -> tuple:
+    # direction is 'input' or 'output'.  Building a music21 Converter (and asking it
+    # for its subconverters) is not free, so we do it once per direction.  This must
+    # not be called before converter21.register().
+    return tuple(converter.Converter().subConvertersList(direction))
 
 def getInputFormatsList() -> list[str]:
-    c = converter.Converter()
-    inList = c.subConvertersList('input')
     result = []
-    for subc in inList:
+    for subc in _subConvertersList('input'):
         if subc.registerInputExtensions:  # if this subc supports input at all
             for form in subc.registerFormats:
                 result.append(form)
     return result
 
 def getInputExtensionsList() -> list[str]:
-    c = converter.Converter()
-    inList = c.subConvertersList('input')
     result = []
-    for subc in inList:
+    for subc in _subConvertersList('input'):
         for inputExt in subc.registerInputExtensions:
             result.append('.' + inputExt)
     return result
 
+def getInputExtensionsListForFormat(form: str) -> list[str]:
+    result = []
+    for subc in _subConvertersList('input'):
+        if form in subc.registerFormats:
+            for inputExt in subc.registerInputExtensions:
+                result.append('.' + inputExt)
+    return result
+
 def getOutputFormatsList() -> list[str]:
-    c = converter.Converter()
-    outList = c.subConvertersList('output')
     result = []
-    for subc in outList:
+    for subc in _subConvertersList('output'):
         if subc.registerOutputExtensions:  # if this subc supports output at all
             for form in subc.registerFormats:
                 result.append(form)
     return result
 
 def printSupportedFormats(whichList: str) -> None:  # whichList should be 'input' or 'output'
-    c = converter.Converter()
     if whichList == 'input':
-        inList = c.subConvertersList('input')
         print('Supported input formats are:', file=sys.stderr)
-        for subc in inList:
+        for subc in _subConvertersList('input'):
             if subc.registerInputExtensions:
                 print('\tformats   : ' + ', '.join(subc.registerFormats)
                         + '\textensions: ' + ', '.join(subc.registerInputExtensions),
                         file=sys.stderr)
     else:
-        outList = c.subConvertersList('output')
         print('Supported output formats are:', file=sys.stderr)
-        for subc in outList:
+        for subc in _subConvertersList('output'):
             if subc.registerOutputExtensions:
                 print('\tformats   : ' + ', '.join(subc.registerFormats)
                         + '\textensions: ' + ', '.join(subc.registerOutputExtensions),
                         file=sys.stderr)
 
 def getValidOutputExtensionForFormat(form: str) -> str:
-    c = converter.Converter()
-    outList = c.subConvertersList('output')
-    for subc in outList:
+    for subc in _subConvertersList('output'):
         if subc.registerOutputExtensions:
             if form in subc.registerFormats:
                 return '.' + subc.registerOutputExtensions[0]
     return ''
 
 def getOutputExtensionsListForFormat(form: str) -> list[str]:
-    c = converter.Converter()
-    outList = c.subConvertersList('output')
     result = []
-    for subc in outList:
+    for subc in _subConvertersList('output'):
         if subc.registerOutputExtensions:
             if form in subc.registerFormats:
                 for outputExt in subc.registerOutputExtensions:
@@ -87,10 +93,47 @@ def getOutputExtensionsListForFormat(form: str) -> list[str]:
     return result
 
 
+def makeParseCache(parsedArgs: argparse.Namespace) -> ParseCache:
+    # Only call this if the cache will actually be used: it creates the cache directory.
+    return ParseCache(
+        parsedArgs.parse_cache_dir, parsedArgs.parse_cache_max_mb * 1024 * 1024
+    )
+
+
 # ------------------------------------------------------------------------------
 
+def runServer(argv: list[str]) -> None:
+    from converter21 import conversionserver
+    serverParser = argparse.ArgumentParser(
+        prog='python3 -m converter21 serve',
+        description='Run a conversion server with a pool of warm worker processes'
+    )
+    where = serverParser.add_mutually_exclusive_group(required=True)
+    where.add_argument('--socket',
+                        help='path of the Unix domain socket to listen on')
+    where.add_argument('--port', type=int,
+                        help='localhost HTTP port to listen on (POST /convert?from=X&to=Y)')
+    serverParser.add_argument('-w', '--workers', type=int, default=None,
+                              help='number of worker processes (default is the number of CPUs)')
+    serverParser.add_argument('--max-jobs-per-worker', type=int,
+                              default=conversionserver.DEFAULT_MAX_JOBS_PER_WORKER,
+                              help='number of jobs a worker runs before it is replaced (default '
+                                  + f'{conversionserver.DEFAULT_MAX_JOBS_PER_WORKER})')
+    serverArgs = serverParser.parse_args(argv)
+    conversionserver.serve(
+        socketPath=serverArgs.socket,
+        port=serverArgs.port,
+        numWorkers=serverArgs.workers,
+        maxJobsPerWorker=serverArgs.max_jobs_per_worker
+    )
+
+
 # main entry point (parse arguments and do conversion)
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        runServer(sys.argv[2:])
+        sys.exit(0)
+
     # replace music21's built-in converters with ours (currently Humdrum read/write and MEI read)
     converter21.register()
 
@@ -100,11 +143,14 @@ if __name__ == "__main__":
     )
     parser.add_argument('input_file',
                         help='input music file to convert from (extension is used to determine '
-                            + 'input format if --input-from/-f is not specified)')
+                            + 'input format if --input-from/-f is not specified).  With --batch, '
+                            + 'a directory, a glob pattern, or @manifest (a file listing one '
+                            + 'input path per line)')
     parser.add_argument('output_file',
                         help='output music file to convert to (extension is NOT used to '
                             + 'determine/validate output format, so if you\'re not careful '
-                            + 'you\'ll end up with contents not matching extension)')
+                            + 'you\'ll end up with contents not matching extension).  With '
+                            + '--batch, the output directory')
     parser.add_argument('-f', '--input-from',
                         choices=getInputFormatsList(),
                         help='format of the input file (only necessary if input file has no '
@@ -113,11 +159,92 @@ if __name__ == "__main__":
                         choices=getOutputFormatsList(),
                         help='format of the output file (required)')
     parser.add_argument('-c', '--cached-parse-ok', action='store_true', default=False,
-                        help='use cached parse of input file if it exists')
+                        help='use cached parse of input file if it exists (for humdrum and '
+                            + 'mei input, the cache is keyed by the input file\'s contents, '
+                            + 'not its path)')
+    parser.add_argument('--parse-cache-dir',
+                        help='with --cached-parse-ok, directory of the humdrum/mei parse '
+                            + 'cache (default is converter21-parse-cache in the system\'s '
+                            + 'temporary directory)')
+    parser.add_argument('--parse-cache-max-mb', type=int, default=512,
+                        help='with --cached-parse-ok, maximum size of the humdrum/mei parse '
+                            + 'cache in MB (default 512); least recently used entries are '
+                            + 'removed beyond that')
+    parser.add_argument('-b', '--batch', action='store_true', default=False,
+                        help='convert many files: input_file is a directory, glob or @manifest, '
+                            + 'and output_file is an output directory')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='with --batch, number of worker processes to use (default 1)')
+    parser.add_argument('--report',
+                        help='with --batch, path of the JSON lines status report (default '
+                            + 'is batch_report.jsonl in the output directory)')
+    parser.add_argument('--resume', action='store_true', default=False,
+                        help='with --batch, skip input files already reported as \'ok\' in '
+                            + 'the status report, and append to that report')
+    parser.add_argument('--timings', action='store_true', default=False,
+                        help='print the wall time of each phase of the conversion to stderr '
+                            + '(not supported with --batch)')
 
     print('music21 version:', VERSION_STR, file=sys.stderr)
     args = parser.parse_args()
 
+    if args.batch and args.timings:
+        parser.error('--timings is not supported with --batch')
+
+    if args.batch:
+        # check validity of outputFormat
+        if args.output_to not in getOutputFormatsList():
+            print(f'Output format \'{args.output_to}\' not supported.', file=sys.stderr)
+            printSupportedFormats('output')
+            sys.exit(1)
+
+        if args.input_from is None:
+            batchInputExtensions = getInputExtensionsList()
+        else:
+            batchInputExtensions = getInputExtensionsListForFormat(args.input_from)
+
+        batchInputs = batchconvert.collectBatchInputs(args.input_file, batchInputExtensions)
+        if args.input_from is None:
+            # with no -f, each file's extension must tell us its format
+            batchInputs = [p for p in batchInputs if p.suffix.lower() in batchInputExtensions]
+        if not batchInputs:
+            print(f'No input files found in \'{args.input_file}\'.', file=sys.stderr)
+            sys.exit(1)
+
+        try:
+            batchOutputs = batchconvert.computeBatchOutputPaths(
+                batchInputs,
+                args.output_file,
+                getValidOutputExtensionForFormat(args.output_to)
+            )
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        reportPath = args.report
+        if reportPath is None:
+            reportPath = os.path.join(args.output_file, 'batch_report.jsonl')
+
+        parseCache: ParseCache | None = None
+        if args.cached_parse_ok and any(
+                batchconvert.formatSupportsParseCache(args.input_from, p) for p in batchInputs):
+            parseCache = makeParseCache(args)
+
+        counts = batchconvert.runBatch(
+            batchInputs,
+            batchOutputs,
+            args.input_from,
+            args.output_to,
+            reportPath,
+            jobs=args.jobs,
+            resume=args.resume,
+            cachedParseOk=args.cached_parse_ok,
+            parseCache=parseCache
+        )
+        print('Batch done: ' + ', '.join(f'{k}: {v}' for k, v in counts.items()),
+                file=sys.stderr)
+        print('Status report can be found in', reportPath, file=sys.stderr)
+        sys.exit(0)
+
     if args.input_from is None:
         # can't parse stdin without input_from
         if args.input_file == '-':
@@ -143,11 +270,27 @@ if __name__ == "__main__":
         # read into args.input_file the entire input as a string
         args.input_file = sys.stdin.read()
 
-    s = converter.parse(
-        args.input_file,
-        format=args.input_from,
-        forceSource=not args.cached_parse_ok
-    )
+    timings = PhaseTimings()
+    parseKeywords: dict = {}
+    if args.timings:
+        parseKeywords['collectTimings'] = True
+    if args.cached_parse_ok:
+        if batchconvert.formatSupportsParseCache(args.input_from, args.input_file):
+            # Our parse cache (content-addressed) replaces music21's (keyed by path)
+            # for formats that support it.
+            parseKeywords['parseCache'] = makeParseCache(args)
+            parseKeywords['forceSource'] = True
+        else:
+            parseKeywords['forceSource'] = False
+    else:
+        parseKeywords['forceSource'] = True
+
+    with timings.phase('parse'):
+        s = converter.parse(
+            args.input_file,
+            format=args.input_from,
+            **parseKeywords
+        )
 
     # check validity of outputFormat
     if args.output_to not in getOutputFormatsList():
@@ -169,7 +312,18 @@ if __name__ == "__main__":
             outputFile = outFileName + getValidOutputExtensionForFormat(args.output_to)
 
     # makeNotation=False only works with recent music21 v7
-    actualOutFile = s.write(fmt=args.output_to, fp=outputFile, makeNotation=False)
+    with timings.phase('write'):
+        actualOutFile = s.write(fmt=args.output_to, fp=outputFile, makeNotation=False)
+
+    if args.timings:
+        # If the parser collected its own (more detailed) timings, report those
+        # instead of the single 'parse' timing.
+        phases = timings.phases
+        parserPhases = getattr(s, 'c21_timings', None)
+        if parserPhases:
+            phases = parserPhases + phases[1:]
+        print(PhaseTimings.formatPhases(phases), file=sys.stderr)
+
     if outputFile is None:
         # read actualOutFile (a temp file in this case) into a string, and then write it to stdout
         with open(actualOutFile, encoding='utf-8') as f:
@@ -0,0 +1,321 @@
+# ------------------------------------------------------------------------------
+# Name:          batchconvert.py
+# Purpose:       Batch conversion of many music files, optionally fanned out
+#                across a pool of worker processes.
+#
+# Authors:       Greg Chapman <gregc@mac.com>
+#
+# Copyright:     (c) 2021-2025 Greg Chapman
+# License:       MIT, see LICENSE
+# ------------------------------------------------------------------------------
+import json
+import glob
+import os
+import sys
+import time
+import typing as t
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+if t.TYPE_CHECKING:
+    from converter21.shared import ParseCache
+
+# status values written to the batch report
+BATCH_STATUS_OK: str = 'ok'
+BATCH_STATUS_PARSE_ERROR: str = 'parse error'
+BATCH_STATUS_C21_PARSE_ERR: str = 'c21_parse_err'
+BATCH_STATUS_EXCEPTION: str = 'exception'
+
+# set once per worker process by initConversionWorker
+_workerIsRegistered: bool = False
+
+
+def collectBatchInputs(source: str, inputExtensions: t.Iterable[str]) -> list[Path]:
+    '''
+    Returns a sorted list of input files described by source, which can be:
+
+        a directory: all files (recursively) with one of the inputExtensions
+        '@manifest': a text file containing one input path per line (relative
+                     paths are relative to the manifest's directory; blank lines
+                     and lines starting with '#' are ignored)
+        a glob pattern: e.g. 'scores/**/*.krn'
+
+    inputExtensions should include the leading '.' (e.g. '.krn').
+    '''
+    exts: set[str] = {ext.lower() for ext in inputExtensions}
+    paths: list[Path] = []
+
+    if source.startswith('@'):
+        manifest: Path = Path(source[1:])
+        with open(manifest, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                p: Path = Path(line)
+                if not p.is_absolute():
+                    p = manifest.parent / p
+                paths.append(p)
+        return paths
+
+    if os.path.isdir(source):
+        for p in Path(source).rglob('*'):
+            if p.is_file() and p.suffix.lower() in exts:
+                paths.append(p)
+        return sorted(paths, key=str)
+
+    for pathStr in glob.glob(source, recursive=True):
+        p = Path(pathStr)
+        if p.is_file():
+            paths.append(p)
+    return sorted(paths, key=str)
+
+
+def computeBatchOutputPaths(
+    inputPaths: list[Path],
+    outputDir: str | Path,
+    outputExtension: str
+) -> list[Path]:
+    '''
+    Maps each input path to an output path in outputDir, preserving the directory
+    structure below the inputs' common parent directory, and replacing the file
+    extension with outputExtension (which should include the leading '.').
+
+    If that would give two inputs the same output path (e.g. 'a.krn' and 'a.mei'),
+    or would overwrite an input, the inputs involved keep their extension too
+    (e.g. 'a.krn.musicxml' and 'a.mei.musicxml').  Raises ValueError if there
+    are still any such clashes.
+    '''
+    if not inputPaths:
+        return []
+
+    def pathKey(path: str | Path) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    absInputs: list[str] = [os.path.abspath(p) for p in inputPaths]
+    commonDir: str = os.path.commonpath([os.path.dirname(p) for p in absInputs])
+    rels: list[Path] = [Path(os.path.relpath(absInput, commonDir)) for absInput in absInputs]
+    outputs: list[Path] = [Path(outputDir) / rel.with_suffix(outputExtension) for rel in rels]
+
+    inputKeys: set[str] = {pathKey(p) for p in absInputs}
+    outputCounts: dict[str, int] = {}
+    for output in outputs:
+        outputCounts[pathKey(output)] = outputCounts.get(pathKey(output), 0) + 1
+    for i, (rel, output) in enumerate(zip(rels, outputs)):
+        if outputCounts[pathKey(output)] > 1 or pathKey(output) in inputKeys:
+            outputs[i] = Path(outputDir) / rel.with_name(rel.name + outputExtension)
+
+    seen: set[str] = set()
+    for absInput, output in zip(absInputs, outputs):
+        if pathKey(output) in inputKeys or pathKey(output) in seen:
+            raise ValueError(
+                f'Output path \'{output}\' (for input \'{absInput}\') would overwrite '
+                'an input, or another output'
+            )
+        seen.add(pathKey(output))
+    return outputs
+
+
+def readBatchReport(reportPath: str | Path) -> dict[str, dict]:
+    '''
+    Reads an existing batch report (JSON lines), and returns the last record seen
+    for each input path.  Unparseable lines (e.g. a partial line written just before
+    a crash) are ignored.
+    '''
+    records: dict[str, dict] = {}
+    if not os.path.exists(reportPath):
+        return records
+
+    with open(reportPath, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and 'input' in record:
+                records[record['input']] = record
+    return records
+
+
+def initConversionWorker() -> None:
+    # Called once in each worker process, so we pay the import and registration
+    # cost once per process, not once per file.
+    global _workerIsRegistered  # pylint: disable=global-statement
+    if _workerIsRegistered:
+        return
+
+    import converter21
+    converter21.register()
+    _workerIsRegistered = True
+
+
+def formatSupportsParseCache(inputFormat: str | None, inputPath: str | Path) -> bool:
+    '''
+    Returns True if the input will be parsed by one of converter21's own
+    subconverters (Humdrum or MEI), which can use a ParseCache.  If inputFormat
+    is None, inputPath's extension determines the format.
+    '''
+    from converter21 import HumdrumConverter
+    from converter21 import MEIConverter
+    subConverters = (HumdrumConverter, MEIConverter)
+
+    if inputFormat is not None:
+        return any(inputFormat.lower() in subc.registerFormats for subc in subConverters)
+
+    ext: str = os.path.splitext(str(inputPath))[1].lower()
+    return any(ext[1:] in subc.registerInputExtensions for subc in subConverters)
+
+
+def convertOneFile(
+    inputPath: str,
+    outputPath: str,
+    inputFormat: str | None,
+    outputFormat: str,
+    cachedParseOk: bool = False,
+    parseCache: 'ParseCache | None' = None
+) -> dict[str, t.Any]:
+    '''
+    Converts one file, and returns a status record (a JSON-serializable dict)
+    describing what happened.  Never raises.
+
+    If cachedParseOk is True, Humdrum and MEI inputs are looked up in (or added to)
+    parseCache (a default ParseCache if parseCache is None), and other inputs may
+    use music21's own parse cache.
+    '''
+    from music21 import converter
+    initConversionWorker()
+
+    record: dict[str, t.Any] = {
+        'input': inputPath,
+        'output': outputPath,
+        'status': BATCH_STATUS_OK,
+    }
+    startTime: float = time.perf_counter()
+
+    parseKeywords: dict[str, t.Any] = {'forceSource': True}
+    if cachedParseOk:
+        if formatSupportsParseCache(inputFormat, inputPath):
+            if parseCache is None:
+                from converter21.shared import ParseCache
+                parseCache = ParseCache()
+            parseKeywords['parseCache'] = parseCache
+        else:
+            parseKeywords['forceSource'] = False
+
+    try:
+        s = converter.parse(inputPath, format=inputFormat, **parseKeywords)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        record['status'] = BATCH_STATUS_PARSE_ERROR
+        record['error'] = f'{type(e).__name__}: {e}'
+        record['seconds'] = round(time.perf_counter() - startTime, 3)
+        return record
+
+    parseErr: str = getattr(s, 'c21_parse_err', '') or ''
+
+    try:
+        os.makedirs(os.path.dirname(outputPath) or '.', exist_ok=True)
+        s.write(fmt=outputFormat, fp=outputPath, makeNotation=False)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        record['status'] = BATCH_STATUS_EXCEPTION
+        record['error'] = f'{type(e).__name__}: {e}'
+        record['seconds'] = round(time.perf_counter() - startTime, 3)
+        return record
+
+    if parseErr:
+        # we got output, but the parser had to work around syntax errors
+        record['status'] = BATCH_STATUS_C21_PARSE_ERR
+        record['error'] = parseErr
+
+    record['seconds'] = round(time.perf_counter() - startTime, 3)
+    return record
+
+
+def runBatch(
+    inputPaths: list[Path],
+    outputPaths: list[Path],
+    inputFormat: str | None,
+    outputFormat: str,
+    reportPath: str | Path,
+    jobs: int = 1,
+    resume: bool = False,
+    cachedParseOk: bool = False,
+    parseCache: 'ParseCache | None' = None
+) -> dict[str, int]:
+    '''
+    Converts every inputPaths[i] to outputPaths[i], writing one JSON line per file
+    to reportPath as each conversion finishes.  If resume is True, any input that
+    already has an 'ok' record in reportPath is skipped, and new records are appended.
+    jobs > 1 fans the conversions out across that many worker processes.
+    cachedParseOk and parseCache are as described in convertOneFile.
+
+    Returns a count of files per status (plus 'skipped').
+    '''
+    counts: dict[str, int] = {
+        BATCH_STATUS_OK: 0,
+        BATCH_STATUS_PARSE_ERROR: 0,
+        BATCH_STATUS_C21_PARSE_ERR: 0,
+        BATCH_STATUS_EXCEPTION: 0,
+        'skipped': 0,
+    }
+
+    alreadyDone: set[str] = set()
+    if resume:
+        for inputStr, record in readBatchReport(reportPath).items():
+            if record.get('status') == BATCH_STATUS_OK:
+                alreadyDone.add(inputStr)
+
+    todo: list[tuple[str, str]] = []
+    for inPath, outPath in zip(inputPaths, outputPaths):
+        if str(inPath) in alreadyDone:
+            counts['skipped'] += 1
+            continue
+        todo.append((str(inPath), str(outPath)))
+
+    reportDir: str = os.path.dirname(os.path.abspath(reportPath))
+    os.makedirs(reportDir, exist_ok=True)
+
+    with open(reportPath, 'a' if resume else 'w', encoding='utf-8') as report:
+        def writeRecord(record: dict[str, t.Any]) -> None:
+            counts[record['status']] += 1
+            report.write(json.dumps(record) + '\n')
+            # flush every record, so a killed run can be resumed accurately
+            report.flush()
+            print(f'{record["status"]}: {record["input"]}', file=sys.stderr)
+
+        if jobs <= 1:
+            for inPathStr, outPathStr in todo:
+                writeRecord(
+                    convertOneFile(
+                        inPathStr, outPathStr, inputFormat, outputFormat, cachedParseOk, parseCache
+                    )
+                )
+            return counts
+
+        # 'spawn' gives every worker a fresh interpreter (and the same behavior on
+        # all platforms); initConversionWorker then registers converter21 exactly once.
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=initConversionWorker
+        ) as executor:
+            futures = {
+                executor.submit(
+                    convertOneFile,
+                    inPathStr, outPathStr, inputFormat, outputFormat, cachedParseOk, parseCache
+                ): inPathStr
+                for inPathStr, outPathStr in todo
+            }
+            for future in as_completed(futures):
+                try:
+                    record = future.result()
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    # the worker process itself died (e.g. out of memory)
+                    record = {
+                        'input': futures[future],
+                        'status': BATCH_STATUS_EXCEPTION,
+                        'error': f'{type(e).__name__}: {e}',
+                    }
+                writeRecord(record)
+
+    return counts
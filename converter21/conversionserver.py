@@ -0,0 +1,316 @@
+# ------------------------------------------------------------------------------
+# Name:          conversionserver.py
+# Purpose:       A long-running conversion server, with a pool of warm worker
+#                processes (music21 imported, converter21 registered), accepting
+#                conversion jobs over a Unix domain socket or localhost HTTP.
+#
+# Authors:       Greg Chapman <gregc@mac.com>
+#
+# Copyright:     (c) 2021-2025 Greg Chapman
+# License:       MIT, see LICENSE
+# ------------------------------------------------------------------------------
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import typing as t
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from converter21.batchconvert import initConversionWorker
+
+# Socket protocol (one job per connection):
+#   request:  one line of JSON, e.g. {"from": "humdrum", "to": "mei", "length": 1234},
+#             followed by exactly "length" bytes of source data.
+#   response: one line of JSON, either {"status": "ok", "length": 5678} followed by
+#             exactly "length" bytes of converted data, or {"status": "error",
+#             "error": "..."} with nothing following.
+#
+# HTTP protocol:
+#   POST /convert?from=humdrum&to=mei with the source data as the request body.
+#   Response is 200 with the converted data as the body, or 500 with the error
+#   message as the body.  A bad request gets a 400 (or a 411 if Content-Length
+#   is missing), with the problem as the body.
+
+_CHUNK_SIZE: int = 65536
+
+# default number of jobs a worker runs before it is replaced with a fresh one
+DEFAULT_MAX_JOBS_PER_WORKER: int = 100
+
+
+class ConversionServerError(Exception):
+    # raised by requestConversion if the server reports a conversion error
+    pass
+
+
+def _decodeText(data: bytes, encodings: tuple[str, ...]) -> str:
+    for encoding in encodings[:-1]:
+        try:
+            return data.decode(encoding)
+        except UnicodeError:
+            pass
+    return data.decode(encodings[-1])
+
+
+def convertData(
+    sourceData: bytes,
+    fromFormat: str,
+    toFormat: str,
+    makeNotation: bool = False
+) -> bytes:
+    '''
+    Converts sourceData (in fromFormat) to toFormat, and returns the converted data.
+    Humdrum and MEI are handled directly by converter21's converters and writers;
+    all other formats go through music21's converter.
+    '''
+    from music21 import converter
+    from music21 import stream
+    from converter21 import HumdrumConverter
+    from converter21 import MEIConverter
+    from converter21.humdrum import HumdrumWriter
+    from converter21.mei import MeiWriter
+
+    initConversionWorker()
+
+    score: stream.Score
+    if fromFormat == 'humdrum':
+        score = HumdrumConverter().parseData(_decodeText(sourceData, ('utf-8', 'latin-1')))
+    elif fromFormat == 'mei':
+        # same encodings (in the same order) that MEIConverter.parseFile tries
+        score = MEIConverter().parseData(  # type: ignore
+            _decodeText(sourceData, ('utf-8', 'utf-16', 'latin-1'))
+        )
+    else:
+        # some formats (e.g. compressed musicxml) are binary, so parse from a file
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(sourceData)
+            tempPath: str = f.name
+        try:
+            score = converter.parse(tempPath, format=fromFormat, forceSource=True)
+        finally:
+            os.remove(tempPath)
+
+    if toFormat in ('humdrum', 'mei'):
+        output = io.StringIO()
+        writer: HumdrumWriter | MeiWriter
+        if toFormat == 'humdrum':
+            writer = HumdrumWriter(score)
+        else:
+            writer = MeiWriter(score)
+        writer.makeNotation = makeNotation
+        writer.write(output)
+        return output.getvalue().encode('utf-8')
+
+    outPath = score.write(fmt=toFormat, makeNotation=makeNotation)
+    try:
+        with open(outPath, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(outPath)
+
+
+def _convertJob(
+    sourceData: bytes,
+    fromFormat: str,
+    toFormat: str
+) -> tuple[bool, bytes | str]:
+    # runs in a worker process; never raises
+    try:
+        return True, convertData(sourceData, fromFormat, toFormat)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return False, f'{type(e).__name__}: {e}'
+
+
+class ConversionServer:
+    '''
+    Owns the pool of warm worker processes.  Each worker registers converter21 once,
+    and is replaced with a fresh worker after maxJobsPerWorker jobs, to bound memory
+    growth.  convert() may be called from any number of threads at once.
+    '''
+    def __init__(
+        self,
+        numWorkers: int | None = None,
+        maxJobsPerWorker: int = DEFAULT_MAX_JOBS_PER_WORKER
+    ) -> None:
+        self.pool = multiprocessing.get_context('spawn').Pool(
+            processes=numWorkers,
+            initializer=initConversionWorker,
+            maxtasksperchild=maxJobsPerWorker
+        )
+
+    def convert(
+        self,
+        sourceData: bytes,
+        fromFormat: str,
+        toFormat: str
+    ) -> tuple[bool, bytes | str]:
+        return self.pool.apply(_convertJob, (sourceData, fromFormat, toFormat))
+
+    def close(self) -> None:
+        self.pool.close()
+        self.pool.join()
+
+
+class _SocketJobHandler(socketserver.StreamRequestHandler):
+    server: '_UnixConversionServer'
+
+    def handle(self) -> None:
+        try:
+            header: dict = json.loads(self.rfile.readline())
+            length: int = int(header['length'])
+            sourceData: bytes = self.rfile.read(length)
+            if len(sourceData) != length:
+                raise ValueError('source data shorter than "length"')
+            ok, result = self.server.conversionServer.convert(
+                sourceData, header['from'], header['to']
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            ok, result = False, f'bad request: {type(e).__name__}: {e}'
+
+        if not ok:
+            self._writeHeader({'status': 'error', 'error': result})
+            return
+
+        if t.TYPE_CHECKING:
+            assert isinstance(result, bytes)
+        self._writeHeader({'status': 'ok', 'length': len(result)})
+        for i in range(0, len(result), _CHUNK_SIZE):
+            self.wfile.write(result[i:i + _CHUNK_SIZE])
+
+    def _writeHeader(self, header: dict) -> None:
+        self.wfile.write(json.dumps(header).encode('utf-8') + b'\n')
+
+
+class _UnixConversionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socketPath: str, conversionServer: ConversionServer) -> None:
+        super().__init__(socketPath, _SocketJobHandler)
+        self.conversionServer = conversionServer
+
+
+class _HttpJobHandler(BaseHTTPRequestHandler):
+    server: '_HttpConversionServer'
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        url = urlparse(self.path)
+        query: dict[str, list[str]] = parse_qs(url.query)
+        if url.path != '/convert' or 'from' not in query or 'to' not in query:
+            self._respond(400, b'expected POST /convert?from=<format>&to=<format>')
+            return
+
+        lengthStr: str | None = self.headers.get('Content-Length')
+        if lengthStr is None:
+            self._respond(411, b'Content-Length is required')
+            return
+        try:
+            length: int = int(lengthStr)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._respond(400, b'Content-Length must be a non-negative integer')
+            return
+
+        sourceData: bytes = self.rfile.read(length)
+        if len(sourceData) != length:
+            self._respond(400, b'request body shorter than Content-Length')
+            return
+
+        ok, result = self.server.conversionServer.convert(
+            sourceData, query['from'][0], query['to'][0]
+        )
+        if ok:
+            if t.TYPE_CHECKING:
+                assert isinstance(result, bytes)
+            self._respond(200, result)
+        else:
+            if t.TYPE_CHECKING:
+                assert isinstance(result, str)
+            self._respond(500, result.encode('utf-8'))
+
+    def _respond(self, code: int, body: bytes) -> None:
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        for i in range(0, len(body), _CHUNK_SIZE):
+            self.wfile.write(body[i:i + _CHUNK_SIZE])
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+        print(format % args, file=sys.stderr)
+
+
+class _HttpConversionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, conversionServer: ConversionServer) -> None:
+        # localhost only: this is not meant to be exposed to the network
+        super().__init__(('127.0.0.1', port), _HttpJobHandler)
+        self.conversionServer = conversionServer
+
+
+def serve(
+    socketPath: str | None = None,
+    port: int | None = None,
+    numWorkers: int | None = None,
+    maxJobsPerWorker: int = DEFAULT_MAX_JOBS_PER_WORKER
+) -> None:
+    '''
+    Runs the conversion server until interrupted.  Exactly one of socketPath (a Unix
+    domain socket path) or port (a localhost HTTP port) must be specified.
+    '''
+    if (socketPath is None) == (port is None):
+        raise ValueError('serve needs exactly one of socketPath or port')
+
+    conversionServer = ConversionServer(numWorkers, maxJobsPerWorker)
+    server: socketserver.BaseServer
+    try:
+        if socketPath is not None:
+            if os.path.exists(socketPath):
+                os.remove(socketPath)
+            server = _UnixConversionServer(socketPath, conversionServer)
+            print(f'converter21 server listening on {socketPath}', file=sys.stderr)
+        else:
+            assert port is not None
+            server = _HttpConversionServer(port, conversionServer)
+            print(f'converter21 server listening on http://127.0.0.1:{port}/convert',
+                    file=sys.stderr)
+
+        with server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    finally:
+        conversionServer.close()
+        if socketPath is not None and os.path.exists(socketPath):
+            os.remove(socketPath)
+
+
+def requestConversion(
+    socketPath: str,
+    sourceData: bytes,
+    fromFormat: str,
+    toFormat: str
+) -> bytes:
+    '''
+    Client side of the Unix domain socket protocol: sends one conversion job to the
+    server listening on socketPath, and returns the converted data.  Raises
+    ConversionServerError if the conversion failed.
+    '''
+    header: dict[str, t.Any] = {'from': fromFormat, 'to': toFormat, 'length': len(sourceData)}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socketPath)
+        with sock.makefile('rwb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            f.write(sourceData)
+            f.flush()
+            response: dict = json.loads(f.readline())
+            if response.get('status') != 'ok':
+                raise ConversionServerError(response.get('error', 'unknown error'))
+            result: bytes = f.read(int(response['length']))
+    return result
@@ -18,6 +18,7 @@ from .gridcommon import FermataStyle
 
 from .humnum import HumNum, HumNumIn
 from .convert import Convert
+from .convert import KernPitch
 from .humaddress import HumAddress
 from .humhash import HumHash
 from .humparamset import HumParamSet
@@ -30,6 +31,7 @@ from .humdrumfilebase import HumdrumFileBase, TokenPair
 from .humdrumfilestructure import HumdrumFileStructure
 from .humdrumfilecontent import HumdrumFileContent
 from .humdrumfile import HumdrumFile
+from .textonlyhumdrumfile import TextOnlyHumdrumFile, TextOnlyHumdrumLine
 
 from .humdrumtools import ToolTremolo
 
@@ -11,9 +11,11 @@
 # ------------------------------------------------------------------------------
 
 import sys
+import typing as t
 import re
 import math
 from fractions import Fraction
+from functools import lru_cache
 
 from music21.common import opFrac
 
@@ -23,6 +25,43 @@ from converter21.humdrum import FermataStyle
 from converter21.humdrum import HumNum, HumNumIn
 from converter21.humdrum import HumdrumInternalError
 
+# Maximum number of entries in each of the rhythm parsing caches (recipToDuration et al).
+# Distinct rhythms in real scores number in the dozens, so this is only reached by
+# long-lived processes that see pathological input.
+RHYTHM_CACHE_SIZE: int = 4096
+
+# Maximum number of distinct **kern subtokens whose decoded pitch is cached (Convert.kernToPitch).
+KERN_PITCH_CACHE_SIZE: int = 4096
+
+class KernPitch(t.NamedTuple):
+    '''
+        The decoded pitch of the first subtoken of a **kern token (see Convert.kernToPitch).
+        Each field has the same value (including the negative "no pitch" values) as the
+        corresponding Convert.kernTo* function.
+    '''
+    diatonic: int       # Convert.kernToDiatonicPC
+    octave: int         # Convert.kernToOctaveNumber
+    accidentals: int    # Convert.kernToAccidentalCount
+    base7: int          # Convert.kernToBase7
+    base40: int         # Convert.kernToBase40
+    base40PC: int       # Convert.kernToBase40PC
+    base12PC: int       # Convert.kernToBase12PC
+    midi: int           # Convert.kernToMidiNoteNumber
+
+# kern pitch letter -> (diatonic pitch class, isUpperCase)
+_KERN_PITCH_LETTERS: dict[str, tuple[int, bool]] = {
+    'c': (0, False), 'd': (1, False), 'e': (2, False), 'f': (3, False),
+    'g': (4, False), 'a': (5, False), 'b': (6, False),
+    'C': (0, True), 'D': (1, True), 'E': (2, True), 'F': (3, True),
+    'G': (4, True), 'A': (5, True), 'B': (6, True),
+}
+
+# diatonic pitch class -> base40 pitch class (without accidentals, C-flat-flat == 0)
+_DIATONIC_TO_BASE40PC: tuple[int, ...] = (2, 8, 14, 19, 25, 31, 37)
+
+# diatonic pitch class -> base12 pitch class (without accidentals)
+_DIATONIC_TO_BASE12PC: tuple[int, ...] = (0, 2, 4, 5, 7, 9, 11)
+
 class Convert:
 
     '''
@@ -45,19 +84,15 @@ class Convert:
     //     along with the rhythm can also be given and will be ignored.
     // default value: scale = 4 (duration in terms of quarter notes)
     // default value: separator = " " (sub-token separator)
-    '''
-    # key is recip, value is duration
-    _knownRecipDurationCache: dict[str, HumNum] = {}
 
+        Results are cached (keyed by recip and scale); see Convert.rhythmCacheInfo().
+    '''
     @staticmethod
+    @lru_cache(maxsize=RHYTHM_CACHE_SIZE)
     def recipToDuration(recip: str, scale: HumNumIn = opFrac(4)) -> HumNum:
-        if recip in Convert._knownRecipDurationCache:
-            return Convert._knownRecipDurationCache[recip]
-
         output: HumNum = opFrac(0)
         if 'q' in recip:
             # grace note, ignore printed rhythm
-            Convert._knownRecipDurationCache[recip] = output
             return output  # 0
 
         subToken = recip.split(' ')[0]  # we're only interested in the first subtoken
@@ -71,8 +106,6 @@ class Convert:
             m = re.search(r'([\d]+)', subToken)
             if m is None:
                 # no rhythm found
-                # don't fill cache with bad strings
-                # Convert._knownRecipDurationCache[recip] = output
                 return output
 
             if m.group(1).startswith('0'):
@@ -98,7 +131,6 @@ class Convert:
             dotFactor = opFrac(dotFactor)
 
         output = opFrac(output * dotFactor * scale)
-        Convert._knownRecipDurationCache[recip] = output
         return output
 
     '''
@@ -108,8 +140,9 @@ class Convert:
     //   any augmentation dots.
     '''
     @staticmethod
+    @lru_cache(maxsize=RHYTHM_CACHE_SIZE)
     def recipToDurationNoDots(recip: str, scale: HumNumIn = opFrac(4)) -> HumNum:
-        recipNoDots: str = re.sub(r'\.', 'Z', recip)
+        recipNoDots: str = recip.replace('.', 'Z')
         return Convert.recipToDuration(recipNoDots, scale)
 
     '''
@@ -128,9 +161,13 @@ class Convert:
         tok: HumdrumToken = token
         if not tok.isTimeSignature:
             return opFrac(0)
+        return Convert._timeSigTextToDuration(tok.text, scale)
 
+    @staticmethod
+    @lru_cache(maxsize=RHYTHM_CACHE_SIZE)
+    def _timeSigTextToDuration(text: str, scale: HumNumIn) -> HumNum:
         # LATER: Handle extended **recip for time signature denominator
-        m = re.search(r'^\*M(\d+)/(\d+)', tok.text)
+        m = re.search(r'^\*M(\d+)/(\d+)', text)
         if m is None:
             return opFrac(0)
 
@@ -196,6 +233,32 @@ class Convert:
         # so assume that it is not simple:
         return str(durFraction.denominator) + '%' + str(durFraction.numerator)
 
+    '''
+        rhythmCacheInfo returns the hit/miss/size statistics (functools CacheInfo) of
+        each of the rhythm parsing caches, keyed by function name.  clearRhythmCaches
+        empties them (and resets the statistics).
+    '''
+    @staticmethod
+    def _rhythmCachedFunctions() -> dict[str, t.Any]:
+        return {
+            'recipToDuration': Convert.recipToDuration,
+            'recipToDurationNoDots': Convert.recipToDurationNoDots,
+            'timeSigToDuration': Convert._timeSigTextToDuration,
+            'mensToDuration': Convert.mensToDuration,
+            'mensToDurationNoDots': Convert.mensToDurationNoDots,
+        }
+
+    @staticmethod
+    def rhythmCacheInfo() -> dict[str, t.Any]:
+        return {
+            name: func.cache_info() for name, func in Convert._rhythmCachedFunctions().items()
+        }
+
+    @staticmethod
+    def clearRhythmCaches() -> None:
+        for func in Convert._rhythmCachedFunctions().values():
+            func.cache_clear()
+
     '''
         *** Mensural notation ***
     '''
@@ -222,6 +285,7 @@ class Convert:
     //                separator = " " (space between chord notes)
     '''
     @staticmethod
+    @lru_cache(maxsize=RHYTHM_CACHE_SIZE)
     def mensToDuration(text: str) -> HumNum:
         output: HumNum = opFrac(0)
         perfect: bool = False
@@ -274,6 +338,7 @@ class Convert:
     // Convert::mensToDurationNoDots -- The imperfect duration of the **mens rhythm.
     '''
     @staticmethod
+    @lru_cache(maxsize=RHYTHM_CACHE_SIZE)
     def mensToDurationNoDots(text: str) -> HumNum:
         output: HumNum = opFrac(0)
         for ch in text:
@@ -830,6 +895,80 @@ class Convert:
         *** pitch ***
     '''
 
+    '''
+        kernToPitch decodes the pitch of the first subtoken of a **kern token in a
+        single pass, and returns all the various pitch representations at once.
+        Results are cached per distinct subtoken, so repeated calls for the same
+        note (e.g. during accidental and tie analysis) are cheap.
+    '''
+    @staticmethod
+    def kernToPitch(text: str) -> KernPitch:
+        if ' ' in text:
+            text = text[:text.index(' ')]
+        return Convert._kernSubtokenToPitch(text)
+
+    @staticmethod
+    @lru_cache(maxsize=KERN_PITCH_CACHE_SIZE)
+    def _kernSubtokenToPitch(text: str) -> KernPitch:
+        diatonic: int = -2000
+        ucCount: int = 0
+        lcCount: int = 0
+        accid: int = 0
+        sawRest: bool = False
+
+        for ch in text:
+            letter: tuple[int, bool] | None = _KERN_PITCH_LETTERS.get(ch)
+            if letter is not None:
+                if diatonic == -2000:
+                    diatonic = letter[0]
+                if letter[1]:
+                    ucCount += 1
+                else:
+                    lcCount += 1
+            elif ch == '-':
+                accid -= 1
+            elif ch == '#':
+                accid += 1
+            elif ch == 'r':
+                if diatonic == -2000:
+                    diatonic = -1000
+                sawRest = True
+
+        octave: int = -1000
+        if not sawRest:
+            if ucCount > 0 and lcCount == 0:
+                octave = 4 - ucCount
+            elif lcCount > 0 and ucCount == 0:
+                octave = 3 + lcCount
+
+        base7: int
+        base40: int
+        base40PC: int
+        base12PC: int
+        if diatonic < 0:
+            base7 = diatonic
+            base40 = diatonic
+            base40PC = diatonic
+            base12PC = diatonic
+        else:
+            base7 = diatonic + (7 * octave)
+            base40PC = _DIATONIC_TO_BASE40PC[diatonic] + accid
+            base40 = base40PC if base40PC < 0 else base40PC + (40 * octave)
+            base12PC = _DIATONIC_TO_BASE12PC[diatonic] + accid
+
+        midi: int = base12PC + (12 * (octave + 1))
+
+        return KernPitch(
+            diatonic=diatonic,
+            octave=octave,
+            accidentals=accid,
+            base7=base7,
+            base40=base40,
+            base40PC=base40PC,
+            base12PC=base12PC,
+            midi=midi
+        )
+
     '''
     //////////////////////////////
     //
@@ -838,12 +977,7 @@ class Convert:
     '''
     @staticmethod
     def kernToBase40(text: str) -> int:
-        pc: int = Convert.kernToBase40PC(text)
-        if pc < 0:
-            return pc
-
-        octave: int = Convert.kernToOctaveNumber(text)
-        return pc + (40 * octave)
+        return Convert.kernToPitch(text).base40
 
     '''
     //////////////////////////////
@@ -853,29 +987,7 @@ class Convert:
     '''
     @staticmethod
     def kernToBase40PC(text: str) -> int:
-        diatonic = Convert.kernToDiatonicPC(text)
-        if diatonic < 0:
-            return diatonic
-
-        accID = Convert.kernToAccidentalCount(text)
-        output: int = -1000
-        if diatonic == 0:
-            output = 0
-        elif diatonic == 1:
-            output = 6
-        elif diatonic == 2:
-            output = 12
-        elif diatonic == 3:
-            output = 17
-        elif diatonic == 4:
-            output = 23
-        elif diatonic == 5:
-            output = 29
-        elif diatonic == 6:
-            output = 35
-
-        output += accID
-        return output + 2   # +2 to make C-flat-flat == 0 (bottom of octave)
+        return Convert.kernToPitch(text).base40PC
 
     '''
     //////////////////////////////
@@ -887,34 +999,7 @@ class Convert:
     '''
     @staticmethod
     def kernToOctaveNumber(text: str) -> int:
-        ucCount: int = 0
-        lcCount: int = 0
-
-        if text == '.':
-            return -1000
-
-        for ch in text:
-            if ch == ' ':
-                break
-            if ch == 'r':
-                return -1000
-
-            if ch in 'ABCDEFG':
-                ucCount += 1
-            if ch in 'abcdefg':
-                lcCount += 1
-
-        if ucCount > 0 and lcCount > 0:
-            # invalid pitch description
-            return -1000
-
-        if ucCount > 0:
-            return 4 - ucCount
-
-        if lcCount > 0:
-            return 3 + lcCount
-
-        return -1000
+        return Convert.kernToPitch(text).octave
 
     '''
     //////////////////////////////
@@ -925,28 +1010,8 @@ class Convert:
     '''
     @staticmethod
     def kernToBase12PC(text: str) -> int:
-        diatonic: int = Convert.kernToDiatonicPC(text)
-        if diatonic < 0:
-            return diatonic
-
-        accid: int = Convert.kernToAccidentalCount(text)
-        output: int = -1000
-        if diatonic == 0:
-            output = 0
-        elif diatonic == 1:
-            output = 2
-        elif diatonic == 2:
-            output = 4
-        elif diatonic == 3:
-            output = 5
-        elif diatonic == 4:
-            output = 7
-        elif diatonic == 5:
-            output = 9
-        elif diatonic == 6:
-            output = 11
+        return Convert.kernToPitch(text).base12PC
 
-        return output + accid
     '''
     ///////////////////////////////
     //
@@ -956,9 +1021,7 @@ class Convert:
     '''
     @staticmethod
     def kernToMidiNoteNumber(text: str) -> int:
-        pc: int = Convert.kernToBase12PC(text)
-        octave: int = Convert.kernToOctaveNumber(text)
-        return pc + (12 * (octave + 1))
+        return Convert.kernToPitch(text).midi
 
     '''
     //////////////////////////////
@@ -972,17 +1035,7 @@ class Convert:
     '''
     @staticmethod
     def kernToAccidentalCount(text: str) -> int:
-        output: int = 0
-        for ch in text:
-            if ch == ' ':
-                break
-
-            if ch == '-':
-                output -= 1
-            elif ch == '#':
-                output += 1
-
-        return output
+        return Convert.kernToPitch(text).accidentals
 
     '''
     //////////////////////////////
@@ -994,28 +1047,7 @@ class Convert:
     '''
     @staticmethod
     def kernToDiatonicPC(text: str) -> int:
-        for ch in text:
-            if ch == ' ':
-                break
-            if ch == 'r':
-                return -1000
-
-            if ch in 'cC':
-                return 0
-            if ch in 'dD':
-                return 1
-            if ch in 'eE':
-                return 2
-            if ch in 'fF':
-                return 3
-            if ch in 'gG':
-                return 4
-            if ch in 'aA':
-                return 5
-            if ch in 'bB':
-                return 6
-
-        return -2000
+        return Convert.kernToPitch(text).diatonic
 
     '''
     //////////////////////////////
@@ -1156,12 +1188,7 @@ class Convert:
     '''
     @staticmethod
     def kernToBase7(text: str) -> int:
-        diatonic: int = Convert.kernToDiatonicPC(text)
-        if diatonic < 0:
-            return diatonic
-
-        octave: int = Convert.kernToOctaveNumber(text)
-        return diatonic + (7 * octave)
+        return Convert.kernToPitch(text).base7
 
     '''
     //////////////////////////////
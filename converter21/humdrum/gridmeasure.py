@@ -14,6 +14,8 @@
 # ------------------------------------------------------------------------------
 import sys
 import typing as t
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
 
 from music21.common import opFrac
 
@@ -22,6 +24,7 @@ from converter21.humdrum import HumNum, HumNumIn
 from converter21.humdrum import HumdrumToken
 # from converter21.humdrum import HumdrumLine
 from converter21.humdrum import HumdrumFile
+from converter21.humdrum import TextOnlyHumdrumFile
 
 from converter21.humdrum import MeasureStyle
 from converter21.humdrum import FermataStyle
@@ -45,6 +48,8 @@ from converter21.humdrum import GridSlice
 funcName = lambda n=0: sys._getframe(n + 1).f_code.co_name + ':'  # pragma no cover
 # pylint: enable=protected-access
 
+_sliceTimestamp = attrgetter('timestamp')
+
 class GridMeasure:
     def __init__(self, ownerGrid) -> None:
         from converter21.humdrum import HumGrid
@@ -99,6 +104,44 @@ class GridMeasure:
     def timeSigDur(self, newTimeSigDur: HumNumIn) -> None:
         self._timeSigDur = opFrac(newTimeSigDur)
 
+    '''
+        self.slices is always kept sorted by timestamp (slices with the same
+        timestamp are in the order they must be output), so we can find the
+        slices at a particular timestamp with a binary search, instead of
+        walking the list from the start.
+    '''
+    def sliceIndexAtOrAfter(self, timestamp: HumNumIn) -> int:
+        # index of first slice with slice.timestamp >= timestamp
+        # (len(self.slices) if there is no such slice)
+        return bisect_left(self.slices, opFrac(timestamp), key=_sliceTimestamp)
+
+    def sliceIndexAfter(self, timestamp: HumNumIn) -> int:
+        # index of first slice with slice.timestamp > timestamp
+        # (len(self.slices) if there is no such slice)
+        return bisect_right(self.slices, opFrac(timestamp), key=_sliceTimestamp)
+
+    def insertSliceByTimestamp(self, theSlice: GridSlice) -> None:
+        # inserts theSlice after any other slices with the same timestamp
+        self.slices.insert(self.sliceIndexAfter(theSlice.timestamp), theSlice)
+
+    def sliceIndex(self, theSlice: GridSlice) -> int | None:
+        # Returns the index of theSlice in self.slices (None if not found).
+        # Only the slices at theSlice.timestamp are searched, unless theSlice
+        # isn't there (e.g. its timestamp has been changed, or it isn't in this
+        # measure at all), in which case we fall back to searching everything.
+        ts: HumNum = theSlice.timestamp
+        for idx in range(self.sliceIndexAtOrAfter(ts), len(self.slices)):
+            gridSlice: GridSlice = self.slices[idx]
+            if gridSlice is theSlice:
+                return idx
+            if gridSlice.timestamp != ts:
+                break
+
+        for idx in range(len(self.slices) - 1, -1, -1):
+            if self.slices[idx] is theSlice:
+                return idx
+        return None
+
     '''
     //////////////////////////////
     //
@@ -174,7 +217,8 @@ class GridMeasure:
 
         # search for existing line with same timestamp on a data slice:
         foundIndex: int = -1
-        for slicei, gridSlice in enumerate(self.slices):
+        for slicei in range(self.sliceIndexAtOrAfter(ts), len(self.slices)):
+            gridSlice: GridSlice = self.slices[slicei]
             if ts < gridSlice.timestamp:
                 raise HumdrumInternalError(
                     'STRANGE CASE 2 IN GRIDMEASURE::ADDGRACETOKEN\n'
@@ -244,7 +288,9 @@ class GridMeasure:
             return gs
 
         # search for existing line with same timestamp and the same slice type
-        for idx, gridSlice in enumerate(self.slices):
+        # (skipping straight past any slices with earlier timestamps)
+        for idx in range(self.sliceIndexAtOrAfter(ts), len(self.slices)):
+            gridSlice: GridSlice = self.slices[idx]
             if ts == gridSlice.timestamp and gridSlice.isGraceSlice:
                 # skip grace notes with the right timestamp
                 continue
@@ -297,7 +343,9 @@ class GridMeasure:
             return gs
 
         # search for existing line with same timestamp and the same slice type
-        for idx, gridSlice in enumerate(self.slices):
+        # (skipping straight past any slices with earlier timestamps)
+        for idx in range(self.sliceIndexAtOrAfter(ts), len(self.slices)):
+            gridSlice: GridSlice = self.slices[idx]
             if gridSlice.timestamp == ts and gridSlice.sliceType == sliceType:
                 gridSlice.addToken(tok, part, staff, voice)
                 gs = gridSlice
@@ -500,13 +548,8 @@ class GridMeasure:
 
         associatedSliceIdx: int | None = None
         # find owning line (associatedSlice)
-        foundIt: bool = False
-        for associatedSliceIdx in range(len(self.slices) - 1, -1, -1):
-            gridSlice: GridSlice = self.slices[associatedSliceIdx]
-            if gridSlice is associatedSlice:
-                foundIt = True
-                break
-        if not foundIt:
+        associatedSliceIdx = self.sliceIndex(associatedSlice)
+        if associatedSliceIdx is None:
             # cannot find owning line (a.k.a. associatedSlice is not in this GridMeasure)
             return
 
@@ -562,13 +605,8 @@ class GridMeasure:
             associatedSliceIdx = len(self.slices)
         else:
             # find owning line (associatedSlice)
-            foundIt: bool = False
-            for associatedSliceIdx in range(len(self.slices) - 1, -1, -1):
-                gridSlice: GridSlice = self.slices[associatedSliceIdx]
-                if gridSlice is associatedSlice:
-                    foundIt = True
-                    break
-            if not foundIt:
+            associatedSliceIdx = self.sliceIndex(associatedSlice)
+            if associatedSliceIdx is None:
                 # cannot find owning line (a.k.a. associatedSlice is not in this GridMeasure)
                 return
 
@@ -697,7 +735,8 @@ class GridMeasure:
             return gs
 
         # search for existing data line (of any type) with the same timestamp
-        for idx, gridSlice in enumerate(self.slices):
+        for idx in range(self.sliceIndexAtOrAfter(ts), len(self.slices)):
+            gridSlice: GridSlice = self.slices[idx]
             # does it need to be before data slice or any slice?
             # if (((*iterator)->getTimestamp() == ts) && (*iterator)->isDataSlice())
             if gridSlice.timestamp == ts:
@@ -741,7 +780,8 @@ class GridMeasure:
             return gs
 
         # search for existing data line (of any type) with the same timestamp
-        for idx, gridSlice in enumerate(self.slices):
+        for idx in range(self.sliceIndexAtOrAfter(ts), len(self.slices)):
+            gridSlice: GridSlice = self.slices[idx]
             if gridSlice.timestamp == ts:
                 # found the correct timestamp on a slice, so add the global reference
                 # before the slice.  But don't add if the slice we found is a
@@ -782,7 +822,12 @@ class GridMeasure:
     //
     // GridMeasure::transferTokens --
     '''
-    def transferTokens(self, outFile: HumdrumFile, recip: bool, firstBar: bool = False) -> bool:
+    def transferTokens(
+        self,
+        outFile: HumdrumFile | TextOnlyHumdrumFile,
+        recip: bool,
+        firstBar: bool = False
+    ) -> bool:
         # If the last data slice duration is zero, then calculate
         # the true duration from the duration of the measure.
         if self.slices:
@@ -948,13 +993,8 @@ class GridMeasure:
             associatedSliceIdx = len(self.slices)
         else:
             # find owning line (associatedSlice)
-            foundIt: bool = False
-            for associatedSliceIdx in range(len(self.slices) - 1, -1, -1):
-                gridSlice: GridSlice = self.slices[associatedSliceIdx]
-                if gridSlice is associatedSlice:
-                    foundIt = True
-                    break
-            if not foundIt:
+            associatedSliceIdx = self.sliceIndex(associatedSlice)
+            if associatedSliceIdx is None:
                 # cannot find owning line (a.k.a. associatedSlice is not in this GridMeasure)
                 return
 
@@ -999,7 +1039,8 @@ class GridMeasure:
         # find the associated data slice at the timestamp
         associatedSlice: GridSlice | None = None
 
-        for theSlice in self.slices:
+        for idx in range(self.sliceIndexAtOrAfter(timestamp), len(self.slices)):
+            theSlice: GridSlice = self.slices[idx]
             if not theSlice.isDataSlice:
                 continue
             if theSlice.timestamp >= timestamp:
@@ -1043,13 +1084,8 @@ class GridMeasure:
             associatedSliceIdx = len(self.slices)
         else:
             # find owning line (associatedSlice)
-            foundIt: bool = False
-            for associatedSliceIdx in range(len(self.slices) - 1, -1, -1):
-                gridSlice: GridSlice = self.slices[associatedSliceIdx]
-                if gridSlice is associatedSlice:
-                    foundIt = True
-                    break
-            if not foundIt:
+            associatedSliceIdx = self.sliceIndex(associatedSlice)
+            if associatedSliceIdx is None:
                 # cannot find owning line (a.k.a. associatedSlice is not in this GridMeasure)
                 return
 
@@ -1157,13 +1193,8 @@ class GridMeasure:
             associatedSliceIdx = len(self.slices)
         else:
             # find owning line (associatedSlice)
-            foundIt: bool = False
-            for associatedSliceIdx in range(len(self.slices) - 1, -1, -1):
-                gridSlice: GridSlice = self.slices[associatedSliceIdx]
-                if gridSlice is associatedSlice:
-                    foundIt = True
-                    break
-            if not foundIt:
+            associatedSliceIdx = self.sliceIndex(associatedSlice)
+            if associatedSliceIdx is None:
                 # cannot find owning line (a.k.a. associatedSlice is not in this GridMeasure)
                 return
 
@@ -1210,13 +1241,8 @@ class GridMeasure:
             associatedSliceIdx = len(self.slices)
         else:
             # find owning line (associatedSlice)
-            foundIt: bool = False
-            for associatedSliceIdx in range(len(self.slices) - 1, -1, -1):
-                gridSlice: GridSlice = self.slices[associatedSliceIdx]
-                if gridSlice is associatedSlice:
-                    foundIt = True
-                    break
-            if not foundIt:
+            associatedSliceIdx = self.sliceIndex(associatedSlice)
+            if associatedSliceIdx is None:
                 # cannot find owning line (a.k.a. associatedSlice is not in this GridMeasure)
                 return
 
@@ -22,6 +22,8 @@ from converter21.humdrum import HumNum, HumNumIn
 from converter21.humdrum import HumdrumToken
 from converter21.humdrum import HumdrumLine
 from converter21.humdrum import HumdrumFile
+from converter21.humdrum import TextOnlyHumdrumLine
+from converter21.humdrum import TextOnlyHumdrumFile
 
 from converter21.humdrum import SliceType
 from converter21.humdrum import GridSide
@@ -341,8 +343,13 @@ class GridSlice:
     // GridSlice::transferTokens -- Create a HumdrumLine and append it to
     //    the data.
     '''
-    def transferTokens(self, outFile: HumdrumFile, recip: bool) -> None:
-        line: HumdrumLine = HumdrumLine()
+    def transferTokens(self, outFile: HumdrumFile | TextOnlyHumdrumFile, recip: bool) -> None:
+        line: HumdrumLine | TextOnlyHumdrumLine
+        if isinstance(outFile, TextOnlyHumdrumFile):
+            # no need for a real HumdrumLine (or HumdrumTokens), just the text
+            line = TextOnlyHumdrumLine()
+        else:
+            line = HumdrumLine()
         voice: GridVoice | None
         emptyStr: str = '.'
 
@@ -410,13 +417,13 @@ class GridSlice:
                     # 888: fix this later.  For now if there are no notes
                     # 888: ... on the staff, add a null token.  Fix so that
                     # 888: ... all open voices are given null tokens.
-                    line.appendToken(HumdrumToken(emptyStr))
+                    line.appendToken(emptyStr)
                 else:
                     for voice in staff.voices:  # NOT reversed (voices different from parts/staves)
                         if voice is not None and voice.token is not None:
                             line.appendToken(voice.token)
                         else:
-                            line.appendToken(HumdrumToken(emptyStr))
+                            line.appendToken(emptyStr)
 
                 if not self.hasSpines:
                     # Don't add sides to non-spined lines
@@ -538,7 +545,7 @@ class GridSlice:
     # this version is used to transfer Sides from the Part
     @staticmethod
     def transferSidesFromPart(
-        line: HumdrumLine,
+        line: HumdrumLine | TextOnlyHumdrumLine,
         part: GridPart,
         emptyStr: str,
         maxhcount: int,
@@ -554,7 +561,7 @@ class GridSlice:
             if dynamics is not None:
                 line.appendToken(dynamics)
             else:
-                line.appendToken(HumdrumToken(emptyStr))
+                line.appendToken(emptyStr)
 
         # FIGURED BASS
         if maxfcount > 0:
@@ -562,7 +569,7 @@ class GridSlice:
             if figuredBass is not None:
                 line.appendToken(figuredBass)
             else:
-                line.appendToken(HumdrumToken(emptyStr))
+                line.appendToken(emptyStr)
 
         # HARMONY
         for _ in range(0, hcount):
@@ -570,15 +577,15 @@ class GridSlice:
             if harmony is not None:
                 line.appendToken(harmony)
             else:
-                line.appendToken(HumdrumToken(emptyStr))
+                line.appendToken(emptyStr)
 
         for _ in range(hcount, maxhcount):
-            line.appendToken(HumdrumToken(emptyStr))
+            line.appendToken(emptyStr)
 
     # this version is used to transfer Sides from the Staff
     @staticmethod
     def transferSidesFromStaff(
-        line: HumdrumLine,
+        line: HumdrumLine | TextOnlyHumdrumLine,
         staff: GridStaff,
         emptyStr: str,
         maxxcount: int,
@@ -593,7 +600,7 @@ class GridSlice:
             if xmlId is not None:
                 line.appendToken(xmlId)
             else:
-                line.appendToken(HumdrumToken(emptyStr))
+                line.appendToken(emptyStr)
 
         # VERSES
         for i in range(0, vcount):
@@ -601,10 +608,10 @@ class GridSlice:
             if verse is not None:
                 line.appendToken(verse)
             else:
-                line.appendToken(HumdrumToken(emptyStr))
+                line.appendToken(emptyStr)
 
         for i in range(vcount, maxvcount):
-            line.appendToken(HumdrumToken(emptyStr))
+            line.appendToken(emptyStr)
 
     '''
     //////////////////////////////
@@ -13,6 +13,16 @@
 from converter21.humdrum import HumdrumSyntaxError, HumdrumInternalError
 
 class HumAddress:
+    __slots__ = (
+        'trackNum',
+        '_subTrack',
+        '_subTrackCount',
+        '_fieldIndex',
+        '_ownerLine',
+        '_spining',
+        '_dataTypeTokenCached',
+    )
+
     def __init__(self) -> None:
         from converter21.humdrum import HumdrumToken
         from converter21.humdrum import HumdrumLine
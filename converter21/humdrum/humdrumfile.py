@@ -14,6 +14,7 @@
 import re
 import sys
 import math
+import io
 import html
 import copy
 import typing as t
@@ -27,6 +28,7 @@ from music21.common.enums import OrnamentDelay
 from converter21.humdrum import HumdrumInternalError, HumdrumSyntaxError
 from converter21.humdrum import HumdrumFileContent
 from converter21.humdrum import HumdrumLine
+from converter21.humdrum import HumSignifiers
 from converter21.humdrum import HumdrumToken
 from converter21.humdrum import FakeRestToken
 from converter21.humdrum import HumNum, HumNumIn
@@ -37,6 +39,7 @@ from converter21.humdrum import M21Convert
 from converter21.shared import M21StaffGroupDescriptionTree
 from converter21.shared import M21Utilities
 from converter21.shared import SharedConstants
+from converter21.shared import PhaseTimings
 
 # For debug or unit test print, a simple way to get a string which is the current function name
 # with a colon appended.
@@ -463,6 +466,7 @@ class StaffStateVariables:
         self.currentOttava2Up: m21.spanner.Ottava | None = None
         self.currentOttava2Down: m21.spanner.Ottava | None = None
         self.hasOttavas: bool = False
+        self.ottavas: list[m21.spanner.Ottava] = []
 
         '''
             Next we have temporary (processing) state about this staff (current keysig, etc)
@@ -490,6 +494,16 @@ class HumdrumFile(HumdrumFileContent):
 
         super().__init__(fileName, acceptSyntaxErrors)  # initialize the HumdrumFileBase fields
 
+        # wall time (and object counts) of each phase of createMusic21Stream.  Clients
+        # can replace this with their own PhaseTimings (e.g. one with a callback) before
+        # calling createMusic21Stream.
+        self.phaseTimings: PhaseTimings = PhaseTimings()
+
+        # If keepSoundingPitch is True, createMusic21Stream leaves every part at sounding
+        # pitch (atSoundingPitch == True, non-transposing ottavas), instead of transposing
+        # transposing instrument parts (and parts with ottavas) to written pitch.  This
+        # is useful (and faster) for analysis that only needs sounding pitch.
+        self.keepSoundingPitch: bool = False
 
         # The m21Score attribute will not exist until it is set up (in createMusic21Stream)
         # and it will not be None at that point.
@@ -627,7 +641,29 @@ class HumdrumFile(HumdrumFileContent):
 
         return instrumentClassCode
 
-    def createMusic21Stream(self) -> m21.stream.Score:
+    def createMusic21Stream(
+        self,
+        measureRange: tuple[int, int] | None = None
+    ) -> m21.stream.Score:
+        '''
+        Converts the Humdrum file to a music21 Score.
+
+        If measureRange is specified, it is a (start, end) pair of measure indices
+        (0-based, end excluded; the first measure, pickup or not, is index 0), and
+        only those measures are converted.  The structural analysis is still done
+        for the whole file, and the staff state (clefs, key and time signatures,
+        ottavas, pedal marks, etc) is carried forward through the earlier measures,
+        but only the requested measures get the (expensive) second pass.  The
+        resulting Score contains only the requested measures (starting at offset 0),
+        with the current clef, key signature and time signature in each staff's
+        first measure.  Ties into (or out of) the range are hanging ties, and any
+        other spanners that reach outside the range are anchored at the start (or
+        end) of the range.
+        '''
+        if measureRange is not None:
+            if measureRange[0] < 0 or measureRange[1] <= measureRange[0]:
+                raise ValueError(f'invalid measureRange: {measureRange}')
+
         # First, analyze notation: this is extra analysis, not done by default,
         # which lives in HumdrumFileContent
 
@@ -654,90 +690,134 @@ class HumdrumFile(HumdrumFileContent):
             # No parts in file, give up.  Return an empty score.
             return self.m21Score
 
-        self.analyzeDefaultLayoutStyles()
-        self.analyzeNotation()
+        timings: PhaseTimings = self.phaseTimings
+
+        with timings.phase('analyzeDefaultLayoutStyles'):
+            self.analyzeDefaultLayoutStyles()
+        with timings.phase('analyzeNotation') as phase:
+            self.analyzeNotation()
+            phase.count('lines', self.lineCount)
 
-        # init some lists of staff info
-        self._initializeStaffStates()
+        with timings.phase('prepareStaffs'):
+            # init some lists of staff info
+            self._initializeStaffStates()
 
-        # figure out what we have
-        self._analyzeSpineDataTypes()
+            # figure out what we have
+            self._analyzeSpineDataTypes()
 
-        # reverse staff start order, since top part is last spine
-        self._staffStarts.reverse()
-        self._calculateStaffStartsIndexByTrack()
+            # reverse staff start order, since top part is last spine
+            self._staffStarts.reverse()
+            self._calculateStaffStartsIndexByTrack()
 
         # prepare more stuff
-        self._prepareVerses()          # which staffs have associated lyrics?
-        self._prepareSections()        # associate numbered/unnumbered section names with lines
-        self._prepareMetadata()        # pull standard biblio keys/values out of reference records
-        self._prepareTimeSignatures()  # gather time signature info
+        with timings.phase('prepareVerses'):
+            self._prepareVerses()          # which staffs have associated lyrics?
+        with timings.phase('prepareSections'):
+            self._prepareSections()        # associate numbered/unnumbered section names with lines
+        with timings.phase('prepareMetadata'):
+            # pull standard biblio keys/values out of reference records
+            self._prepareMetadata()
+        with timings.phase('prepareTimeSignatures'):
+            self._prepareTimeSignatures()  # gather time signature info
 
         # Creates Parts, PartStaffs, and StaffGroups, as appropriate,
         # using !!system-decoration, if present.
-        self._createStaffGroupsAndParts()
+        with timings.phase('createStaffGroupsAndParts') as phase:
+            self._createStaffGroupsAndParts()
+            phase.count('staffs', len(self._staffStates))
 
         # m21.metadata.Metadata for the score
-        self._createScoreMetadata()
+        with timings.phase('createScoreMetadata'):
+            self._createScoreMetadata()
 
         # prepare layer token lists for the whole score, in anticipation of two passes:
         # first pass, and then conversion (second pass)
-        self._prepareScoreLayerTokens()
+        with timings.phase('prepareScoreLayerTokens'):
+            self._prepareScoreLayerTokens()
 
         # first pass over the layer tokens (e.g. mark all the tremolos)
 
         # Assume no staff starts earlier than the first
-        lineIdx: int = self._staffStarts[0].lineIndex
-        while lineIdx < self.lineCount - 1:
-            # self._firstPassSystemMeasure returns the line idx of the next measure to process
-            lineIdx = self._firstPassSystemMeasure(lineIdx)
+        with timings.phase('firstPass') as phase:
+            lineIdx: int = self._staffStarts[0].lineIndex
+            while lineIdx < self.lineCount - 1:
+                # self._firstPassSystemMeasure returns the line idx of the next measure to process
+                lineIdx = self._firstPassSystemMeasure(lineIdx)
+                phase.count('measures', 1)
 
-        # clear any staff state we modified (in first pass) back to initial state for second pass
-        self._prepareForSecondPass()
+            # clear any staff state we modified (in first pass) back to initial state for
+            # second pass
+            self._prepareForSecondPass()
 
         # prepare all the system measures
-        self._prepareSystemMeasures()
+        with timings.phase('prepareSystemMeasures'):
+            self._prepareSystemMeasures()
+
+        # conversion (second) pass over all the measures' layer tokens (or just the
+        # measures in measureRange; the measures before that only have their staff
+        # state carried forward).
+        with timings.phase('secondPass') as phase:
+            # assumes no staff starts earlier than the first
+            lineIdx = self._staffStarts[0].lineIndex
+            while lineIdx < self.lineCount - 1:
+                if measureRange is not None:
+                    measureIndex: int = self._measureIndexFromKey.get(
+                        self._measureKey(lineIdx), -1
+                    )
+                    if measureIndex >= measureRange[1]:
+                        self._processSlurEndsAfterMeasureRange(lineIdx, measureRange)
+                        break
+                    if 0 <= measureIndex < measureRange[0]:
+                        lineIdx = self._carryStaffStateThroughSystemMeasure(lineIdx)
+                        continue
 
-        # conversion (second) pass over all the measures' layer tokens
-        lineIdx = self._staffStarts[0].lineIndex  # assumes no staff starts earlier than the first
-        while lineIdx < self.lineCount - 1:
-            # self._convertSystemMeasure returns the line idx of the next measure
-            lineIdx = self._convertSystemMeasure(lineIdx)
-#            self._checkForInformalBreak(lineIdx)
+                # self._convertSystemMeasure returns the line idx of the next measure
+                lineIdx = self._convertSystemMeasure(lineIdx)
+                phase.count('measures', 1)
+#                self._checkForInformalBreak(lineIdx)
+
+            self._processHangingTieStarts()
 
-        self._processHangingTieStarts()
+        if measureRange is not None:
+            with timings.phase('extractMeasureRange'):
+                self._extractMeasureRange(measureRange)
 
         # Fill intermediate elements in Ottavas.  This needs to happen before any
         # transposition because Ottavas must be filled to be transposed correctly.
-        for sp in self.m21Score.spannerBundle:
-            if not isinstance(sp, m21.spanner.Ottava):
-                continue
-            spStaffIndex: int = -1
-            if hasattr(sp, 'humdrum_staff_index'):
-                spStaffIndex = sp.humdrum_staff_index  # type: ignore
-            if spStaffIndex >= 0:
-                ss: StaffStateVariables = self._staffStates[spStaffIndex]
-                ss.hasOttavas = True
-                if ss.m21Part is not None:
-                    # depending on voicing, the last element in the ottava may not be the
-                    # element with the highest end time.  That's unfortunate, because that
-                    # is what spanner.fill assumes.  So find that element, remove and
-                    # re-add it, so that it is the last element in the ottava.
-                    M21Utilities.adjustSpannerOrder(sp, ss.m21Part)
-                    sp.fill(ss.m21Part)
-
-        # Transpose any transposing instrument parts (or parts with ottavas) to "written pitch".
-        # For performance, check the instruments/ottavas here, since stream.toWrittenPitch can
-        # be expensive, even if there is no transposing instrument or ottavas.
-        for ss in self._staffStates:
-            if ss.m21Part is not None:
-                hasTransposingInstrument: bool = False
-                for inst in ss.m21Part.getElementsByClass(m21.instrument.Instrument):
-                    if M21Utilities.isTransposingInstrument(inst):
-                        hasTransposingInstrument = True
-                        break
-                if hasTransposingInstrument or ss.hasOttavas:
-                    ss.m21Part.toWrittenPitch(inPlace=True, preserveAccidentalDisplay=True)
+        with timings.phase('fillOttavas') as phase:
+            for sp in self.m21Score.spannerBundle:
+                if not isinstance(sp, m21.spanner.Ottava):
+                    continue
+                spStaffIndex: int = -1
+                if hasattr(sp, 'humdrum_staff_index'):
+                    spStaffIndex = sp.humdrum_staff_index  # type: ignore
+                if spStaffIndex >= 0:
+                    ss: StaffStateVariables = self._staffStates[spStaffIndex]
+                    ss.hasOttavas = True
+                    ss.ottavas.append(sp)
+                    if ss.m21Part is not None:
+                        # depending on voicing, the last element in the ottava may not be the
+                        # element with the highest end time.  That's unfortunate, because that
+                        # is what spanner.fill assumes.  So find that element, remove and
+                        # re-add it, so that it is the last element in the ottava.
+                        M21Utilities.adjustSpannerOrder(sp, ss.m21Part)
+                        sp.fill(ss.m21Part)
+                        phase.count('ottavas', 1)
+
+        # Transpose any transposing instrument parts (or parts with ottavas) to "written pitch"
+        # (unless the client wants sounding pitch).
+        if not self.keepSoundingPitch:
+            with timings.phase('toWrittenPitch') as phase:
+                for ss in self._staffStates:
+                    if ss.m21Part is not None:
+                        hasTransposingInstrument: bool = False
+                        for inst in ss.m21Part.getElementsByClass(m21.instrument.Instrument):
+                            if M21Utilities.isTransposingInstrument(inst):
+                                hasTransposingInstrument = True
+                                break
+                        if hasTransposingInstrument or ss.hasOttavas:
+                            self._partToWrittenPitch(ss)
+                            phase.count('parts', 1)
 
         # set c21_syntax_errors_fixed again, because actually generating the score might
         # have caused us to fix more syntax errors.
@@ -745,6 +825,24 @@ class HumdrumFile(HumdrumFileContent):
             self.m21Score.c21_syntax_errors_fixed = self.numSyntaxErrorsFixed  # type: ignore
         return self.m21Score
 
+    @staticmethod
+    def _partToWrittenPitch(ss: StaffStateVariables) -> None:
+        # Does what ss.m21Part.toWrittenPitch(inPlace=True, preserveAccidentalDisplay=True)
+        # would do, but for performance we only transpose the notes in the range of each
+        # transposing instrument, and the notes in each of this staff's (already filled)
+        # ottavas, instead of re-walking the whole part for each.
+        part: m21.stream.Part | None = ss.m21Part
+        if part is None:
+            return
+
+        M21Utilities.transposeInstrumentRangesToWrittenPitch(
+            part, preserveAccidentalDisplay=True
+        )
+        for container in part.recurse(streamsOnly=True, includeSelf=True):
+            container.atSoundingPitch = False
+        for ottava in ss.ottavas:
+            ottava.undoTransposition()
+
     def _prepareForSecondPass(self) -> None:
         for ss in self._staffStates:
             # ss.tremolo is set to True and False as we run across *tremolo and *Xtremolo
@@ -903,7 +1001,20 @@ class HumdrumFile(HumdrumFileContent):
                 firstDataLineIdx = line.lineIndex
                 break
 
-        for bibLine in self.referenceRecords():
+        self._biblio.extend(
+            self._biblioFromReferenceRecords(
+                (bibLine, bibLine.lineIndex < firstDataLineIdx)
+                for bibLine in self.referenceRecords()
+            )
+        )
+
+    @staticmethod
+    def _biblioFromReferenceRecords(
+        records: t.Iterable[tuple[HumdrumLine, bool]]
+    ) -> list[tuple[str, str]]:
+        # records is a sequence of (bibLine, isBeforeFirstDataLine)
+        biblio: list[tuple[str, str]] = []
+        for bibLine, isBeforeFirstDataLine in records:
             if bibLine.text.startswith('!!!!'):
                 # skip the universal records for now, we don't handle multi-score Humdrum files
                 continue
@@ -912,7 +1023,7 @@ class HumdrumFile(HumdrumFileContent):
             value = bibLine.referenceValue
 
             # system-decoration and RDF** are referenceRecords, but should not
-            # go in self._biblio, since they are not metadata.
+            # go in biblio, since they are not metadata.
             if key == 'system-decoration':
                 continue
             if key.startswith('RDF**'):
@@ -925,28 +1036,28 @@ class HumdrumFile(HumdrumFileContent):
                 continue
 
             if key == 'OMD':
-                # only take OMDs before the firstDataLineIdx as movementName in metadata,
+                # only take OMDs before the first data line as movementName in metadata,
                 # because after the first data line, they're not movementNames, just
                 # tempo changes.  But only take them as movementName if they actually have
                 # a tempoName (or are just a name with no mm info).
-                if bibLine.lineIndex < firstDataLineIdx:
+                if isBeforeFirstDataLine:
                     # strip off any [quarter = 128] suffix, and any 'M.M.' or 'M. M.' or etc.
                     tempoName, mmStr, noteName, bpmText = (
                         Convert.getMetronomeMarkInfo(value)
                     )
                     if not tempoName and not mmStr and not noteName and not bpmText:
-                        self._biblio.append((key, value))
+                        biblio.append((key, value))
                     elif tempoName:
                         tempoName.strip()
                         if tempoName:
                             value = tempoName
-                            self._biblio.append((key, value))
+                            biblio.append((key, value))
             else:
-                self._biblio.append((key, value))
+                biblio.append((key, value))
 
         titles: list[str] = []
         movementNames: list[str] = []
-        for k, v in self._biblio:
+        for k, v in biblio:
             if k == 'OMD':
                 movementNames.append(v)
                 continue
@@ -956,7 +1067,9 @@ class HumdrumFile(HumdrumFileContent):
 
         if len(titles) == 1 and len(movementNames) == 1:
             if titles[0] == movementNames[0]:
-                self._biblio.remove(('OTL', titles[0]))
+                biblio.remove(('OTL', titles[0]))
+
+        return biblio
 
     '''
     //////////////////////////////
@@ -1044,6 +1157,213 @@ class HumdrumFile(HumdrumFileContent):
 
         return endIdx
 
+    def _carryStaffStateThroughSystemMeasure(self, lineIdx: int) -> int:
+        # Like _convertSystemMeasure, but only processes the interpretation tokens
+        # of the measure, so the staff state (clefs, ottavas, pedal marks, stem
+        # directions, etc) is up to date when we get to the next measure.  This is
+        # for measures before the requested measureRange, which will be removed
+        # (along with anything we put in them here) by _extractMeasureRange.
+        # We return the line number of the next measure
+        measureKey: tuple[int | None, int] = self._measureKey(lineIdx)
+        startIdx, endIdx = measureKey
+        if startIdx is None:
+            return endIdx
+
+        if self.ignoreLine[startIdx]:
+            return endIdx
+
+        measureIndex: int = self.measureIndexFromKey(measureKey)
+        for staffIndex, staffLayerTokens in enumerate(self._scoreLayerTokens[measureKey]):
+            for layerIndex, layerData in enumerate(staffLayerTokens):
+                if not layerData:
+                    continue
+                self._prepareInitialOttavas(layerData[0], staffIndex, measureIndex)
+                voice: m21.stream.Voice = m21.stream.Voice()
+                insertedIntoVoice: bool = False
+                for tokenIdx, layerTok in enumerate(layerData):
+                    if layerTok.isFakeRest:
+                        continue
+                    if not layerTok.isInterpretation:
+                        continue
+                    if self._processInterpretationLayerToken(
+                            measureIndex, voice, 0,
+                            layerData, tokenIdx, layerIndex, staffIndex):
+                        insertedIntoVoice = True
+                if insertedIntoVoice:
+                    # so _extractMeasureRange can find any mid-measure clef changes
+                    self._allMeasuresPerStaff[measureIndex][staffIndex].coreInsert(0, voice)
+            self._allMeasuresPerStaff[measureIndex][staffIndex].coreElementsChanged()
+
+        return endIdx
+
+    def _processSlurEndsAfterMeasureRange(
+        self,
+        lineIdx: int,
+        measureRange: tuple[int, int]
+    ) -> None:
+        # Creates the slurs that start before lineIdx (the first line after
+        # measureRange) and end after it.  Their end notes will never be created,
+        # so they end at an anchor at the end of the last measure in the range
+        # instead (_extractMeasureRange takes care of any start notes that were
+        # never created).
+        endAnchors: dict[int, m21.spanner.SpannerAnchor] = {}
+        for i in range(lineIdx, self.lineCount):
+            line = self._lines[i]
+            if not line.isData:
+                continue
+
+            for token in line.tokens():
+                if not token.isKern or token.isNull:
+                    continue
+                if token.getValueInt('auto', 'slurEndCount') <= 0:
+                    continue
+                staffIndex: int = self._staffStartsIndexByTrack[token.track]
+                if staffIndex < 0:
+                    continue
+
+                endAnchor: m21.spanner.SpannerAnchor | None = endAnchors.get(staffIndex)
+                if endAnchor is None:
+                    lastMeasure: m21.stream.Measure = (
+                        self._allMeasuresPerStaff[measureRange[1] - 1][staffIndex]
+                    )
+                    endAnchor = m21.spanner.SpannerAnchor()
+                    lastMeasure.insert(lastMeasure.highestTime, endAnchor)
+                    endAnchors[staffIndex] = endAnchor
+
+                self._processSlurs(endAnchor, token, startsBeforeLineIdx=lineIdx)
+
+    def _extractMeasureRange(self, measureRange: tuple[int, int]) -> None:
+        # Removes all the measures outside of measureRange from the parts (the
+        # remaining measures are moved to start at offset 0), puts the current
+        # clef, key signature and time signature at the start of each staff's
+        # first remaining measure, and fixes up any spanners that reach outside
+        # the remaining measures.
+        startIndex: int = min(measureRange[0], len(self._allMeasuresPerStaff))
+        endIndex: int = min(measureRange[1], len(self._allMeasuresPerStaff))
+        keptMeasuresPerStaff: list[list[m21.stream.Measure]] = [
+            [measurePerStaff[staffIndex]
+                for measurePerStaff in self._allMeasuresPerStaff[startIndex:endIndex]]
+            for staffIndex in range(0, self.staffCount)
+        ]
+
+        # Find all the spanners (and where they live) before removing any
+        # measures, since ottavas (for example) live in the measure they start in.
+        spannerSites: list[tuple[m21.spanner.Spanner, m21.stream.Stream]] = []
+        for container in self.m21Score.recurse(streamsOnly=True, includeSelf=True):
+            for sp in container.getElementsByClass(m21.spanner.Spanner):
+                spannerSites.append((sp, container))
+
+        contextClasses: tuple[type[m21.Music21Object], ...] = (
+            m21.clef.Clef, m21.key.KeySignature, m21.meter.TimeSignature
+        )
+
+        # staff index of every element (measures and their contents) that remains
+        staffIndexOfKept: dict[int, int] = {id(self.m21Score): -1}
+        for staffIndex, ss in enumerate(self._staffStates):
+            part: m21.stream.Part | None = ss.m21Part
+            if part is None:
+                continue
+
+            keptMeasures: list[m21.stream.Measure] = keptMeasuresPerStaff[staffIndex]
+            keptMeasureIds: set[int] = {id(m) for m in keptMeasures}
+            startOffset: OffsetQL = 0.
+            endOffset: OffsetQL = 0.
+            if keptMeasures:
+                startOffset = keptMeasures[0].getOffsetBySite(part)
+                endOffset = opFrac(
+                    keptMeasures[-1].getOffsetBySite(part) + keptMeasures[-1].highestTime
+                )
+
+            # the most recent clef/keysig/timesig before the range
+            contexts: dict[type[m21.Music21Object], m21.Music21Object] = {}
+            toRemove: list[m21.Music21Object] = []
+            earlierPartLevel: dict[type[m21.Music21Object], m21.Music21Object] = {}
+            for el in part:
+                elOffset: OffsetQL = el.getOffsetBySite(part)
+                if isinstance(el, m21.stream.Measure):
+                    if id(el) in keptMeasureIds:
+                        continue
+                    toRemove.append(el)
+                    if keptMeasures and elOffset < startOffset:
+                        contextOffsets: dict[type[m21.Music21Object], OffsetQL] = {}
+                        it = el.recurse().getElementsByClass(contextClasses)
+                        for ctx in it:
+                            ctxOffset: OffsetQL = it.currentHierarchyOffset() or 0.
+                            for cls in contextClasses:
+                                if isinstance(ctx, cls):
+                                    if ctxOffset >= contextOffsets.get(cls, 0.):
+                                        contextOffsets[cls] = ctxOffset
+                                        contexts[cls] = ctx
+                    continue
+
+                # part-level elements (e.g. instruments)
+                if not keptMeasures or elOffset >= endOffset:
+                    toRemove.append(el)
+                elif elOffset <= startOffset:
+                    # only the latest one of each class (at or before the range) is kept
+                    if type(el) in earlierPartLevel:
+                        toRemove.append(earlierPartLevel[type(el)])
+                    earlierPartLevel[type(el)] = el
+
+            part.remove(toRemove)
+            for el in list(part):
+                part.coreSetElementOffset(
+                    el, max(opFrac(el.getOffsetBySite(part) - startOffset), 0.)
+                )
+            part.coreElementsChanged()
+
+            if not keptMeasures:
+                continue
+
+            firstMeasure: m21.stream.Measure = keptMeasures[0]
+            for cls, ctx in contexts.items():
+                if firstMeasure.recurse().getElementsByClass(cls).getElementsByOffset(0):
+                    continue
+                firstMeasure.insert(0, copy.deepcopy(ctx))
+
+            staffIndexOfKept[id(part)] = staffIndex
+            for measure in keptMeasures:
+                for el in measure.recurse(includeSelf=True):
+                    staffIndexOfKept[id(el)] = staffIndex
+
+        for sp, site in spannerSites:
+            spanned: list[m21.Music21Object] = sp.getSpannedElements()
+            keptSpanned: list[m21.Music21Object] = [
+                el for el in spanned if id(el) in staffIndexOfKept
+            ]
+            siteWasKept: bool = id(site) in staffIndexOfKept
+            if not keptSpanned:
+                if spanned or not siteWasKept:
+                    site.remove(sp)
+                continue
+
+            staffIndex = staffIndexOfKept[id(keptSpanned[0])]
+            if staffIndex < 0:
+                # spans parts (e.g. a StaffGroup), and they are all still here
+                continue
+            staffMeasures: list[m21.stream.Measure] = keptMeasuresPerStaff[staffIndex]
+
+            for i, el in enumerate(spanned):
+                if id(el) in staffIndexOfKept:
+                    continue
+                if i == 0 and not isinstance(el, m21.stream.Stream):
+                    # the spanner starts before the range
+                    startAnchor = m21.spanner.SpannerAnchor()
+                    staffMeasures[0].insert(0, startAnchor)
+                    sp.replaceSpannedElement(el, startAnchor)
+                elif i == len(spanned) - 1 and not isinstance(el, m21.stream.Stream):
+                    # the spanner ends after the range
+                    endAnchor = m21.spanner.SpannerAnchor()
+                    staffMeasures[-1].insert(staffMeasures[-1].highestTime, endAnchor)
+                    sp.replaceSpannedElement(el, endAnchor)
+                else:
+                    sp.spannerStorage.remove(el)
+
+            if not siteWasKept:
+                # it lived in a removed measure, move it to the start of the range
+                site.remove(sp)
+                staffMeasures[0].insert(0, sp)
+
     def _repositionStartIndex(self, startIdx: int) -> int:
         foundDataBefore: bool = False
         for i in reversed(range(0, startIdx + 1)):  # start at startIdx, work back through 0
@@ -7359,7 +7679,14 @@ class HumdrumFile(HumdrumFileContent):
 
         return 0
 
-    def _processSlurs(self, endNote: m21.note.GeneralNote, token: HumdrumToken) -> None:
+    def _processSlurs(
+        self,
+        endNote: m21.note.GeneralNote | m21.spanner.SpannerAnchor,
+        token: HumdrumToken,
+        startsBeforeLineIdx: int | None = None
+    ) -> None:
+        # If startsBeforeLineIdx is specified, only the slurs that start before
+        # that line are processed.
         slurEndCount: int = token.getValueInt('auto', 'slurEndCount')
         if slurEndCount <= 0:
             # not a slur end
@@ -7377,6 +7704,9 @@ class HumdrumFile(HumdrumFileContent):
             slurStartTok: HumdrumToken | None = slurStartList[i][1]
             if not slurStartTok:
                 continue
+            if (startsBeforeLineIdx is not None
+                    and slurStartTok.lineIndex >= startsBeforeLineIdx):
+                continue
 
             slurStartNumber: int = slurStartList[i][0]
             isInvisible: bool = self._checkIfSlurIsInvisible(slurStartTok, slurStartNumber)
@@ -10840,9 +11170,83 @@ class HumdrumFile(HumdrumFileContent):
 
         return newk
 
+    @staticmethod
+    def metadataFromLines(
+        lines: t.Iterable[str],
+        signifiers: HumSignifiers | None = None
+    ) -> m21.metadata.Metadata:
+        '''
+        Returns the m21.metadata.Metadata that createMusic21Stream would put in the
+        score, by scanning the raw lines for reference records (!!!KEY: value), without
+        tokenizing (or analyzing) any of the spine data.  If signifiers is specified,
+        the !!!RDF signifier records are added to it as well.
+
+        >>> md = HumdrumFile.metadataFromLines(['!!!COM: Nobody', '**kern', '4c', '*-'])
+        >>> md.composer
+        'Nobody'
+        '''
+        records: list[tuple[HumdrumLine, bool]] = []
+        rdfLines: list[str] = []
+        foundData: bool = False
+        for text in lines:
+            if text.endswith('\n'):
+                text = text[:-1]
+            if not text.startswith('!!!'):
+                if not foundData and text and text[0] not in ('!', '*', '='):
+                    foundData = True
+                continue
+
+            bibLine = HumdrumLine(text)
+            if not bibLine.isReference:
+                continue
+            if bibLine.isSignifier:
+                rdfLines.append(text)
+            records.append((bibLine, not foundData))
+
+        # Signifiers are only added once all the lines have been read successfully
+        # (metadataFromFile might need to start over with another encoding).
+        if signifiers is not None:
+            for rdfLine in rdfLines:
+                signifiers.addSignifier(rdfLine)
+            signifiers.generateKnownInfo()
+
+        return HumdrumFile._metadataFromBiblio(
+            HumdrumFile._biblioFromReferenceRecords(records)
+        )
+
+    @staticmethod
+    def metadataFromString(
+        contents: str,
+        signifiers: HumSignifiers | None = None
+    ) -> m21.metadata.Metadata:
+        '''
+        Like metadataFromLines, but from a string containing an entire Humdrum file.
+        '''
+        return HumdrumFile.metadataFromLines(io.StringIO(contents), signifiers)
+
+    @staticmethod
+    def metadataFromFile(
+        fileName: str | Path,
+        signifiers: HumSignifiers | None = None
+    ) -> m21.metadata.Metadata:
+        '''
+        Like metadataFromLines, but from a Humdrum file (utf-8 or latin-1).  The file
+        is read line by line, and never held in memory all at once.
+        '''
+        try:
+            with open(fileName, encoding='utf-8') as f:
+                return HumdrumFile.metadataFromLines(f, signifiers)
+        except UnicodeDecodeError:
+            # start over with the other encoding
+            with open(fileName, encoding='latin-1') as f:
+                return HumdrumFile.metadataFromLines(f, signifiers)
+
     def _createScoreMetadata(self) -> None:
+        self.m21Score.metadata = self._metadataFromBiblio(self._biblio)
+
+    @staticmethod
+    def _metadataFromBiblio(biblio: list[tuple[str, str]]) -> m21.metadata.Metadata:
         m21Metadata = m21.metadata.Metadata()
-        self.m21Score.metadata = m21Metadata
 
         # first add a 'software' entry for this importer
         m21Metadata.add(
@@ -10857,11 +11261,13 @@ class HumdrumFile(HumdrumFileContent):
             SharedConstants._CONVERTER21_VERSION
         )
 
-        for k, v in self._biblio:
+        for k, v in biblio:
             parsedKey: str
             parsedValue: m21.metadata.Text
             isStandardHumdrumKey: bool
-            parsedKey, parsedValue, isStandardHumdrumKey = self._parseReferenceItem(k, v)
+            parsedKey, parsedValue, isStandardHumdrumKey = (
+                HumdrumFile._parseReferenceItem(k, v)
+            )
 
             if parsedKey == 'MRD':
                 # 'MRD' and 'MDT' mean exactly the same thing.  I prefer the MDT spelling.
@@ -10936,6 +11342,8 @@ class HumdrumFile(HumdrumFileContent):
             # 'raw:' to prevent possible overlap with music21 metadata uniqueName key).
             m21Metadata.addCustom('raw:' + k, v)
 
+        return m21Metadata
+
     def _prepartPartInstrumentInfo(self, partStartTok: HumdrumToken, staffNum: int) -> None:
         # staffNum is 1-based, but _staffStates is 0-based
         ss: StaffStateVariables = self._staffStates[staffNum - 1]
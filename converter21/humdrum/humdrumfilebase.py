@@ -11,8 +11,12 @@
 # Copyright:     (c) 2021-2023 Greg Chapman
 # License:       MIT, see LICENSE
 # ------------------------------------------------------------------------------
+import io
 import sys
 import typing as t
+from bisect import bisect_left
+from contextlib import contextmanager
+from operator import attrgetter
 from pathlib import Path
 
 from music21.common import opFrac
@@ -33,6 +37,8 @@ from converter21.humdrum import HumdrumLine
 funcName = lambda n=0: sys._getframe(n + 1).f_code.co_name + ':'  # pragma no cover
 # pylint: enable=protected-access
 
+_lineDurationFromStart = attrgetter('durationFromStart')
+
 # simple class to represent a pair of (first, last) related tokens
 class TokenPair:
     def __init__(
@@ -125,6 +131,14 @@ class HumdrumFileBase(HumHash):
         '''
         self._lines: list[HumdrumLine] = []
 
+        '''
+            Inside "with self.deferredLineIndexing()", insertLine/insertLines don't
+            renumber the lines after the insertion point.  _firstStaleLineIndex is
+            where renumbering must start when the outermost deferral ends.
+        '''
+        self._lineIndexingDeferrals: int = 0
+        self._firstStaleLineIndex: int | None = None
+
         '''
         // m_filename: name of the file which was loaded.
         '''
@@ -314,18 +328,35 @@ class HumdrumFileBase(HumHash):
     '''
     def read(self, fileName: str | Path) -> bool:
         # with open(fileName, errors='backslashreplace') as f: <- this always succeeds, but...
+        # The file is streamed (not read into one big string first), so a large file never
+        # exists as a string, a list of line strings, and a list of HumdrumLines at once.
         try:
             with open(fileName, encoding='utf-8') as f:
-                s = f.read()
-                return self.readString(s)
+                return self.readStream(f)
 
         except UnicodeDecodeError:
+            # start over with the other encoding
+            self.clear()
+            self._parseError = ''
             with open(fileName, encoding='latin-1') as f:
-                s = f.read()
-                return self.readString(s)
+                return self.readStream(f)
 
         return False
 
+    '''
+        readBytes: Read contents from the bytes of a file (e.g. a file that has already
+        been read for some other reason), decoding them just like read does.
+    '''
+    def readBytes(self, contents: bytes) -> bool:
+        try:
+            return self.readStream(io.TextIOWrapper(io.BytesIO(contents), encoding='utf-8'))
+
+        except UnicodeDecodeError:
+            # start over with the other encoding
+            self.clear()
+            self._parseError = ''
+            return self.readStream(io.TextIOWrapper(io.BytesIO(contents), encoding='latin-1'))
+
     '''
     //////////////////////////////
     //
@@ -333,24 +364,86 @@ class HumdrumFileBase(HumHash):
     //    an istream or filename.
     '''
     def readString(self, contents: str) -> bool:
-        if contents[-1] == '\n':
-            contents = contents[0:-1]  # lose that last empty line (many editors add it)
+        # StringIO iterates lines lazily, splitting only on '\n' (just like contents.split('\n'))
+        return self.readStream(io.StringIO(contents))
 
-        contentLines = contents.split('\n')
-        # print(funcName(), 'len(contentLines) =', len(contentLines), file=sys.stderr)
-        for contentLine in contentLines:
-            if contentLine == '<eos>':
+    '''
+        readStream: Read contents from an iterable of lines (e.g. a text file object, or
+        a generator of strings), building lines and tokens incrementally.  Each line may
+        (or may not) end with '\n'.  Unless acceptSyntaxErrors is set, spine count
+        mismatches are detected as each line is read, so a bad file fails fast, without
+        reading the rest of it.
+    '''
+    def readStream(self, lineSource: t.Iterable[str]) -> bool:
+        self._readLinesFromStream(lineSource)
+        if not self.isValid:
+            return self.isValid
+        return self._analyzeBaseFromTokens()
+
+    def _readLinesFromStream(self, lineSource: t.Iterable[str]) -> bool:
+        # expected spine count for the next spined line (-1 means we haven't seen
+        # the first exclusive interpretation line yet)
+        spineCount: int = -1
+        lineIndex: int = len(self._lines)
+
+        for contentLine in lineSource:
+            if contentLine in ('<eos>', '<eos>\n'):
                 # temp fix for SMB dataset (ignore trailing <eos> line)
                 break
-            line = HumdrumLine(contentLine)
-            line.ownerFile = self
+            line = HumdrumLine(contentLine, ownerFile=self)
+            line.lineIndex = lineIndex
+            line.createTokensFromLine()
             self._lines.append(line)
+            lineIndex += 1
+
+            if self.acceptSyntaxErrors or not line.hasSpines:
+                # analyzeSpines will fix things up later (or there's nothing to check)
+                continue
+
+            if spineCount < 0:
+                if not line.isExclusiveInterpretation:
+                    return self.setParseError(
+                        f'Error on line: {lineIndex}:\n'
+                        + 'Data found before exclusive interpretation\n'
+                        + f'LINE: {line.text}'
+                    )
+                spineCount = line.tokenCount
+                continue
 
+            if line.tokenCount != spineCount:
+                err = (
+                    f'Error on line {lineIndex}:\n'
+                    + f'Expected {spineCount} fields, but found {line.tokenCount}\n'
+                    + f'Line is: {line.text}'
+                )
+                if lineIndex > 1:
+                    err += f'\nPrevious line is {self._lines[-2].text}'
+                return self.setParseError(err)
+
+            if line.isManipulator:
+                spineCount = self._spineCountAfterManipulator(line)
 
-        self.analyzeBaseFromLines()
-        # print(funcName(), 'self.isValid =', self.isValid, file=sys.stderr)
         return self.isValid
 
+    @staticmethod
+    def _spineCountAfterManipulator(line: HumdrumLine) -> int:
+        # The number of spines on the line following this manipulator line.  Only
+        # used for early error detection; analyzeSpines does the real work later.
+        count: int = 0
+        inMerge: bool = False
+        for token in line.tokens():
+            if token.isMergeInterpretation:
+                if not inMerge:
+                    count += 1
+                inMerge = True
+                continue
+            inMerge = False
+            if token.isSplitInterpretation or token.isAddInterpretation:
+                count += 2
+            elif not token.isTerminateInterpretation:
+                count += 1
+        return count
+
     '''
     //////////////////////////////
     //
@@ -569,27 +662,17 @@ class HumdrumFileBase(HumHash):
     def analyzeBaseFromLines(self) -> bool:
         if not self.analyzeTokens():
             return self.isValid
-        if not self.analyzeLines():
-            return self.isValid
-        if self.acceptSyntaxErrors:
-            self.fixLinesWithMismatchedTokens()
-        if not self.analyzeSpines():
-            return self.isValid
-        if not self.analyzeLinks():
-            return self.isValid
-        if not self.analyzeTracks():
-            return self.isValid
-        if not self.fixupKernRecipOnlyTokens():
-            return self.isValid
-        return self.isValid
+        return self._analyzeBaseFromTokens()
 
     # for use by HumdrumWriter, for example, who has already created tokens and lines.
     def analyzeBase(self) -> bool:
-        # this only happens in readString, so we need to do it here for exported HumdrumFiles.
+        # this only happens in readStream, so we need to do it here for exported HumdrumFiles.
         for line in self.lines():
             line.ownerFile = self
         # don't call analyzeTokens, we already have lines from the tokens
+        return self._analyzeBaseFromTokens()
 
+    def _analyzeBaseFromTokens(self) -> bool:
         if not self.analyzeLines():
             return self.isValid
         if self.acceptSyntaxErrors:
@@ -1333,9 +1416,7 @@ nextTokenIdx = {nextTokenIdx}, nextLine.tokenCount = {nextLine.tokenCount}'''
         self._lines.insert(index, aLine)
 
         # update line indexes for this line and the following ones
-        for i, line in enumerate(self._lines):
-            if i >= index:
-                line.lineIndex = i
+        self._updateLineIndexesFrom(index)
 
         # if requested, re-analyze token links around the insertion
         if analyzeTokenLinks:
@@ -1343,6 +1424,85 @@ nextTokenIdx = {nextTokenIdx}, nextLine.tokenCount = {nextLine.tokenCount}'''
             endIdx: int = min(index + 1, self.lineCount - 1)
             self.analyzeLinksForLineRange(startIdx, endIdx + 1)
 
+    '''
+        insertLines inserts several lines at index, in the order given.  This is
+        much faster than inserting them one at a time with insertLine, since the
+        lines following the insertion point are only renumbered once.
+    '''
+    def insertLines(
+        self,
+        index: int,
+        lines: t.Iterable[HumdrumLine | str],
+        asGlobalToken: bool = False
+    ) -> None:
+        newLines: list[HumdrumLine] = []
+        for aLine in lines:
+            if isinstance(aLine, str):
+                aLine = HumdrumLine(aLine, asGlobalToken=asGlobalToken)
+            if not isinstance(aLine, HumdrumLine):
+                raise TypeError('insertLines must receive lines: str or lines: HumdrumLine')
+            newLines.append(aLine)
+
+        self._lines[index:index] = newLines
+        self._updateLineIndexesFrom(index)
+
+    '''
+        deferredLineIndexing is a context manager, for use when inserting many lines:
+
+            with hf.deferredLineIndexing():
+                for ...:
+                    hf.insertLine(...)
+
+        Inside the "with" block, insertLine and insertLines don't update the lineIndex
+        of the lines following the insertion point, so lineIndex may be wrong for any
+        line in the file until the "with" block exits, when all the lines that need
+        it are renumbered in one pass.  Don't read lineIndex inside the "with" block.
+    '''
+    @contextmanager
+    def deferredLineIndexing(self) -> t.Iterator[None]:
+        self._lineIndexingDeferrals += 1
+        try:
+            yield
+        finally:
+            self._lineIndexingDeferrals -= 1
+            if self._lineIndexingDeferrals == 0 and self._firstStaleLineIndex is not None:
+                staleIndex: int = self._firstStaleLineIndex
+                self._firstStaleLineIndex = None
+                self._updateLineIndexesFrom(staleIndex)
+
+    def _updateLineIndexesFrom(self, index: int) -> None:
+        # a negative insertion index could have moved any line
+        index = max(index, 0)
+
+        if self._lineIndexingDeferrals > 0:
+            if self._firstStaleLineIndex is None or index < self._firstStaleLineIndex:
+                self._firstStaleLineIndex = index
+            return
+
+        for i in range(index, len(self._lines)):
+            self._lines[i].lineIndex = i
+
+    '''
+        Lines are in durationFromStart order, so the lines at (or near) a particular
+        timestamp can be found with a binary search instead of a linear one.
+    '''
+    def _lineIndexAtOrAfterTimestamp(self, timestamp: HumNum) -> int:
+        # index of first line with line.durationFromStart >= timestamp
+        # (self.lineCount if there is no such line)
+        return bisect_left(self._lines, timestamp, key=_lineDurationFromStart)
+
+    def _dataLineIndexAtOrAfter(self, lineIndex: int) -> int | None:
+        for i in range(lineIndex, len(self._lines)):
+            if self._lines[i].isData:
+                return i
+        return None
+
+    def _dataLineIndexBefore(self, lineIndex: int) -> int | None:
+        for i in range(lineIndex - 1, -1, -1):
+            if self._lines[i].isData:
+                return i
+        return None
+
     '''
     //////////////////////////////
     //
@@ -1354,27 +1514,19 @@ nextTokenIdx = {nextTokenIdx}, nextLine.tokenCount = {nextLine.tokenCount}'''
     '''
     def insertNullDataLine(self, timestamp: HumNumIn) -> HumdrumLine | None:
         ts: HumNum = opFrac(timestamp)
-        # for now do a linear search for the insertion point, but later
-        # do something more efficient.
         beforet: HumNum | None = None
         beforei: int | None = None
 
-        for i, line in enumerate(self.lines()):
-            if not line.isData:
-                continue
-
-            current: HumNum = line.durationFromStart
-            if current == ts:
-                return line
-
-            if current > ts:
-                break
-
-            beforet = current
-            beforei = i
+        # look for a data line at ts, then for the last data line before ts
+        lineIdx: int = self._lineIndexAtOrAfterTimestamp(ts)
+        atOrAfterIdx: int | None = self._dataLineIndexAtOrAfter(lineIdx)
+        if atOrAfterIdx is not None and self._lines[atOrAfterIdx].durationFromStart == ts:
+            return self._lines[atOrAfterIdx]
 
+        beforei = self._dataLineIndexBefore(lineIdx)
         if beforei is None:
             return None
+        beforet = self._lines[beforei].durationFromStart
 
         # This check is currently not necessary, since beforei and beforet are
         # both set at the same time, but will that always be true?
@@ -1420,23 +1572,13 @@ nextTokenIdx = {nextTokenIdx}, nextLine.tokenCount = {nextLine.tokenCount}'''
     '''
     def insertNullInterpretationLine(self, timestamp: HumNumIn) -> HumdrumLine | None:
         ts: HumNum = opFrac(timestamp)
-        # for now do a linear search for the insertion point, but later
-        # do something more efficient.
         beforei: int | None = None
 
-        for i, line in enumerate(self.lines()):
-            if not line.isData:
-                continue
-
-            current: HumNum = line.durationFromStart
-            if current == ts:
-                beforei = i
-                break
-
-            if current > ts:
-                break
-
-            beforei = i
+        # look for a data line at ts, else use the last data line before ts
+        lineIdx: int = self._lineIndexAtOrAfterTimestamp(ts)
+        beforei = self._dataLineIndexAtOrAfter(lineIdx)
+        if beforei is None or self._lines[beforei].durationFromStart != ts:
+            beforei = self._dataLineIndexBefore(lineIdx)
 
         if beforei is None:
             return None
@@ -1484,15 +1626,12 @@ nextTokenIdx = {nextTokenIdx}, nextLine.tokenCount = {nextLine.tokenCount}'''
         ts: HumNum = opFrac(timestamp)
         beforei: int | None = None
 
-        for i, line in enumerate(self.lines()):
-            current: HumNum = line.durationFromStart
-            if current == ts:
-                beforei = i
-                break
-            if current > ts:
-                break
-
-            beforei = i
+        # look for the first line at ts, else use the last line before ts
+        lineIdx: int = self._lineIndexAtOrAfterTimestamp(ts)
+        if lineIdx < len(self._lines) and self._lines[lineIdx].durationFromStart == ts:
+            beforei = lineIdx
+        elif lineIdx > 0:
+            beforei = lineIdx - 1
 
         if beforei is None:
             return None
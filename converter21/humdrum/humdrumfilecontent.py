@@ -20,6 +20,7 @@ from music21.common import opFrac
 from converter21.humdrum import HumdrumInternalError
 from converter21.humdrum import HumNum
 from converter21.humdrum import Convert
+from converter21.humdrum import KernPitch
 from converter21.humdrum import M21Convert
 from converter21.humdrum import HumdrumToken
 from converter21.humdrum import HumdrumFileStructure
@@ -28,6 +29,32 @@ from converter21.humdrum import TokenPair
 # spineColors array will contains slots for this many subtracks
 MAXCOLORSUBTRACK: int = 30
 
+class NotationFeatures:
+    '''
+    The notation features that might be present in a HumdrumFileContent, according to
+    HumdrumFileContent.scanNotationFeatures (which only looks at each line's text).  A
+    False means the feature is definitely absent, so the analysis of that feature can
+    be skipped.  A True only means the feature might be present.
+    '''
+    __slots__ = (
+        'formalBreaks',
+        'slurs',
+        'phrases',
+        'linkedTies',
+        'ottavas',
+        'textRepetition',
+        'rscale',
+    )
+
+    def __init__(self) -> None:
+        self.formalBreaks: bool = False
+        self.slurs: bool = False
+        self.phrases: bool = False
+        self.linkedTies: bool = False
+        self.ottavas: bool = False
+        self.textRepetition: bool = False
+        self.rscale: bool = False
+
 class HumdrumFileContent(HumdrumFileStructure):
     # HumdrumFileContent has no private data to initialize, just a bunch more functions
     # So... no __init__.  Well, OK, to keep pylint happy about attribute-defined-outside-init,
@@ -47,8 +74,12 @@ class HumdrumFileContent(HumdrumFileStructure):
         self._staffStarts: list[HumdrumToken] = []     # len = staffCount
         self._staffStartsIndexByTrack: list[int] = []  # len = staffCount + 1
 
-    def readString(self, contents: str) -> bool:
-        if not super().readString(contents):
+        # the per-line label/ending tables shared by all the slur/phrase analyses
+        # (computed on first use, and reset whenever analyzeNotation is called)
+        self._slurLabelsAndEndings: tuple[list[TokenPair], list[int]] | None = None
+
+    def readStream(self, lineSource: t.Iterable[str]) -> bool:
+        if not super().readStream(lineSource):
             return self.isValid
         return self.isValid
 
@@ -61,20 +92,38 @@ class HumdrumFileContent(HumdrumFileStructure):
         # Might be worth adding to HumdrumFileContent at some point
         # m_multirest = analyzeMultiRest(infile);
 
-        self.analyzeBreaks()
-        self.analyzeSlurs()
-        self.analyzePhrasings()
-        self.analyzeKernTies()
+        # don't reuse the slur/phrase label and ending tables from any earlier analysis
+        self._slurLabelsAndEndings = None
+
+        # One cheap sweep over the lines' text tells us which analyses can be skipped
+        # entirely (most files have no phrases, linked ties, ottavas, *rscale, etc).
+        # It also finds any formal breaks, so we don't need to call analyzeBreaks.
+        features: NotationFeatures = self.scanNotationFeatures()
+        if features.formalBreaks:
+            self._hasFormalBreaks = True
+
+        if features.slurs:
+            self.analyzeSlurs()
+        if features.phrases:
+            self.analyzePhrasings()
+        if features.linkedTies:
+            self.analyzeKernTies()
         # self.analyzeKernStemLengths()  # Don't know why this is commented out in iohumdrum.cpp
-        self.analyzeRestPositions()
-        self.analyzeKernAccidentals()
-        self.analyzeTextRepetition()
+
+        # analyzeRestPositions and analyzeClefNulls, fused into one sweep (they both
+        # need to find all the clefs).
+        self._analyzeClefsAndRestPositions()
+
+        self.analyzeKernAccidentals(checkForOttavas=features.ottavas)
+        if features.textRepetition:
+            self.analyzeTextRepetition()
 
 #         if (m_signifiers.terminallong) {
 #             hideTerminalBarlines(infile);
 #         }
 #         checkForColorSpine(infile); # interesting to move here
-        self.analyzeRScale()
+        if features.rscale:
+            self.analyzeRScale()
 
         # If there are any cross-staff notes/chords, set their stems to be out of the way
         # of any other notes in that other staff (i.e. stems down if the note moved into
@@ -86,8 +135,6 @@ class HumdrumFileContent(HumdrumFileStructure):
 #         # iohumdrum calls this to deal with measure vs barline in MEI.
 #         self.analyzeBarlines();
 
-        self.analyzeClefNulls()
-
 #         if (infile.hasDifferentBarlines()) {
 #             adjustMeasureTimings(infile); # Interesting to move here, but confuses me (why?)
 #         }
@@ -99,6 +146,40 @@ class HumdrumFileContent(HumdrumFileStructure):
 #         Perhaps very MEI-specific. (actually needed, but replaced by FakeRestToken stuff)
 
 
+    def scanNotationFeatures(self) -> NotationFeatures:
+        '''
+        Returns the NotationFeatures that might be present in the file, from a single
+        sweep over the text of each line (no token is looked at).
+        '''
+        features = NotationFeatures()
+        linked: str = self._signifiers.linked
+        linkedTieMarks: tuple[str, ...] = ()
+        if linked:
+            linkedTieMarks = (linked + '[', linked + '_', linked + ']')
+
+        for line in self._lines:
+            text: str = line.text
+            if line.isData:
+                if not features.slurs and ('(' in text or ')' in text):
+                    features.slurs = True
+                if not features.phrases and ('{' in text or '}' in text):
+                    features.phrases = True
+                if not features.linkedTies and any(m in text for m in linkedTieMarks):
+                    features.linkedTies = True
+            elif line.isInterpretation:
+                if not features.ottavas and ('*8' in text or '*15' in text):
+                    features.ottavas = True
+                if not features.rscale and '*rscale:' in text:
+                    features.rscale = True
+                if not features.textRepetition and (
+                        '*ij' in text or '*edit' in text or '*italic' in text):
+                    features.textRepetition = True
+            elif line.isComment:
+                if not features.formalBreaks and ('!LO:LB' in text or '!LO:PB' in text):
+                    features.formalBreaks = True
+
+        return features
+
     def analyzeCrossStaffStemDirections(self) -> None:
         above: str = self._signifiers.above
         below: str = self._signifiers.below
@@ -461,6 +542,33 @@ class HumdrumFileContent(HumdrumFileStructure):
         if not spineStarts:
             return True
 
+        labels, endings = self._getSlurLabelsAndEndings()
+
+        output: bool = True
+        slurStarts: list[HumdrumToken] = []
+        slurEnds: list[HumdrumToken] = []
+        linkSignifier: str = self._signifiers.linked
+        for spineStart in spineStarts:
+            output = (
+                output and self.analyzeSpineSlursOrPhrases(
+                    slurOrPhrase,
+                    spineStart,
+                    slurStarts,
+                    slurEnds,
+                    labels,
+                    endings,
+                    linkSignifier)
+            )
+
+        self.createLinkedSlursOrPhrases(slurOrPhrase, slurStarts, slurEnds)
+        return output
+
+    def _getSlurLabelsAndEndings(self) -> tuple[list[TokenPair], list[int]]:
+        # The label and ending tables only depend on the lines, so they are computed
+        # once per analyzeNotation, and shared by every analyzeSlursOrPhrases call.
+        if self._slurLabelsAndEndings is not None:
+            return self._slurLabelsAndEndings
+
         # labels: first is previous label, last is next label
         labels: list[TokenPair] = [TokenPair(None, None)] * self.lineCount
         l: list[HumdrumToken | None] = [None] * self.lineCount
@@ -494,24 +602,8 @@ class HumdrumFileContent(HumdrumFileStructure):
                     ending = int(lastChar)
             endings[i] = ending
 
-        output: bool = True
-        slurStarts: list[HumdrumToken] = []
-        slurEnds: list[HumdrumToken] = []
-        linkSignifier: str = self._signifiers.linked
-        for spineStart in spineStarts:
-            output = (
-                output and self.analyzeSpineSlursOrPhrases(
-                    slurOrPhrase,
-                    spineStart,
-                    slurStarts,
-                    slurEnds,
-                    labels,
-                    endings,
-                    linkSignifier)
-            )
-
-        self.createLinkedSlursOrPhrases(slurOrPhrase, slurStarts, slurEnds)
-        return output
+        self._slurLabelsAndEndings = (labels, endings)
+        return self._slurLabelsAndEndings
 
     def analyzeSpineSlursOrPhrases(
         self,
@@ -1015,6 +1107,39 @@ class HumdrumFileContent(HumdrumFileStructure):
 
                 self._checkRestForVerticalPositioning(tok, baselines[tok.track])
 
+    def _analyzeClefsAndRestPositions(self) -> None:
+        # analyzeRestPositions and analyzeClefNulls, fused into a single sweep.
+        defaultBaseline: int = Convert.kernClefToBaseline('*clefG2')
+        baselines: list[int] = [defaultBaseline] * (self.maxTrack + 1)
+
+        for line in self._lines:
+            if line.isInterpretation:
+                if '*clef' not in line.text:
+                    continue
+                for tok in line.tokens():
+                    if not tok.isKern:
+                        continue
+                    # Not tok.isClef: that is also True for the nulls marked (here, or
+                    # in an earlier analysis) with an adjacent clef, and '*' has no
+                    # baseline.
+                    if not tok.text.startswith('*clef'):
+                        continue
+
+                    baselines[tok.track] = Convert.kernClefToBaseline(tok.text)
+                    self.markAdjacentNullsWithClef(tok)
+                continue
+
+            if not line.isData:
+                continue
+
+            for tok in line.tokens():
+                if not tok.isKern:
+                    continue
+                if not tok.isRest:
+                    continue
+
+                self._checkRestForVerticalPositioning(tok, baselines[tok.track])
+
     '''
     //////////////////////////////
     //
@@ -1068,9 +1193,11 @@ class HumdrumFileContent(HumdrumFileStructure):
     //    will not display their accidental across a system break.  Consideration
     //    about grace-note accidental display still needs to be done.
     '''
-    def analyzeKernAccidentals(self) -> bool:
-        # ottava marks must be analyzed first:
-        self.analyzeOttavas()
+    def analyzeKernAccidentals(self, checkForOttavas: bool = True) -> bool:
+        # ottava marks must be analyzed first (unless the client already knows there
+        # are none, see scanNotationFeatures):
+        if checkForOttavas:
+            self.analyzeOttavas()
 
         # We will mark a "visible accidental" in four (Humdrum) situations:
         #
@@ -1200,8 +1327,9 @@ class HumdrumFileContent(HumdrumFileStructure):
                         # processed on these notes.
                         subtok = subtok.replace('r', 'R')
 
-                    b40: int = Convert.kernToBase40(subtok)
-                    diatonic: int = Convert.kernToBase7(subtok)
+                    pitch: KernPitch = Convert.kernToPitch(subtok)
+                    b40: int = pitch.base40
+                    diatonic: int = pitch.base7
                     octaveAdjust: int = 0  # no ottavas yet...   token.getValueInt('auto', 'ottava')
                     diatonic -= octaveAdjust * 7
                     if diatonic < 0:
@@ -1209,7 +1337,7 @@ class HumdrumFileContent(HumdrumFileStructure):
                         continue
 
                     isGrace: bool = token.isGrace
-                    accid: int = Convert.kernToAccidentalCount(subtok)
+                    accid: int = pitch.accidentals
                     isHidden: bool = False
                     if 'yy' not in subtok:  # if note is hidden accidental hiding isn't necessary
                         # if ('ny' in subtok or '#y' in subtok or '-y' in subtok):
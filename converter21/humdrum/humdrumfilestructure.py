@@ -43,8 +43,8 @@ class HumdrumFileStructure(HumdrumFileBase):
         self._strand1d: list[TokenPair] = []
         self._strand2d: list[list[TokenPair]] = []
 
-    def readString(self, contents: str) -> bool:
-        if not super().readString(contents):
+    def readStream(self, lineSource: t.Iterable[str]) -> bool:
+        if not super().readStream(lineSource):
             return self.isValid
         return self.analyzeStructure()
 
@@ -46,6 +46,20 @@ def _getKeyAndValue(keyValueStr: str, delimiter: str = ':') -> tuple[str, str]:
 
 
 class HumdrumLine(HumHash):
+    __slots__ = (
+        '_text',
+        '_ownerFile',
+        '_lineIndex',
+        '_tokens',
+        '_numTabsAfterToken',
+        '_duration',
+        '_durationFromStart',
+        '_durationFromBarline',
+        '_durationToBarline',
+        '_linkedParameters',
+        '_rhythmAnalyzed',
+    )
+
     def __init__(
             self,
             line: str = '',
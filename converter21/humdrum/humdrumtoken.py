@@ -63,6 +63,8 @@ def makeTag(string: str, num: int) -> str:
 # used to generate invisible rests to fill gaps.  Not a real HumdrumToken, but can be put
 # in arrays of layerTokens, and will be specially treated.
 class FakeRestToken(HumHash):
+    __slots__ = ('duration', 'durationFromBarline')
+
     # some attributes so we can be treated (a bit) like a real HumdrumToken
     isFakeRest: bool = True  # HumdrumToken.isFakeRest == False
     isBarline: bool = False
@@ -73,11 +75,109 @@ class FakeRestToken(HumHash):
         self.duration: HumNum = opFrac(duration)
         self.durationFromBarline: HumNum = opFrac(durationFromBarline)
 
-# We use conditionally defined attributes to implement property caching, so make pylint shut up
-# about it
-# pylint: disable=attribute-defined-outside-init
+# Bit assignments for the cached boolean properties of HumdrumToken.  Each cached
+# property uses the same bit in two ints: HumdrumToken._cachedFlags (the value has
+# been computed) and HumdrumToken._cachedValues (the computed value).
+_CACHED_IS_DATA: int = 1 << 0
+_CACHED_IS_INTERPRETATION: int = 1 << 1
+_CACHED_IS_NON_NULL_DATA: int = 1 << 2
+_CACHED_IS_NULL_DATA: int = 1 << 3
+_CACHED_IS_NULL: int = 1 << 4
+_CACHED_IS_BARLINE: int = 1 << 5
+_CACHED_IS_COMMENT: int = 1 << 6
+_CACHED_IS_LOCAL_COMMENT: int = 1 << 7
+_CACHED_IS_GLOBAL_COMMENT: int = 1 << 8
+_CACHED_IS_LABEL: int = 1 << 9
+_CACHED_IS_CHORD: int = 1 << 10
+_CACHED_IS_EXCLUSIVE_INTERPRETATION: int = 1 << 11
+_CACHED_IS_SPLIT_INTERPRETATION: int = 1 << 12
+_CACHED_IS_MERGE_INTERPRETATION: int = 1 << 13
+_CACHED_IS_EXCHANGE_INTERPRETATION: int = 1 << 14
+_CACHED_IS_TERMINATE_INTERPRETATION: int = 1 << 15
+_CACHED_IS_ADD_INTERPRETATION: int = 1 << 16
+_CACHED_IS_MANIPULATOR: int = 1 << 17
+_CACHED_IS_RECIP_ONLY: int = 1 << 18
+_CACHED_HAS_BEAM: int = 1 << 19
+_CACHED_HAS_FERMATA: int = 1 << 20
+_CACHED_IS_STAFF_INTERPRETATION: int = 1 << 21
+_CACHED_IS_PART: int = 1 << 22
+_CACHED_IS_GROUP: int = 1 << 23
+_CACHED_IS_REST: int = 1 << 24
+_CACHED_IS_NOTE: int = 1 << 25
+_CACHED_IS_KERN: int = 1 << 26
+_CACHED_IS_RECIP: int = 1 << 27
+_CACHED_IS_MENS: int = 1 << 28
+_CACHED_HAS_RHYTHM: int = 1 << 29
+_CACHED_IS_STAFF_DATA_TYPE: int = 1 << 30
+
+# Note that isRest/isNote are in both masks, since they are TokenText properties,
+# but they also are parsed differently for different dataTypes.
+_CACHED_TOKEN_TEXT_PROPERTIES: int = (
+    _CACHED_IS_DATA
+    | _CACHED_IS_INTERPRETATION
+    | _CACHED_IS_NON_NULL_DATA
+    | _CACHED_IS_NULL_DATA
+    | _CACHED_IS_NULL
+    | _CACHED_IS_BARLINE
+    | _CACHED_IS_COMMENT
+    | _CACHED_IS_LOCAL_COMMENT
+    | _CACHED_IS_GLOBAL_COMMENT
+    | _CACHED_IS_LABEL
+    | _CACHED_IS_CHORD
+    | _CACHED_IS_EXCLUSIVE_INTERPRETATION
+    | _CACHED_IS_SPLIT_INTERPRETATION
+    | _CACHED_IS_MERGE_INTERPRETATION
+    | _CACHED_IS_EXCHANGE_INTERPRETATION
+    | _CACHED_IS_TERMINATE_INTERPRETATION
+    | _CACHED_IS_ADD_INTERPRETATION
+    | _CACHED_IS_MANIPULATOR
+    | _CACHED_IS_RECIP_ONLY
+    | _CACHED_HAS_BEAM
+    | _CACHED_HAS_FERMATA
+    | _CACHED_IS_STAFF_INTERPRETATION
+    | _CACHED_IS_PART
+    | _CACHED_IS_GROUP
+    | _CACHED_IS_REST
+    | _CACHED_IS_NOTE
+)
+
+_CACHED_DATA_TYPE_PROPERTIES: int = (
+    _CACHED_IS_KERN
+    | _CACHED_IS_RECIP
+    | _CACHED_IS_MENS
+    | _CACHED_HAS_RHYTHM
+    | _CACHED_IS_STAFF_DATA_TYPE
+    | _CACHED_IS_REST
+    | _CACHED_IS_NOTE
+)
 
 class HumdrumToken(HumHash):
+    # There can be millions of these in a large score, so no per-instance __dict__.
+    __slots__ = (
+        '_text',
+        '_subtokens',
+        '_subtokensGenerated',
+        '_address',
+        '_duration',
+        '_graceVisualDuration',
+        '_nextTokens',
+        '_nextToken0',
+        '_previousTokens',
+        '_previousToken0',
+        '_nextNonNullDataTokens',
+        '_previousNonNullDataTokens',
+        '_rhythmAnalysisState',
+        '_strandIndex',
+        '_nullResolution',
+        '_linkedParameterTokens',
+        '_parameterSet',
+        '_rhythmAnalyzed',
+        '_strophe',
+        '_rscale',
+        '_cachedFlags',
+        '_cachedValues',
+    )
+
     isFakeRest: bool = False  # FakeRestToken.isFakeRest == True
 
     # phrase vs. slur
@@ -205,8 +305,12 @@ class HumdrumToken(HumHash):
         '''
         self.prefix: str = '!'
 
-        self._atLeastOneCachedTokenTextPropertyExists: bool = False
-        self._atLeastOneCachedDataTypePropertyExists: bool = False
+        '''
+            _cachedFlags: bitfield of the cached boolean properties that have been computed
+            _cachedValues: bitfield of the computed values of those cached properties
+        '''
+        self._cachedFlags: int = 0
+        self._cachedValues: int = 0
 
     # In C++ a HumdrumToken is also a string().  Deriving a mutable class from an immutable
     # base class in Python is trickier than I can manage. So we have a standard "conversion"
@@ -217,64 +321,19 @@ class HumdrumToken(HumHash):
 
     # Now the actual HumdrumToken APIs/properties
 
-    cachedTokenTextProperties: set[str] = {
-        '_isDataCached',
-        '_isInterpretationCached',
-        '_isNonNullDataCached',
-        '_isNullDataCached',
-        '_isNullCached',
-        '_isBarlineCached',
-        '_isCommentCached',
-        '_isLocalCommentCached',
-        '_isGlobalCommentCached',
-        '_isLabelCached',
-        '_isChordCached',
-        '_isExclusiveInterpretationCached',
-        '_isSplitInterpretationCached',
-        '_isMergeInterpretationCached',
-        '_isExchangeInterpretationCached',
-        '_isTerminateInterpretationCached',
-        '_isAddInterpretationCached',
-        '_isManipulatorCached',
-        '_isRecipOnlyCached',
-        '_hasBeamCached',
-        '_hasFermataCached',
-        '_isStaffInterpretationCached',
-        '_isPartCached',
-        '_isGroupCached',
-        '_isRestCached',
-        '_isNoteCached'
-    }
-
-    cachedDataTypeProperties: set[str] = {
-        '_isKernCached',
-        '_isRecipCached',
-        '_isMensCached',
-        '_hasRhythmCached',
-        '_isStaffDataTypeCached',
-        '_isRestCached',
-        '_isNoteCached'
-    }
-
-    # Note that _isRestCached/_isNoteCached is in both lists, since it is a TokenText property,
-    # but it also is parsed differently for different dataTypes.
+    def _setCachedFlag(self, flag: int, value: bool) -> bool:
+        self._cachedFlags |= flag
+        if value:
+            self._cachedValues |= flag
+        else:
+            self._cachedValues &= ~flag
+        return value
+
     def _clearCachedTokenTextProperties(self) -> None:
-        # we delete these attributes instead of setting them to None, to
-        # avoid the cost of clearing cached properties during __init__
-        # (the attributes do not exist, by default)
-        if self._atLeastOneCachedTokenTextPropertyExists:
-            for attrib in self.cachedTokenTextProperties:
-                self.__dict__.pop(attrib, None)
-            self._atLeastOneCachedTokenTextPropertyExists = False
+        self._cachedFlags &= ~_CACHED_TOKEN_TEXT_PROPERTIES
 
     def _clearCachedDataTypeProperties(self) -> None:
-        # we delete these attributes instead of setting them to None, to
-        # avoid the cost of clearing cached properties during __init__
-        # (the attributes do not exist, by default)
-        if self._atLeastOneCachedDataTypePropertyExists:
-            for attrib in self.cachedDataTypeProperties:
-                self.__dict__.pop(attrib, None)
-            self._atLeastOneCachedDataTypePropertyExists = False
+        self._cachedFlags &= ~_CACHED_DATA_TYPE_PROPERTIES
 
     '''
     //////////////////////////////
@@ -289,7 +348,7 @@ class HumdrumToken(HumHash):
     def text(self, newText: str) -> None:
         self._text = newText
         self._subtokensGenerated = False
-        if self._atLeastOneCachedTokenTextPropertyExists:
+        if self._cachedFlags & _CACHED_TOKEN_TEXT_PROPERTIES:
             self._clearCachedTokenTextProperties()
 
     '''
@@ -453,12 +512,10 @@ class HumdrumToken(HumHash):
     @property
     def isKern(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isKernCached
-        except AttributeError:
-            self._isKernCached: bool = self.isDataType('**kern')
-            self._atLeastOneCachedDataTypePropertyExists = True
-        return self._isKernCached
+        if self._cachedFlags & _CACHED_IS_KERN:
+            return self._cachedValues & _CACHED_IS_KERN != 0
+        value: bool = self.isDataType('**kern')
+        return self._setCachedFlag(_CACHED_IS_KERN, value)
 
     '''
         isRecip -- Returns true if the data type of the token is **recip
@@ -466,12 +523,10 @@ class HumdrumToken(HumHash):
     @property
     def isRecip(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isRecipCached
-        except AttributeError:
-            self._isRecipCached: bool = self.isDataType('**recip')
-            self._atLeastOneCachedDataTypePropertyExists = True
-        return self._isRecipCached
+        if self._cachedFlags & _CACHED_IS_RECIP:
+            return self._cachedValues & _CACHED_IS_RECIP != 0
+        value: bool = self.isDataType('**recip')
+        return self._setCachedFlag(_CACHED_IS_RECIP, value)
 
     '''
     //////////////////////////////
@@ -483,12 +538,10 @@ class HumdrumToken(HumHash):
     @property
     def isMens(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isMensCached
-        except AttributeError:
-            self._isMensCached: bool = self.isDataType('**mens')
-            self._atLeastOneCachedDataTypePropertyExists = True
-        return self._isMensCached
+        if self._cachedFlags & _CACHED_IS_MENS:
+            return self._cachedValues & _CACHED_IS_MENS != 0
+        value: bool = self.isDataType('**mens')
+        return self._setCachedFlag(_CACHED_IS_MENS, value)
 
     '''
     //////////////////////////////
@@ -564,7 +617,7 @@ class HumdrumToken(HumHash):
     def track(self, track: int | None) -> None:
         # here we set track via address property for the checks
         self._address.track = track
-        if self._atLeastOneCachedDataTypePropertyExists:
+        if self._cachedFlags & _CACHED_DATA_TYPE_PROPERTIES:
             # some cached properties depend on dataType,
             # which depends on ownerLine and track
             self._clearCachedDataTypeProperties()
@@ -776,19 +829,17 @@ class HumdrumToken(HumHash):
     @property
     def isManipulator(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isManipulatorCached
-        except AttributeError:
-            self._isManipulatorCached: bool = (
-                self.isSplitInterpretation
-                or self.isMergeInterpretation
-                or self.isExchangeInterpretation
-                or self.isAddInterpretation
-                or self.isTerminateInterpretation
-                or self.isExclusiveInterpretation
-            )
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isManipulatorCached
+        if self._cachedFlags & _CACHED_IS_MANIPULATOR:
+            return self._cachedValues & _CACHED_IS_MANIPULATOR != 0
+        value: bool = (
+            self.isSplitInterpretation
+            or self.isMergeInterpretation
+            or self.isExchangeInterpretation
+            or self.isAddInterpretation
+            or self.isTerminateInterpretation
+            or self.isExclusiveInterpretation
+        )
+        return self._setCachedFlag(_CACHED_IS_MANIPULATOR, value)
 
     '''
         isRecipOnly returns True if the token is just a recip 'value', like you would normally
@@ -801,14 +852,12 @@ class HumdrumToken(HumHash):
     @property
     def isRecipOnly(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isRecipOnlyCached
-        except AttributeError:
-            self._isRecipOnlyCached: bool = (
-                re.match(r'^[\d]+(%[\d]+)?[.]*$', self.text) is not None
-            )
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isRecipOnlyCached
+        if self._cachedFlags & _CACHED_IS_RECIP_ONLY:
+            return self._cachedValues & _CACHED_IS_RECIP_ONLY != 0
+        value: bool = (
+            re.match(r'^[\d]+(%[\d]+)?[.]*$', self.text) is not None
+        )
+        return self._setCachedFlag(_CACHED_IS_RECIP_ONLY, value)
 
     '''
     //////////////////////////////
@@ -989,12 +1038,10 @@ class HumdrumToken(HumHash):
     @property
     def hasRhythm(self) -> bool:
         # cache the result for performance
-        try:
-            return self._hasRhythmCached
-        except AttributeError:
-            self._hasRhythmCached: bool = self.dataType.text in ('**kern', '**recip', '**mens')
-            self._atLeastOneCachedDataTypePropertyExists = True
-        return self._hasRhythmCached
+        if self._cachedFlags & _CACHED_HAS_RHYTHM:
+            return self._cachedValues & _CACHED_HAS_RHYTHM != 0
+        value: bool = self.dataType.text in ('**kern', '**recip', '**mens')
+        return self._setCachedFlag(_CACHED_HAS_RHYTHM, value)
 
     '''
     //////////////////////////////
@@ -1004,17 +1051,15 @@ class HumdrumToken(HumHash):
     @property
     def hasBeam(self) -> bool:
         # cache the result for performance
-        try:
-            return self._hasBeamCached
-        except AttributeError:
-            self._hasBeamCached: bool = (
-                'L' in self.text
-                or 'J' in self.text
-                or 'K' in self.text
-                or 'k' in self.text
-            )
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._hasBeamCached
+        if self._cachedFlags & _CACHED_HAS_BEAM:
+            return self._cachedValues & _CACHED_HAS_BEAM != 0
+        value: bool = (
+            'L' in self.text
+            or 'J' in self.text
+            or 'K' in self.text
+            or 'k' in self.text
+        )
+        return self._setCachedFlag(_CACHED_HAS_BEAM, value)
 
     '''
     //////////////////////////////
@@ -1024,12 +1069,10 @@ class HumdrumToken(HumHash):
     @property
     def hasFermata(self) -> bool:
         # cache the result for performance
-        try:
-            return self._hasFermataCached
-        except AttributeError:
-            self._hasFermataCached: bool = ';' in self.text
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._hasFermataCached
+        if self._cachedFlags & _CACHED_HAS_FERMATA:
+            return self._cachedValues & _CACHED_HAS_FERMATA != 0
+        value: bool = ';' in self.text
+        return self._setCachedFlag(_CACHED_HAS_FERMATA, value)
 
     '''
     //////////////////////////////
@@ -1040,22 +1083,18 @@ class HumdrumToken(HumHash):
     @property
     def isStaffDataType(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isStaffDataTypeCached
-        except AttributeError:
-            self._isStaffDataTypeCached: bool = self.isKern or self.isMens
-            self._atLeastOneCachedDataTypePropertyExists = True
-        return self._isStaffDataTypeCached
+        if self._cachedFlags & _CACHED_IS_STAFF_DATA_TYPE:
+            return self._cachedValues & _CACHED_IS_STAFF_DATA_TYPE != 0
+        value: bool = self.isKern or self.isMens
+        return self._setCachedFlag(_CACHED_IS_STAFF_DATA_TYPE, value)
 
     @property
     def isStaffInterpretation(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isStaffInterpretationCached
-        except AttributeError:
-            self._isStaffInterpretationCached: bool = self.text.startswith('*staff')
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isStaffInterpretationCached
+        if self._cachedFlags & _CACHED_IS_STAFF_INTERPRETATION:
+            return self._cachedValues & _CACHED_IS_STAFF_INTERPRETATION != 0
+        value: bool = self.text.startswith('*staff')
+        return self._setCachedFlag(_CACHED_IS_STAFF_INTERPRETATION, value)
 
     @property
     def staff(self) -> str:
@@ -1077,12 +1116,10 @@ class HumdrumToken(HumHash):
     @property
     def isPart(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isPartCached
-        except AttributeError:
-            self._isPartCached: bool = self.text.startswith('*part')
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isPartCached
+        if self._cachedFlags & _CACHED_IS_PART:
+            return self._cachedValues & _CACHED_IS_PART != 0
+        value: bool = self.text.startswith('*part')
+        return self._setCachedFlag(_CACHED_IS_PART, value)
 
     @property
     def partNum(self) -> int:
@@ -1099,12 +1136,10 @@ class HumdrumToken(HumHash):
     @property
     def isGroup(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isGroupCached
-        except AttributeError:
-            self._isGroupCached: bool = self.text.startswith('*group')
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isGroupCached
+        if self._cachedFlags & _CACHED_IS_GROUP:
+            return self._cachedValues & _CACHED_IS_GROUP != 0
+        value: bool = self.text.startswith('*group')
+        return self._setCachedFlag(_CACHED_IS_GROUP, value)
 
     @property
     def groupNum(self) -> int:
@@ -1161,28 +1196,22 @@ class HumdrumToken(HumHash):
     def isRest(self) -> bool:
         # assumption: isRest will only be called after self._nullResolution has been
         # set once and for all
-        try:
-            return self._isRestCached
-        except AttributeError:
-            tokenText: str = self.text
-            if self.isNull:
-                tokenText = self.nullResolution.text
-
-            self._isRestCached: bool = False
-
-            # BUGFIX: Without this "if self.isData", isRest('**kern') will return True
-            # BUGFIX: (there's an 'r')
-            if self.isData:
-                if self.isKern:
-                    self._isRestCached = Convert.isKernRest(tokenText)
-                elif self.isMens:
-                    self._isRestCached = Convert.isMensRest(tokenText)
+        if self._cachedFlags & _CACHED_IS_REST:
+            return self._cachedValues & _CACHED_IS_REST != 0
+        tokenText: str = self.text
+        if self.isNull:
+            tokenText = self.nullResolution.text
 
-            # isRest changes if tokenText changes, and also if dataType changes
-            self._atLeastOneCachedTokenTextPropertyExists = True
-            self._atLeastOneCachedDataTypePropertyExists = True
+        value: bool = False
 
-        return self._isRestCached
+        # BUGFIX: Without this "if self.isData", isRest('**kern') will return True
+        # BUGFIX: (there's an 'r')
+        if self.isData:
+            if self.isKern:
+                value = Convert.isKernRest(tokenText)
+            elif self.isMens:
+                value = Convert.isMensRest(tokenText)
+        return self._setCachedFlag(_CACHED_IS_REST, value)
 
     '''
     //////////////////////////////
@@ -1193,18 +1222,16 @@ class HumdrumToken(HumHash):
     '''
     @property
     def isNote(self) -> bool:
-        try:
-            return self._isNoteCached
-        except AttributeError:
-            self._isNoteCached: bool = False
-            if not self.isData or self.isNull:
-                pass
-            elif self.isKern:
-                self._isNoteCached = Convert.isKernNote(self.text)
-            elif self.isMens:
-                self._isNoteCached = Convert.isMensNote(self.text)
-
-        return self._isNoteCached
+        if self._cachedFlags & _CACHED_IS_NOTE:
+            return self._cachedValues & _CACHED_IS_NOTE != 0
+        value: bool = False
+        if not self.isData or self.isNull:
+            pass
+        elif self.isKern:
+            value = Convert.isKernNote(self.text)
+        elif self.isMens:
+            value = Convert.isMensNote(self.text)
+        return self._setCachedFlag(_CACHED_IS_NOTE, value)
 
     '''
     //////////////////////////////
@@ -1987,12 +2014,10 @@ class HumdrumToken(HumHash):
     @property
     def isBarline(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isBarlineCached
-        except AttributeError:
-            self._isBarlineCached: bool = self.text.startswith('=')
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isBarlineCached
+        if self._cachedFlags & _CACHED_IS_BARLINE:
+            return self._cachedValues & _CACHED_IS_BARLINE != 0
+        value: bool = self.text.startswith('=')
+        return self._setCachedFlag(_CACHED_IS_BARLINE, value)
 
     '''
         barlineNumber returns the first number found.
@@ -2035,12 +2060,10 @@ class HumdrumToken(HumHash):
     @property
     def isGlobalComment(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isGlobalCommentCached
-        except AttributeError:
-            self._isGlobalCommentCached: bool = self.text.startswith('!!')
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isGlobalCommentCached
+        if self._cachedFlags & _CACHED_IS_GLOBAL_COMMENT:
+            return self._cachedValues & _CACHED_IS_GLOBAL_COMMENT != 0
+        value: bool = self.text.startswith('!!')
+        return self._setCachedFlag(_CACHED_IS_GLOBAL_COMMENT, value)
 
     '''
     //////////////////////////////
@@ -2051,12 +2074,10 @@ class HumdrumToken(HumHash):
     @property
     def isLocalComment(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isLocalCommentCached
-        except AttributeError:
-            self._isLocalCommentCached: bool = self.isComment and not self.isGlobalComment
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isLocalCommentCached
+        if self._cachedFlags & _CACHED_IS_LOCAL_COMMENT:
+            return self._cachedValues & _CACHED_IS_LOCAL_COMMENT != 0
+        value: bool = self.isComment and not self.isGlobalComment
+        return self._setCachedFlag(_CACHED_IS_LOCAL_COMMENT, value)
 
     '''
     //////////////////////////////
@@ -2066,12 +2087,10 @@ class HumdrumToken(HumHash):
     @property
     def isComment(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isCommentCached
-        except AttributeError:
-            self._isCommentCached: bool = self.text.startswith('!')
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isCommentCached
+        if self._cachedFlags & _CACHED_IS_COMMENT:
+            return self._cachedValues & _CACHED_IS_COMMENT != 0
+        value: bool = self.text.startswith('!')
+        return self._setCachedFlag(_CACHED_IS_COMMENT, value)
 
     '''
     //////////////////////////////
@@ -2084,16 +2103,14 @@ class HumdrumToken(HumHash):
     @property
     def isData(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isDataCached
-        except AttributeError:
-            self._isDataCached: bool = (
-                not self.isInterpretation
-                and not self.isComment
-                and not self.isBarline
-            )
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isDataCached
+        if self._cachedFlags & _CACHED_IS_DATA:
+            return self._cachedValues & _CACHED_IS_DATA != 0
+        value: bool = (
+            not self.isInterpretation
+            and not self.isComment
+            and not self.isBarline
+        )
+        return self._setCachedFlag(_CACHED_IS_DATA, value)
 
     '''
     //////////////////////////////
@@ -2103,12 +2120,10 @@ class HumdrumToken(HumHash):
     @property
     def isInterpretation(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isInterpretationCached
-        except AttributeError:
-            self._isInterpretationCached: bool = self.text.startswith('*')
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isInterpretationCached
+        if self._cachedFlags & _CACHED_IS_INTERPRETATION:
+            return self._cachedValues & _CACHED_IS_INTERPRETATION != 0
+        value: bool = self.text.startswith('*')
+        return self._setCachedFlag(_CACHED_IS_INTERPRETATION, value)
 
     '''
     //////////////////////////////
@@ -2119,12 +2134,10 @@ class HumdrumToken(HumHash):
     @property
     def isNonNullData(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isNonNullDataCached
-        except AttributeError:
-            self._isNonNullDataCached: bool = self.isData and not self.isNull
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isNonNullDataCached
+        if self._cachedFlags & _CACHED_IS_NON_NULL_DATA:
+            return self._cachedValues & _CACHED_IS_NON_NULL_DATA != 0
+        value: bool = self.isData and not self.isNull
+        return self._setCachedFlag(_CACHED_IS_NON_NULL_DATA, value)
 
     '''
     //////////////////////////////
@@ -2135,12 +2148,10 @@ class HumdrumToken(HumHash):
     @property
     def isNullData(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isNullDataCached
-        except AttributeError:
-            self._isNullDataCached: bool = self.isData and self.isNull
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isNullDataCached
+        if self._cachedFlags & _CACHED_IS_NULL_DATA:
+            return self._cachedValues & _CACHED_IS_NULL_DATA != 0
+        value: bool = self.isData and self.isNull
+        return self._setCachedFlag(_CACHED_IS_NULL_DATA, value)
 
     '''
     //////////////////////////////
@@ -2150,12 +2161,10 @@ class HumdrumToken(HumHash):
     @property
     def isLabel(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isLabelCached
-        except AttributeError:
-            self._isLabelCached: bool = self.text.startswith('*>') and '[' not in self.text
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isLabelCached
+        if self._cachedFlags & _CACHED_IS_LABEL:
+            return self._cachedValues & _CACHED_IS_LABEL != 0
+        value: bool = self.text.startswith('*>') and '[' not in self.text
+        return self._setCachedFlag(_CACHED_IS_LABEL, value)
 
     '''
     //////////////////////////////
@@ -2168,12 +2177,10 @@ class HumdrumToken(HumHash):
     @property
     def isChord(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isChordCached
-        except AttributeError:
-            self._isChordCached: bool = ' ' in self.text
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isChordCached
+        if self._cachedFlags & _CACHED_IS_CHORD:
+            return self._cachedValues & _CACHED_IS_CHORD != 0
+        value: bool = ' ' in self.text
+        return self._setCachedFlag(_CACHED_IS_CHORD, value)
 
     '''
     //////////////////////////////
@@ -2184,12 +2191,10 @@ class HumdrumToken(HumHash):
     @property
     def isExclusiveInterpretation(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isExclusiveInterpretationCached
-        except AttributeError:
-            self._isExclusiveInterpretationCached: bool = self.text.startswith('**')
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isExclusiveInterpretationCached
+        if self._cachedFlags & _CACHED_IS_EXCLUSIVE_INTERPRETATION:
+            return self._cachedValues & _CACHED_IS_EXCLUSIVE_INTERPRETATION != 0
+        value: bool = self.text.startswith('**')
+        return self._setCachedFlag(_CACHED_IS_EXCLUSIVE_INTERPRETATION, value)
 
     '''
     //////////////////////////////
@@ -2199,12 +2204,10 @@ class HumdrumToken(HumHash):
     @property
     def isSplitInterpretation(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isSplitInterpretationCached
-        except AttributeError:
-            self._isSplitInterpretationCached: bool = self.text == SPLIT_TOKEN
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isSplitInterpretationCached
+        if self._cachedFlags & _CACHED_IS_SPLIT_INTERPRETATION:
+            return self._cachedValues & _CACHED_IS_SPLIT_INTERPRETATION != 0
+        value: bool = self.text == SPLIT_TOKEN
+        return self._setCachedFlag(_CACHED_IS_SPLIT_INTERPRETATION, value)
 
     '''
     //////////////////////////////
@@ -2214,12 +2217,10 @@ class HumdrumToken(HumHash):
     @property
     def isMergeInterpretation(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isMergeInterpretationCached
-        except AttributeError:
-            self._isMergeInterpretationCached: bool = self.text == MERGE_TOKEN
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isMergeInterpretationCached
+        if self._cachedFlags & _CACHED_IS_MERGE_INTERPRETATION:
+            return self._cachedValues & _CACHED_IS_MERGE_INTERPRETATION != 0
+        value: bool = self.text == MERGE_TOKEN
+        return self._setCachedFlag(_CACHED_IS_MERGE_INTERPRETATION, value)
 
     '''
     //////////////////////////////
@@ -2229,12 +2230,10 @@ class HumdrumToken(HumHash):
     @property
     def isExchangeInterpretation(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isExchangeInterpretationCached
-        except AttributeError:
-            self._isExchangeInterpretationCached: bool = self.text == EXCHANGE_TOKEN
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isExchangeInterpretationCached
+        if self._cachedFlags & _CACHED_IS_EXCHANGE_INTERPRETATION:
+            return self._cachedValues & _CACHED_IS_EXCHANGE_INTERPRETATION != 0
+        value: bool = self.text == EXCHANGE_TOKEN
+        return self._setCachedFlag(_CACHED_IS_EXCHANGE_INTERPRETATION, value)
 
     '''
     //////////////////////////////
@@ -2244,12 +2243,10 @@ class HumdrumToken(HumHash):
     @property
     def isTerminateInterpretation(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isTerminateInterpretationCached
-        except AttributeError:
-            self._isTerminateInterpretationCached: bool = self.text == TERMINATE_TOKEN
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isTerminateInterpretationCached
+        if self._cachedFlags & _CACHED_IS_TERMINATE_INTERPRETATION:
+            return self._cachedValues & _CACHED_IS_TERMINATE_INTERPRETATION != 0
+        value: bool = self.text == TERMINATE_TOKEN
+        return self._setCachedFlag(_CACHED_IS_TERMINATE_INTERPRETATION, value)
 
     '''
     //////////////////////////////
@@ -2259,12 +2256,10 @@ class HumdrumToken(HumHash):
     @property
     def isAddInterpretation(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isAddInterpretationCached
-        except AttributeError:
-            self._isAddInterpretationCached: bool = self.text == ADD_TOKEN
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isAddInterpretationCached
+        if self._cachedFlags & _CACHED_IS_ADD_INTERPRETATION:
+            return self._cachedValues & _CACHED_IS_ADD_INTERPRETATION != 0
+        value: bool = self.text == ADD_TOKEN
+        return self._setCachedFlag(_CACHED_IS_ADD_INTERPRETATION, value)
 
     '''
     //////////////////////////////
@@ -2276,14 +2271,12 @@ class HumdrumToken(HumHash):
     @property
     def isNull(self) -> bool:
         # cache the result for performance
-        try:
-            return self._isNullCached
-        except AttributeError:
-            self._isNullCached: bool = (
-                self.text in (NULL_DATA, NULL_INTERPRETATION, NULL_COMMENT_LOCAL)
-            )
-            self._atLeastOneCachedTokenTextPropertyExists = True
-        return self._isNullCached
+        if self._cachedFlags & _CACHED_IS_NULL:
+            return self._cachedValues & _CACHED_IS_NULL != 0
+        value: bool = (
+            self.text in (NULL_DATA, NULL_INTERPRETATION, NULL_COMMENT_LOCAL)
+        )
+        return self._setCachedFlag(_CACHED_IS_NULL, value)
 
     '''
     //////////////////////////////
@@ -2521,7 +2514,7 @@ class HumdrumToken(HumHash):
         if newOwnerLine is not None and not isinstance(newOwnerLine, HumdrumLine):
             raise HumdrumInternalError('invalid newOwnerLine')
         self._address.ownerLine = newOwnerLine
-        if self._atLeastOneCachedDataTypePropertyExists:
+        if self._cachedFlags & _CACHED_DATA_TYPE_PROPERTIES:
             # some cached properties depend on dataType,
             # which depends on ownerLine and track
             self._clearCachedDataTypeProperties()
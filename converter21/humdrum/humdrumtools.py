@@ -49,6 +49,7 @@ class ToolTremolo:
             self.firstTremoloLinesInTrack.append([])
             self.lastTremoloLinesInTrack.append([])
 
+        nullLineTimestamps: list[HumNum] = []
         for line in reversed(list(self.infile.lines())):
             if not line.isData:
                 continue
@@ -86,7 +87,14 @@ class ToolTremolo:
                 startTime: HumNum = token.durationFromStart
                 for k in range(1, kcount):
                     timestamp: HumNum = opFrac(startTime + (increment * opFrac(k)))
-                    self.infile.insertNullDataLine(timestamp)
+                    nullLineTimestamps.append(timestamp)
+
+        # Insert the null data lines all at once, so the file's lines only
+        # get renumbered once.  (Each insertion only changes lines later than
+        # the tremolo being expanded, and we've already looked at those.)
+        with self.infile.deferredLineIndexing():
+            for timestamp in nullLineTimestamps:
+                self.infile.insertNullDataLine(timestamp)
 
         self.expandTremolos()
         self.addTremoloInterpretations()
@@ -11,6 +11,7 @@
 # License:       MIT, see LICENSE
 # ------------------------------------------------------------------------------
 import sys
+import threading
 from enum import IntEnum, auto
 # from copy import deepcopy
 # from fractions import Fraction
@@ -40,9 +41,11 @@ from converter21.humdrum import HumGrid
 
 from converter21.humdrum import HumdrumToken
 from converter21.humdrum import HumdrumFile
+from converter21.humdrum import TextOnlyHumdrumFile
 from converter21.humdrum import ToolTremolo
 
 from converter21.shared import M21Utilities
+from converter21.shared import M21SpannerIndex
 from converter21.shared import M21StaffGroupTree
 
 # For debug or unit test print, a simple way to get a string which is the current function name
@@ -106,6 +109,9 @@ class HumdrumWriter:
         # client can set to False if they want to keep the '@32@'-style
         # bowed tremolos, and the '@@16@@'-style fingered tremolos
         self.expandTremolos: bool = True
+        # client can set to True to extract each staff's events on a separate thread.
+        # This is only faster on free-threaded Python; the output is the same.
+        self.parallelStaves: bool = False
         # can be set to True for debugging output
         self.VoiceDebug: bool = False
 
@@ -120,6 +126,10 @@ class HumdrumWriter:
             str | tuple[tuple[str, str | None], ...],
             str
         ] = {}
+        # staves (possibly on separate threads) choose RDF signifiers while holding this
+        self._rdfSignifierLock: threading.Lock = threading.Lock()
+        # set if an RDF signifier other than the favorite had to be chosen
+        self._rdfSignifierFallbackChosen: bool = False
 
         # private data, computed along the way...
         self._forceRecipSpine: bool = False  # set to true sometimes in figured bass, harmony code
@@ -244,6 +254,14 @@ class HumdrumWriter:
         self,
         rdfDefinition: str | tuple[tuple[str, str | None], ...],
         favoriteSignifier: str
+    ) -> str:
+        with self._rdfSignifierLock:
+            return self._chooseSignifierForRDFDefinition(rdfDefinition, favoriteSignifier)
+
+    def _chooseSignifierForRDFDefinition(
+        self,
+        rdfDefinition: str | tuple[tuple[str, str | None], ...],
+        favoriteSignifier: str
     ) -> str:
         chosenSignifier: str | None = None
         # if we've already chosen a signifier, just return that
@@ -258,6 +276,7 @@ class HumdrumWriter:
             self._rdfKernSignifierLookup[rdfDefinition] = chosenSignifier
             self._assignedRDFKernSignifiers += chosenSignifier
         else:
+            self._rdfSignifierFallbackChosen = True
             # choose an unreserved, unassigned signifier
             for ch in self._reservableRDFKernSignifiers:
                 if ch in self.reservedRDFKernSignifiers:
@@ -381,8 +400,10 @@ class HumdrumWriter:
         M21Utilities.fixupBadDurations(self._m21Score, inPlace=True)
 
         # score.spannerBundle is an expensive operation (recurses through the whole score),
-        # so stash the result somewhere, rather than calling it again and again.
-        self.spannerBundle = self._m21Score.spannerBundle
+        # so stash the result somewhere, rather than calling it again and again.  We stash
+        # it as an M21SpannerIndex, so the many "is this spanner in the bundle?" checks
+        # during export are O(1).
+        self.spannerBundle = M21SpannerIndex(self._m21Score.spannerBundle)
 
         # set up _firstTempoLayout ('!!LO:TX:omd:t=something') for use when emitting
         # the first time signature (might have no text if there is none).
@@ -461,20 +482,37 @@ class HumdrumWriter:
 
         # print(f'outgrid={outgrid}', file=sys.stderr)
 
-        outfile: HumdrumFile = HumdrumFile()
-        outgrid.transferTokens(outfile)
+        # client can disable tremolo expansion by setting self.expandTremolos to False
+        needsTremoloExpansion: bool = self._hasTremolo and self.expandTremolos
 
-        self._addHeaderRecords(outfile)
-        self._addFooterRecords(outfile)
+        outfile: HumdrumFile | TextOnlyHumdrumFile
+        if needsTremoloExpansion:
+            # ToolTremolo needs a real HumdrumFile (to analyze and modify)
+            outfile = HumdrumFile()
+        else:
+            # Nothing will analyze or modify outfile before it is written, so all we
+            # need is the text of each line (no HumdrumLines or HumdrumTokens).
+            outfile = TextOnlyHumdrumFile()
+
+        # The header lines (and reference records) are inserted one at a time at
+        # (or near) the start of outfile, so we renumber the lines just once, at
+        # the end.
+        with outfile.deferredLineIndexing():
+            outgrid.transferTokens(outfile)
+
+            self._addHeaderRecords(outfile)
+            self._addFooterRecords(outfile)
         # self._addMeasureOneNumber(outfile)
 
-        for hline in outfile.lines():
-            hline.createLineFromTokens()
+        if isinstance(outfile, HumdrumFile):
+            for hline in outfile.lines():
+                hline.createLineFromTokens()
 
 #         chord.run(outfile) # makes sure each note in the chord has the right stuff on it?
 
-        # client can disable tremolo expansion by setting self.expandTremolos to False
-        if self._hasTremolo and self.expandTremolos:
+        if needsTremoloExpansion:
+            if t.TYPE_CHECKING:
+                assert isinstance(outfile, HumdrumFile)
             # tremolos have been inserted as single tokens (or token pairs) that describe
             # the tremolo (e.g. with '@@16@@' or '@32@').  This needs to be expanded into
             # all the actual notes in the tremolo, surrounded by *tremolo/*Xtremolo to tell
@@ -517,7 +555,7 @@ class HumdrumWriter:
     // the file.
     '''
     @staticmethod
-    def _printResult(fp, outfile: HumdrumFile) -> None:
+    def _printResult(fp, outfile: HumdrumFile | TextOnlyHumdrumFile) -> None:
         outfile.write(fp)
 
     '''
@@ -525,7 +563,7 @@ class HumdrumWriter:
     //
     // Tool_musicxml2hum::addFooterRecords --
     '''
-    def _addFooterRecords(self, outfile: HumdrumFile) -> None:
+    def _addFooterRecords(self, outfile: HumdrumFile | TextOnlyHumdrumFile) -> None:
         for definition, signifier in self._rdfKernSignifierLookup.items():
             rdfLine = f'!!!RDF**kern: {signifier} = '
             if isinstance(definition, tuple):  # it's a tuple of k/v pairs (tuples)
@@ -560,7 +598,7 @@ class HumdrumWriter:
         'date': 'ODT'
     }
 
-    def _addHeaderRecords(self, outfile: HumdrumFile) -> None:
+    def _addHeaderRecords(self, outfile: HumdrumFile | TextOnlyHumdrumFile) -> None:
         systemDecoration: str = self._getSystemDecoration()
         if systemDecoration and systemDecoration != 's1':
             outfile.appendLine('!!!system-decoration: ' + systemDecoration, asGlobalToken=True)
@@ -940,6 +978,50 @@ class HumdrumWriter:
                 output[staffData.m21PartStaff] = staffNumber
         return output
 
+    def _makeScoreData(self, score: m21.stream.Score) -> ScoreData:
+        if not self.parallelStaves:
+            return ScoreData(score, self)
+
+        # The staves choose their RDF signifiers in whatever order their threads get
+        # there, so remember what had been chosen before they started.
+        rdfLookupBefore: dict[str | tuple[tuple[str, str | None], ...], str] = (
+            dict(self._rdfKernSignifierLookup)
+        )
+        assignedBefore: str = self._assignedRDFKernSignifiers
+        self._rdfSignifierFallbackChosen = False
+
+        scoreData: ScoreData = ScoreData(score, self, parallelStaves=True)
+
+        if self._rdfSignifierFallbackChosen:
+            # Which non-favorite signifier got chosen depends on the order the staves
+            # asked, so start over one staff at a time, to get the usual output.
+            self._rdfKernSignifierLookup = rdfLookupBefore
+            self._assignedRDFKernSignifiers = assignedBefore
+            return ScoreData(score, self)
+
+        # Every definition got its favorite signifier, so the only difference is
+        # the order of the RDF footer lines.  Put them in staff order, which is
+        # the order they would have been chosen in one staff at a time.
+        signifierOrder: list[str] = list(rdfLookupBefore.values())
+        for partData in scoreData.parts:
+            for staffData in partData.staves:
+                for signifier in staffData.rdfSignifiersReported:
+                    if signifier not in signifierOrder:
+                        signifierOrder.append(signifier)
+        for signifier in self._rdfKernSignifierLookup.values():
+            if signifier not in signifierOrder:
+                signifierOrder.append(signifier)
+
+        definitionFromSignifier: dict[str, str | tuple[tuple[str, str | None], ...]] = {
+            signifier: definition
+            for definition, signifier in self._rdfKernSignifierLookup.items()
+        }
+        self._rdfKernSignifierLookup = {
+            definitionFromSignifier[signifier]: signifier for signifier in signifierOrder
+        }
+        self._assignedRDFKernSignifiers = ''.join(signifierOrder)
+        return scoreData
+
     '''
     //////////////////////////////
     //
@@ -960,7 +1042,7 @@ class HumdrumWriter:
         if err:
             raise HumdrumExportError(err)
 
-        self._scoreData = ScoreData(score, self)
+        self._scoreData = self._makeScoreData(score)
 
         self.staffCounts = self._scoreData.getStaffCounts()
         # The measure counts are equal across all Parts
@@ -2087,28 +2169,6 @@ class HumdrumWriter:
         elif isSystemBreak:
             outgm.addGlobalComment('!!LO:LB:g=z', nowTime)
 
-    def insertSliceByTimestamp(self, slices: list[GridSlice], theSlice: GridSlice):
-        if not slices:
-            slices.append(theSlice)
-            return
-
-        if slices[0].timestamp > theSlice.timestamp:
-            slices.insert(0, theSlice)
-            return
-
-        # travel backwards in the slices list until the correct
-        # time position is found.  insertionIdx goes from len(slices)
-        # down to 1 (thus we have to handle 0 above)
-        insertionIdx: int = len(slices)
-        for walkSlice in reversed(slices):
-            if walkSlice.timestamp <= theSlice.timestamp:
-                slices.insert(insertionIdx, theSlice)
-                return
-            insertionIdx -= 1
-
-        # How did we get here? Can't be!
-        raise HumdrumInternalError('insertion by timestamp failed')
-
     '''
     /////////////////////////////
     //
@@ -2125,7 +2185,7 @@ class HumdrumWriter:
 
         outSlice: GridSlice = GridSlice(outgm, nowTime, SliceType.Notes, self.staffCounts)
 
-        self.insertSliceByTimestamp(outgm.slices, outSlice)
+        outgm.insertSliceByTimestamp(outSlice)
 
         for ne in nowEvents:
             events: list[EventData] = ne.nonZeroDur
@@ -2501,7 +2561,8 @@ class HumdrumWriter:
         # creates/inserts (or finds/reuses) a slice at timestamp, to add a new voice containing
         # an invisible rest of the requested duration.
         foundSlice: GridSlice | None = None
-        for testSlice in outgm.slices:
+        for idx in range(outgm.sliceIndexAtOrAfter(timestamp), len(outgm.slices)):
+            testSlice: GridSlice = outgm.slices[idx]
             if not testSlice.isNoteSlice:
                 continue
             if testSlice.timestamp > timestamp:
@@ -2539,7 +2600,7 @@ class HumdrumWriter:
                 GridVoice(f'{M21Convert.kernRecipFromM21Duration(duration)[0]}ryy')
             )
 
-            self.insertSliceByTimestamp(outgm.slices, newSlice)
+            outgm.insertSliceByTimestamp(newSlice)
 
         return newSlice
 
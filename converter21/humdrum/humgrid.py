@@ -30,6 +30,7 @@ from converter21.humdrum import GridMeasure
 from converter21.humdrum import HumdrumToken
 from converter21.humdrum import HumdrumLine
 from converter21.humdrum import HumdrumFile
+from converter21.humdrum import TextOnlyHumdrumFile
 
 # For debug or unit test print, a simple way to get a string which is the current function name
 # with a colon appended.
@@ -343,7 +344,11 @@ class HumGrid:
     // HumGrid::transferTokens --
     //   default value: startbarnum = 0.
     '''
-    def transferTokens(self, outFile: HumdrumFile, interp: str = '**kern') -> bool:
+    def transferTokens(
+        self,
+        outFile: HumdrumFile | TextOnlyHumdrumFile,
+        interp: str = '**kern'
+    ) -> bool:
         status: bool = self.buildSingleList()
         if not status:
             return False
@@ -2008,7 +2013,7 @@ class HumGrid:
     //
     // HumGrid::insertPartNames --
     '''
-    def insertPartNames(self, outFile: HumdrumFile) -> None:
+    def insertPartNames(self, outFile: HumdrumFile | TextOnlyHumdrumFile) -> None:
         if not self._partNames:
             return
 
@@ -2064,7 +2069,7 @@ class HumGrid:
     //    MusicXML Part number. (Some parts will contain more than one
     //    staff).
     '''
-    def insertStaffIndications(self, outFile: HumdrumFile) -> None:
+    def insertStaffIndications(self, outFile: HumdrumFile | TextOnlyHumdrumFile) -> None:
         if not self.measures:
             return
         if not self.measures[0].slices:
@@ -2138,7 +2143,7 @@ class HumGrid:
     //    MusicXML Part number. (Some parts will contain more than one
     //    staff).
     '''
-    def insertPartIndications(self, outFile: HumdrumFile) -> None:
+    def insertPartIndications(self, outFile: HumdrumFile | TextOnlyHumdrumFile) -> None:
         if not self.measures:
             return
         if not self.measures[0].slices:
@@ -2188,7 +2193,11 @@ class HumGrid:
     //    that the first entry contains spines.  And the first measure
     //    in the HumGrid object must contain a slice.
     '''
-    def insertExclusiveInterpretationLine(self, outFile: HumdrumFile, interp: str) -> None:
+    def insertExclusiveInterpretationLine(
+        self,
+        outFile: HumdrumFile | TextOnlyHumdrumFile,
+        interp: str
+    ) -> None:
         if not self.measures:
             return
         if not self.measures[0].slices:
@@ -2237,7 +2246,7 @@ class HumGrid:
     //    measure in the HumGrid object must contain a slice.
     //    Also need to compensate for *v on previous line.
     '''
-    def insertDataTerminationLine(self, outFile: HumdrumFile) -> None:
+    def insertDataTerminationLine(self, outFile: HumdrumFile | TextOnlyHumdrumFile) -> None:
         if not self.measures:
             return
         if not self.measures[0].slices:
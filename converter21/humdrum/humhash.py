@@ -80,6 +80,8 @@ def fixupNamespace1Namespace2(
     return (ns1, ns2)
 
 class HumParameter:
+    __slots__ = ('_value', '_origin')
+
     def __init__(self, value: t.Any | None, origin=None) -> None:
         # value can be of any type (different from humlib, where it's always a string)
         from converter21.humdrum import HumdrumToken
@@ -108,9 +110,13 @@ class HumParameter:
         self._origin = newOrigin
 
 class HumHash:
+    __slots__ = ('_parameters', '_prefix')
+
     def __init__(self) -> None:
         # {ns1...,{ns2..., {key..., value...}}}
-        self._parameters: dict[str, dict[str, dict[str, HumParameter]]] = {}
+        # Most objects never get any parameters, so the dict is allocated
+        # lazily (by setValue).
+        self._parameters: dict[str, dict[str, dict[str, HumParameter]]] | None = None
         self._prefix: str = ''
 
     '''
@@ -158,6 +164,9 @@ class HumHash:
         key: str
         ns1, ns2, key = fixupNamespace1Namespace2Key(*ns1ns2key)
 
+        if self._parameters is None:
+            self._parameters = {}
+
         if ns1 not in self._parameters:
             self._parameters[ns1] = dict([(ns2, dict([(key, HumParameter(value))]))])
         elif ns2 not in self._parameters[ns1]:
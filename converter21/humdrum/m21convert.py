@@ -30,6 +30,7 @@ from converter21.humdrum import HumdrumInternalError
 from converter21.humdrum import HumNum
 from converter21.humdrum import HumdrumToken
 from converter21.humdrum import Convert
+from converter21.humdrum import KernPitch
 from converter21.shared import M21Utilities
 
 
@@ -226,17 +227,13 @@ class M21Convert:
     @staticmethod
     def m21PitchName(subTokenStr: str) -> str:
         # e.g. returns 'A#' for A sharp (ignores octave)
-        diatonic: int = Convert.kernToDiatonicPC(subTokenStr)  # PC == pitch class; ignores octave
+        pitch: KernPitch = Convert.kernToPitch(subTokenStr)
+        diatonic: int = pitch.diatonic  # PC == pitch class; ignores octave
         if diatonic < 0:
             # no pitch here, it's an unpitched note without a note position
             return ''
 
-        accidCount: int = 0
-        for ch in subTokenStr:
-            if ch == '#':
-                accidCount += 1
-            elif ch == '-':
-                accidCount -= 1
+        accidCount: int = pitch.accidentals
 
         accidStr: str = ''
         if accidCount < 0:
@@ -260,7 +260,6 @@ class MeasureData:
             emptyStartDuration: HumNumIn = 0,
             emptyEndDuration: HumNumIn = 0
     ) -> None:
-        ownerWriter = self.ownerStaff.ownerPart.ownerScore.ownerWriter
         event: EventData
         durations: list[HumNum]
         startTime: HumNum
@@ -300,7 +299,7 @@ class MeasureData:
                 if noteOrChord:
                     noteOrChord.humdrum_sf_or_sfz = element  # type: ignore
                     M21Utilities.extendCustomM21Attributes(
-                        ownerWriter.customM21AttrsToDelete,
+                        self.ownerStaff.customM21AttrsToDelete,
                         noteOrChord,
                         ['humdrum_sf_or_sfz']
                     )
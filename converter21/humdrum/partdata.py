@@ -12,6 +12,7 @@
 # License:       MIT, see LICENSE
 # ------------------------------------------------------------------------------
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import music21 as m21
 
@@ -32,7 +33,8 @@ class PartData:
             partStaves: list[m21.stream.Part],    # or PartStaff (derived from Part)
             ownerScore,                             # ScoreData
             partIndex: int,
-            humdrumStartingStaffNum
+            humdrumStartingStaffNum,
+            executor: ThreadPoolExecutor | None = None
     ) -> None:
         from converter21.humdrum import ScoreData
         self.ownerScore: ScoreData = ownerScore
@@ -43,14 +45,28 @@ class PartData:
 
         # partStaves will be a list of one Part, or a list of multiple PartStaffs,
         # but we don't really care. We make a StaffData out of each one.
+        # If there is an executor, the StaffDatas (and all their MeasureDatas and
+        # EventDatas) are made on its threads, and finishStaves() waits for them.
         self.staves: list[StaffData] = []
+        self._pendingStaves: list[Future[StaffData]] = []
         for s, partStaff in enumerate(partStaves):
+            if executor is not None:
+                self._pendingStaves.append(
+                    executor.submit(StaffData, partStaff, self, s, humdrumStartingStaffNum + s)
+                )
+                continue
             staffData: StaffData = StaffData(partStaff, self, s, humdrumStartingStaffNum + s)
             self.staves.append(staffData)
 
         self._partName: str = self._findPartName(partStaves)
         self._partAbbrev: str = self._findPartAbbrev(partStaves)
 
+    def finishStaves(self) -> None:
+        # waits for any StaffDatas being made on executor threads (keeping them in order)
+        for pendingStaff in self._pendingStaves:
+            self.staves.append(pendingStaff.result())
+        self._pendingStaves = []
+
     @property
     def partIndex(self) -> int:
         return self._partIndex
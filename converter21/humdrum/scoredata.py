@@ -13,6 +13,7 @@
 # License:       MIT, see LICENSE
 # ------------------------------------------------------------------------------
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import music21 as m21
 from music21.common.misc import flattenList
@@ -20,6 +21,7 @@ from music21.common.misc import flattenList
 from converter21.humdrum import HumdrumInternalError
 from converter21.humdrum import EventData
 from converter21.humdrum import PartData
+from converter21.shared import M21Utilities
 
 # For debug or unit test print, a simple way to get a string which is the current function name
 # with a colon appended.
@@ -33,7 +35,12 @@ funcName = lambda n=0: sys._getframe(n + 1).f_code.co_name + ':'  # pragma no co
 # TODO: pass StaffGroup into PartData() so we have another source of partName/partAbbrev
 
 class ScoreData:
-    def __init__(self, score: m21.stream.Score, ownerWriter) -> None:
+    def __init__(
+        self,
+        score: m21.stream.Score,
+        ownerWriter,
+        parallelStaves: bool = False
+    ) -> None:
         from converter21.humdrum import HumdrumWriter
         self.ownerWriter: HumdrumWriter = ownerWriter
 
@@ -94,6 +101,37 @@ class ScoreData:
                 partsWithMoreThanOneStaff[-1].append(partStaff)
                 groupedParts.append(partStaff)
 
+        # If parallelStaves, each staff's events are extracted on its own thread.  A
+        # DynamicWedge that ends on a different staff than it starts on needs to find
+        # its start event (from the other staff) first, so in that case we don't.
+        executor: ThreadPoolExecutor | None = None
+        if parallelStaves and not self._hasCrossStaffDynamicWedges(self.spannerBundle):
+            executor = ThreadPoolExecutor()
+
+        try:
+            self._makeParts(score, partsWithMoreThanOneStaff, groupedParts, executor)
+            for partData in self.parts:
+                partData.finishStaves()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        # merge the staves' custom m21 attributes into the writer's (in staff order)
+        for partData in self.parts:
+            for staffData in partData.staves:
+                for obj, attrs in staffData.customM21AttrsToDelete.items():
+                    M21Utilities.extendCustomM21Attributes(
+                        self.ownerWriter.customM21AttrsToDelete, obj, attrs
+                    )
+                staffData.customM21AttrsToDelete = {}
+
+    def _makeParts(
+        self,
+        score: m21.stream.Score,
+        partsWithMoreThanOneStaff: list[list[m21.stream.Part]],
+        groupedParts: list[m21.stream.PartStaff],
+        executor: ThreadPoolExecutor | None
+    ) -> None:
         scorePartsStillToProcess = list(score.parts)
         for part in score.parts:  # includes PartStaffs, too
             if part not in scorePartsStillToProcess:
@@ -109,7 +147,8 @@ class ScoreData:
                             partStaffList,
                             self,
                             len(self.parts),
-                            humdrumStartingStaffNum
+                            humdrumStartingStaffNum,
+                            executor
                         )
                         humdrumStartingStaffNum += len(partStaffList)
                         self.parts.append(partOfStavesData)
@@ -122,12 +161,25 @@ class ScoreData:
                     [part],
                     self,
                     len(self.parts),
-                    humdrumStartingStaffNum
+                    humdrumStartingStaffNum,
+                    executor
                 )
                 humdrumStartingStaffNum += 1
                 self.parts.append(partData)
                 scorePartsStillToProcess.remove(part)
 
+    @staticmethod
+    def _hasCrossStaffDynamicWedges(spannerBundle: m21.spanner.SpannerBundle) -> bool:
+        for wedge in spannerBundle.getByClass(m21.dynamics.DynamicWedge):
+            first: m21.base.Music21Object | None = wedge.getFirst()
+            last: m21.base.Music21Object | None = wedge.getLast()
+            if first is None or last is None:
+                continue
+            if (first.getContextByClass(m21.stream.Part)
+                    is not last.getContextByClass(m21.stream.Part)):
+                return True
+        return False
+
     @property
     def partCount(self) -> int:
         return len(self.parts)
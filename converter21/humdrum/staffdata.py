@@ -50,6 +50,13 @@ class StaffData:
         self._verseCount: int = 0
         self.measures: list[MeasureData] = []
 
+        # Staves might be made on separate threads, so each staff keeps its own custom
+        # m21 attributes to delete (ScoreData merges them into the writer's, in staff
+        # order), and remembers the RDF signifiers it reported, in the order it
+        # reported them.
+        self.customM21AttrsToDelete: dict[m21.base.Music21Object, list[str]] = {}
+        self.rdfSignifiersReported: list[str] = []
+
         prevMeasData: MeasureData | None = None
         for m, measure in enumerate(partStaff.getElementsByClass('Measure')):
             measData: MeasureData = MeasureData(measure, self, m, prevMeasData)
@@ -83,20 +90,27 @@ class StaffData:
     def verseCount(self) -> int:
         return self._verseCount
 
+    def _rememberRDFSignifier(self, signifier: str) -> str:
+        if signifier not in self.rdfSignifiersReported:
+            self.rdfSignifiersReported.append(signifier)
+        return signifier
+
     def reportEditorialAccidentalToOwner(self, editorialStyle: str) -> str:
-        return self.ownerPart.reportEditorialAccidentalToOwner(editorialStyle)
+        return self._rememberRDFSignifier(
+            self.ownerPart.reportEditorialAccidentalToOwner(editorialStyle)
+        )
 
     def reportCaesuraToOwner(self) -> str:
-        return self.ownerPart.reportCaesuraToOwner()
+        return self._rememberRDFSignifier(self.ownerPart.reportCaesuraToOwner())
 
     def reportCueSizeToOwner(self) -> str:
-        return self.ownerPart.reportCueSizeToOwner()
+        return self._rememberRDFSignifier(self.ownerPart.reportCueSizeToOwner())
 
     def reportNoteColorToOwner(self, color: str) -> str:
-        return self.ownerPart.reportNoteColorToOwner(color)
+        return self._rememberRDFSignifier(self.ownerPart.reportNoteColorToOwner(color))
 
     def reportLinkedSlurToOwner(self) -> str:
-        return self.ownerPart.reportLinkedSlurToOwner()
+        return self._rememberRDFSignifier(self.ownerPart.reportLinkedSlurToOwner())
 
     def receiveVerseCount(self, verseCount: int) -> None:
         # don't propagate up to PartData, verses are per staff
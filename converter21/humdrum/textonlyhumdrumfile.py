@@ -0,0 +1,119 @@
+# ------------------------------------------------------------------------------
+# Name:          textonlyhumdrumfile.py
+# Purpose:       TextOnlyHumdrumFile (and TextOnlyHumdrumLine) are lightweight
+#                stand-ins for HumdrumFile (and HumdrumLine), used by HumdrumWriter
+#                when the exported Humdrum file doesn't need to be analyzed (or
+#                modified) before it is written.  They keep only the text of each
+#                line, so no per-token HumdrumTokens are created, and no
+#                HumdrumLines are created for the slices of the HumGrid.
+#
+# Authors:       Greg Chapman <gregc@mac.com>
+#
+# Copyright:     (c) 2023 Greg Chapman
+# License:       MIT, see LICENSE
+# ------------------------------------------------------------------------------
+import typing as t
+from contextlib import contextmanager
+
+from converter21.humdrum import HumdrumToken
+from converter21.humdrum import HumdrumLine
+
+
+class TextOnlyHumdrumLine:
+    '''
+    Collects the text of each token appended to it.  The text of the line is the
+    token texts separated by tabs, just like HumdrumLine.createLineFromTokens
+    would produce.
+    '''
+    __slots__ = ('_tokenTexts',)
+
+    def __init__(self) -> None:
+        self._tokenTexts: list[str] = []
+
+    def appendToken(self, token: HumdrumToken | str, tabCount: int = 0) -> None:
+        if isinstance(token, str):
+            self._tokenTexts.append(token)
+        else:
+            self._tokenTexts.append(token.text)
+
+    @property
+    def tokenCount(self) -> int:
+        return len(self._tokenTexts)
+
+    @property
+    def text(self) -> str:
+        return '\t'.join(self._tokenTexts)
+
+
+class TextOnlyHumdrumFile:
+    '''
+    Supports just enough of the HumdrumFile API (appendLine, insertLine,
+    deferredLineIndexing, write) for HumGrid.transferTokens and HumdrumWriter's
+    header/footer records.  Lines can be appended/inserted as str, HumdrumLine or
+    TextOnlyHumdrumLine; only their text is kept.
+
+    >>> hf = TextOnlyHumdrumFile()
+    >>> line = TextOnlyHumdrumLine()
+    >>> line.appendToken('4c')
+    >>> line.appendToken(HumdrumToken('4e'))
+    >>> hf.appendLine(line)
+    >>> hf.insertLine(0, '!!!COM: Nobody', asGlobalToken=True)
+    >>> hf.lineCount
+    2
+    >>> import io
+    >>> fp = io.StringIO()
+    >>> hf.write(fp)
+    >>> fp.getvalue()
+    '!!!COM: Nobody\\n4c\\t4e\\n'
+    '''
+    def __init__(self) -> None:
+        self._lines: list[str] = []
+
+    @staticmethod
+    def _lineText(line: HumdrumLine | TextOnlyHumdrumLine | str) -> str:
+        if isinstance(line, str):
+            if line and line[-1] == '\n':
+                # strip off any trailing LF (as HumdrumLine does)
+                line = line[:-1]
+            return line
+        if isinstance(line, HumdrumLine):
+            # what line.createLineFromTokens() would produce
+            return '\t'.join(token.text for token in line.tokens())
+        if isinstance(line, TextOnlyHumdrumLine):
+            return line.text
+        raise TypeError(
+            'line must be str, HumdrumLine, or TextOnlyHumdrumLine'
+        )
+
+    # asGlobalToken is accepted for compatibility with HumdrumFile; a str line is
+    # kept as is, whether or not it is a global token.
+    def appendLine(
+        self,
+        line: HumdrumLine | TextOnlyHumdrumLine | str,
+        asGlobalToken: bool = False
+    ) -> None:
+        self._lines.append(self._lineText(line))
+
+    def insertLine(
+        self,
+        index: int,
+        line: HumdrumLine | TextOnlyHumdrumLine | str,
+        asGlobalToken: bool = False
+    ) -> None:
+        self._lines.insert(index, self._lineText(line))
+
+    # There are no line indexes to maintain, so there is nothing to defer.
+    @contextmanager
+    def deferredLineIndexing(self) -> t.Iterator[None]:
+        yield
+
+    @property
+    def lineCount(self) -> int:
+        return len(self._lines)
+
+    def lines(self) -> t.Iterator[str]:
+        yield from self._lines
+
+    def write(self, fp) -> None:
+        for line in self._lines:
+            fp.write(line + '\n')
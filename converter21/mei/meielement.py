@@ -32,13 +32,14 @@ class MeiElement:
         self.tail: str = ''
         self.subElements: list[MeiElement] = []
 
-        if isinstance(elem, Element):
+        if not isinstance(elem, str):
+            # an ElementTree (or lxml) element
             self.tag = elem.tag
             if self.tag.startswith('{') and '}' in self.tag:
                 self.name = self.tag.split('}')[-1]
             else:
                 self.name = self.tag
-            self.attrib = elem.attrib
+            self.attrib = dict(elem.attrib)
             self.text = elem.text or ''
             self.tail = elem.tail or ''
 
@@ -11,6 +11,7 @@
 import sys
 # from xml.etree.ElementTree import TreeBuilder
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 
 import music21 as m21
 # from music21.common import opFrac
@@ -21,6 +22,7 @@ from converter21.mei import M21ObjectConvert
 from converter21.mei import MeiInternalError
 from converter21.shared import M21Utilities
 from converter21.shared import DebugTreeBuilder as TreeBuilder
+from converter21.shared import TreeBuilderRecorder
 
 # For debug or unit test print, a simple way to get a string which is the current function name
 # with a colon appended.
@@ -64,6 +66,9 @@ class MeiMeasure:
         self.spannerBundle = spannerBundle
 
         self.staves: list[MeiStaff] = []
+        # If the staves will be made on separate threads, each staff gets its own
+        # customAttrs, which makeRootElement merges into ours (in staff order).
+        self._staffCustomAttrs: list[dict[m21.base.Music21Object, list[str]]] = []
         self.measureNumStr: str = ''
         for m in m21Measures:
             if not self.measureNumStr:
@@ -76,7 +81,11 @@ class MeiMeasure:
             if part is None:
                 raise MeiInternalError('Found a Measure that\'s not in a Part.')
             nStr: str = str(parentScore.staffNumbersForM21Parts[part])
-            staff = MeiStaff(nStr, m, parentScore, customAttrs, spannerBundle)
+            staffCustomAttrs: dict[m21.base.Music21Object, list[str]] = customAttrs
+            if parentScore.parallelStaves:
+                staffCustomAttrs = {}
+                self._staffCustomAttrs.append(staffCustomAttrs)
+            staff = MeiStaff(nStr, m, parentScore, staffCustomAttrs, spannerBundle)
             self.staves.append(staff)
 
     @staticmethod
@@ -123,7 +132,12 @@ class MeiMeasure:
             return True
         return False
 
-    def makeRootElement(self, tb: TreeBuilder):
+    def makeRootElement(self, tb: TreeBuilder, executor: ThreadPoolExecutor | None = None):
+        '''
+            tb: the TreeBuilder to emit the <measure> (and any <pb>, <sb>, <ending>) to
+            executor: if not None, each staff's <staff> element is made on one of
+                executor's threads (and then emitted to tb in staff order)
+        '''
         startsWithPageBreak: bool = False
         pageNum: int | None = None
         startsWithPageBreak, pageNum = self.startsWithPageBreak()
@@ -143,14 +157,33 @@ class MeiMeasure:
         self._fillInMeasureAttributes(attr)
 
         tb.start('measure', attr)
-        for staff in self.staves:
-            staff.makeRootElement(tb)
+        if executor is None:
+            for staff in self.staves:
+                staff.makeRootElement(tb)
+        else:
+            recorders: list[TreeBuilderRecorder] = list(
+                executor.map(self._recordStaffRootElement, self.staves)
+            )
+            for recorder in recorders:
+                recorder.replay(tb)
         for staff in self.staves:
             staff.makePostStavesElements(tb)
         tb.end('measure')
 
+        for staffCustomAttrs in self._staffCustomAttrs:
+            for obj, attrs in staffCustomAttrs.items():
+                M21Utilities.extendCustomM21Attributes(self.customAttrs, obj, attrs)
+        self._staffCustomAttrs = []
+
         self._checkForEndingEnd(tb)
 
+    @staticmethod
+    def _recordStaffRootElement(staff: MeiStaff) -> TreeBuilderRecorder:
+        # runs on an executor thread
+        recorder = TreeBuilderRecorder()
+        staff.makeRootElement(recorder)
+        return recorder
+
     def _checkForEndingStart(self, tb: TreeBuilder):
         rb: m21.spanner.RepeatBracket | None = None
 
@@ -1486,7 +1486,7 @@ class MeiMetadataReader:
         return ''
 
     def processMusicBackElement(self, back: Element | MeiElement):
-        if isinstance(back, Element):
+        if not isinstance(back, MeiElement):
             back = MeiElement(back)
         backLang: str = back.get(_XMLLANG, '')
         for div in back.findAll('div', recurse=False):
@@ -175,6 +175,8 @@ tool.
 '''
 import typing as t
 from xml.etree.ElementTree import Element, ParseError, fromstring, ElementTree
+from xml.etree.ElementTree import XMLPullParser
+import pathlib
 import re
 import html
 
@@ -184,6 +186,17 @@ from fractions import Fraction  # for typing
 from uuid import uuid4
 from functools import cache
 
+# lxml is optional; if it is installed, we use it to parse MEI documents that are
+# passed in as bytes (it's a good deal faster than ElementTree).  lxml 5 or later is
+# required, since older versions can't resolve only the internal entities (which is
+# what ElementTree does).
+try:
+    from lxml import etree as lxmlEtree  # type: ignore
+    if lxmlEtree.LXML_VERSION < (5,):
+        lxmlEtree = None
+except ImportError:
+    lxmlEtree = None
+
 # music21
 import music21 as m21
 from music21.base import Music21Object
@@ -228,6 +241,8 @@ DENOM_LIMIT = 768
 
 _XMLID = '{http://www.w3.org/XML/1998/namespace}id'
 MEI_NS = '{http://www.music-encoding.org/ns/mei}'
+# metadataFromDocument/metadataFromFile feed the incremental parser this much at a time
+_METADATA_CHUNK_SIZE: int = 64 * 1024
 # when these tags aren't processed, we won't worry about them (at least for now)
 _IGNORE_UNPROCESSED = (
     f'{MEI_NS}annot',        # annotations are skipped; someday maybe goes into editorial?
@@ -279,12 +294,25 @@ class MeiReader:
     :class:`MeiElementError`. If ``theDocument`` is not a valid XML file, the class raises an
     :class:`MeiValidityError`.
 
-    :param str theDocument: A string containing a MEI document.
+    ``theDocument`` can be a string, or the raw bytes of a MEI file.  Bytes are preferred,
+    since they are only decoded once, by the XML parser, which determines the encoding from
+    the XML declaration (or BOM).  Bytes are parsed with lxml, if it is installed.
+
+    If ``releaseMeasureElements`` is True, the contents of each <measure> element are
+    released as soon as that measure has been converted, which keeps peak memory down
+    when converting very large documents.  The MEI tree is not usable afterward.
+
+    :param theDocument: A string (or bytes) containing a MEI document.
+    :param bool releaseMeasureElements: Free each <measure>'s subtree once it is converted.
     :raises: :exc:`MeiElementError` when the root element is not <mei>
     :raises: :exc:`MeiValidityError` when the MEI file is not valid XML.
     '''
 
-    def __init__(self, theDocument: str | None = None) -> None:
+    def __init__(
+        self,
+        theDocument: str | bytes | None = None,
+        releaseMeasureElements: bool = False
+    ) -> None:
         M21Utilities.adjustMusic21Behavior()
 
         #  The __init__() documentation doesn't isn't processed by Sphinx,
@@ -295,19 +323,14 @@ class MeiReader:
 
         self.documentRoot: Element
         self.meiVersion: str
+        self.releaseMeasureElements: bool = releaseMeasureElements
 
         if theDocument is None:
             # Without this, the class can't be pickled.
             self.documentRoot = Element(f'{MEI_NS}mei')
             self.meiVersion = '5.0+CMN'
         else:
-            try:
-                self.documentRoot = fromstring(theDocument)
-            except ParseError as parseErr:
-                environLocal.warn(
-                    '\n\nERROR: Parsing the MEI document with ElementTree failed.')
-                environLocal.warn(f'We got the following error:\n{parseErr}')
-                raise MeiValidityError(_INVALID_XML_DOC)
+            self.documentRoot = self._parseDocument(theDocument)
 
             if isinstance(self.documentRoot, ElementTree):
                 self.documentRoot = self.documentRoot.getroot()
@@ -339,6 +362,14 @@ class MeiReader:
         # the MEI tree).
         self.m21Attr: defaultdict = defaultdict(lambda: {})
 
+        # The control event elements (<slur>, <tie>, etc) in the <score>, gathered up by tag
+        # in a single pass over the document (see _ppGatherElements), so each of the
+        # preprocessors doesn't have to search the whole document for its elements.  The
+        # same pass builds an @xml:id -> elements index, which _ppConclude uses to find the
+        # elements that need the m21Attr attributes.
+        self._ppElementsByTag: dict[str, list[Element]] | None = None
+        self._ppElementsById: dict[str, list[Element]] = {}
+
         # This SpannerBundle holds (among other things) the slurs that will be created by
         # _ppSlurs() and used while importing whatever note, rest, chord, or other object.
         self.spannerBundle: spanner.SpannerBundle = spanner.SpannerBundle()
@@ -446,6 +477,42 @@ class MeiReader:
             tuple[m21.base.Music21Object, m21.base.Music21Object, str]
         ] = []
 
+    @staticmethod
+    def _parseDocument(theDocument: str | bytes) -> Element:
+        '''
+        Parses theDocument, returning the root element.  A str is parsed with ElementTree.
+        Bytes are parsed with lxml (if installed), or ElementTree, either of which will
+        determine the encoding from the XML declaration or BOM.  If that fails, we try
+        once more, as latin-1 (sometimes latin-1 characters work their way in without
+        being declared).
+        '''
+        try:
+            if isinstance(theDocument, str):
+                return fromstring(theDocument)
+            if lxmlEtree is not None:
+                # Strip comments and processing instructions, and resolve only the
+                # internal entities, as ElementTree does, so the tree looks the same
+                # no matter which parser built it.
+                parser = lxmlEtree.XMLParser(
+                    remove_comments=True,
+                    remove_pis=True,
+                    resolve_entities='internal',
+                    huge_tree=True
+                )
+                try:
+                    return lxmlEtree.fromstring(theDocument, parser)
+                except lxmlEtree.XMLSyntaxError:
+                    return fromstring(theDocument.decode('latin-1'))
+            try:
+                return fromstring(theDocument)
+            except ParseError:
+                return fromstring(theDocument.decode('latin-1'))
+        except ParseError as parseErr:
+            environLocal.warn(
+                '\n\nERROR: Parsing the MEI document with ElementTree failed.')
+            environLocal.warn(f'We got the following error:\n{parseErr}')
+            raise MeiValidityError(_INVALID_XML_DOC)
+
     def run(self) -> stream.Score | stream.Part | stream.Opus:
         '''
         Run conversion of the internal MEI document to produce a music21 object.
@@ -455,6 +522,9 @@ class MeiReader:
 
         environLocal.printDebug('*** pre-processing elements with startid/endid/plist/etc')
 
+        # one pass over the score to find all the elements the preprocessors need
+        self._ppGatherElements()
+
         self._ppSlurs()
         self._ppTies()
         self._ppBeams()
@@ -474,6 +544,11 @@ class MeiReader:
 
         self._ppConclude()
 
+        # the preprocessors are done with these, and they hold references to elements
+        # throughout the document (which matters if releaseMeasureElements is set).
+        self._ppElementsByTag = None
+        self._ppElementsById = {}
+
         # This is a lie; we only process the first <score> element we see.
         environLocal.printDebug('*** processing <score> elements')
 
@@ -534,7 +609,7 @@ class MeiReader:
 
         # we only look at the staffDefs inside the first scoreDef in the score
         firstScoreDef: Element | None = scoreElem.find(f'.//{MEI_NS}scoreDef')
-        if not firstScoreDef:
+        if firstScoreDef is None:
             raise MeiValidityError('No scoreDef found.')
 
         for staffDef in firstScoreDef.findall(f'.//{MEI_NS}staffDef'):
@@ -874,6 +949,51 @@ class MeiReader:
 
     # "Preprocessing" Functions
     # -----------------------------------------------------------------------------
+    # tags of the elements that the preprocessors (_ppSlurs et al) need to see
+    _PP_ELEMENT_TAGS: tuple[str, ...] = (
+        'slur', 'tie', 'beamSpan', 'tupletSpan', 'hairpin', 'fermata', 'trill',
+        'mordent', 'turn', 'octave', 'arpeg', 'pedal', 'dir', 'dynam', 'tempo'
+    )
+
+    def _ppGatherElements(self) -> None:
+        '''
+        Pre-processing helper that makes a single pass over the <score> element(s) in the
+        document, gathering up (in document order) all the elements that the various
+        preprocessors need, keyed by tag, and building an @xml:id -> elements index of
+        everything in the <score>(s).
+        '''
+        environLocal.printDebug('*** gathering elements for pre-processing')
+
+        byTag: dict[str, list[Element]] = {
+            f'{MEI_NS}{tag}': [] for tag in self._PP_ELEMENT_TAGS
+        }
+        byId: dict[str, list[Element]] = {}
+        seenScores: set[int] = set()
+        for scoreElem in self.documentRoot.iterfind(f'.//{MEI_NS}music//{MEI_NS}score'):
+            if id(scoreElem) in seenScores:
+                continue
+            seenScores.add(id(scoreElem))
+            for eachElem in scoreElem.iter():
+                xmlId: str | None = eachElem.get(_XMLID)
+                if xmlId:
+                    byId.setdefault(xmlId, []).append(eachElem)
+                elems: list[Element] | None = byTag.get(eachElem.tag)  # type: ignore
+                if elems is not None:
+                    elems.append(eachElem)
+
+        self._ppElementsByTag = {
+            tag[len(MEI_NS):]: elems for tag, elems in byTag.items()
+        }
+        self._ppElementsById = byId
+
+    def _ppElementsWithTag(self, tag: str) -> list[Element]:
+        # tag has no namespace, e.g. 'slur'
+        if self._ppElementsByTag is None:
+            self._ppGatherElements()
+        if t.TYPE_CHECKING:
+            assert self._ppElementsByTag is not None
+        return self._ppElementsByTag[tag]
+
     def _ppSlurs(self) -> None:
         # noinspection PyShadowingNames
         '''
@@ -941,9 +1061,7 @@ class MeiReader:
         '''
         environLocal.printDebug('*** pre-processing slurs')
         # pre-processing for <slur> tags
-        for eachSlur in self.documentRoot.iterfind(
-                f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}slur'
-        ):
+        for eachSlur in self._ppElementsWithTag('slur'):
             startId: str = MeiShared.removeOctothorpe(eachSlur.get('startid', ''))
             endId: str = MeiShared.removeOctothorpe(eachSlur.get('endid', ''))
             staffAttr: str = eachSlur.get('staff', '')
@@ -1002,8 +1120,7 @@ class MeiReader:
         '''
         environLocal.printDebug('*** pre-processing ties')
 
-        for eachTie in self.documentRoot.iterfind(
-                f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}tie'):
+        for eachTie in self._ppElementsWithTag('tie'):
             startId: str = MeiShared.removeOctothorpe(eachTie.get('startid', ''))
             endId: str = MeiShared.removeOctothorpe(eachTie.get('endid', ''))
             if startId and endId:
@@ -1051,8 +1168,7 @@ class MeiReader:
         environLocal.printDebug('*** pre-processing beams')
 
         # pre-processing for <beamSpan> elements
-        for eachBeam in self.documentRoot.iterfind(
-                f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}beamSpan'):
+        for eachBeam in self._ppElementsWithTag('beamSpan'):
             if eachBeam.get('startid', '') or eachBeam.get('endid', ''):
                 environLocal.warn(
                     _UNIMPLEMENTED_IMPORT_WITHOUT.format('<beamSpan>', '@startid and @endid')
@@ -1105,8 +1221,7 @@ class MeiReader:
         tempStr: str
 
         # pre-processing <tupletSpan> tags
-        for eachTuplet in self.documentRoot.iterfind(
-                f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}tupletSpan'):
+        for eachTuplet in self._ppElementsWithTag('tupletSpan'):
             if ((eachTuplet.get('startid') is None or eachTuplet.get('endid') is None)
                     and eachTuplet.get('plist') is None):
                 environLocal.warn(_UNIMPLEMENTED_IMPORT_WITHOUT.format('<tupletSpan>',
@@ -1205,8 +1320,7 @@ class MeiReader:
         # @tstamp2.
         environLocal.printDebug('*** pre-processing hairpins')
 
-        for eachElem in self.documentRoot.iterfind(
-                f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}hairpin'):
+        for eachElem in self._ppElementsWithTag('hairpin'):
             startId: str = MeiShared.removeOctothorpe(eachElem.get('startid', ''))  # type: ignore
             endId: str = MeiShared.removeOctothorpe(eachElem.get('endid', ''))  # type: ignore
             form: str = eachElem.get('form', '')
@@ -1275,8 +1389,7 @@ class MeiReader:
         '''
         environLocal.printDebug('*** pre-processing fermatas')
 
-        for eachFermata in self.documentRoot.iterfind(
-                f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}fermata'):
+        for eachFermata in self._ppElementsWithTag('fermata'):
             startId: str | None = MeiShared.removeOctothorpe(eachFermata.get('startid', ''))
             if not startId:
                 # leave this alone, we'll handle it later in fermataFromElement
@@ -1319,8 +1432,7 @@ class MeiReader:
         '''
         environLocal.printDebug('*** pre-processing trills')
 
-        for eachTrill in self.documentRoot.iterfind(
-                f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}trill'):
+        for eachTrill in self._ppElementsWithTag('trill'):
             startId: str = MeiShared.removeOctothorpe(eachTrill.get('startid', ''))  # type: ignore
             endId: str = MeiShared.removeOctothorpe(eachTrill.get('endid', ''))  # type: ignore
             tstamp2: str = eachTrill.get('tstamp2', '')
@@ -1404,8 +1516,7 @@ class MeiReader:
         '''
         environLocal.printDebug('*** pre-processing mordents')
 
-        for eachMordent in self.documentRoot.iterfind(
-                f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}mordent'):
+        for eachMordent in self._ppElementsWithTag('mordent'):
             startId: str = MeiShared.removeOctothorpe(eachMordent.get('startid', ''))
             place: str = eachMordent.get('place', 'place_unspecified')
             form: str = eachMordent.get('form', '')
@@ -1456,8 +1567,7 @@ class MeiReader:
         '''
         environLocal.printDebug('*** pre-processing turns')
 
-        for eachTurn in self.documentRoot.iterfind(
-                f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}turn'):
+        for eachTurn in self._ppElementsWithTag('turn'):
             startId: str = MeiShared.removeOctothorpe(eachTurn.get('startid', ''))
             place: str = eachTurn.get('place', 'place_unspecified')
             form: str = eachTurn.get('form', '')
@@ -1516,8 +1626,7 @@ class MeiReader:
         '''
         environLocal.printDebug('*** pre-processing octaves')
 
-        for eachOctave in self.documentRoot.iterfind(
-                f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}octave'):
+        for eachOctave in self._ppElementsWithTag('octave'):
             startId: str = MeiShared.removeOctothorpe(eachOctave.get('startid', ''))
             endId: str = MeiShared.removeOctothorpe(eachOctave.get('endid', ''))
             amount: str = eachOctave.get('dis', '')
@@ -1593,8 +1702,7 @@ class MeiReader:
         '''
         environLocal.printDebug('*** pre-processing arpeggios')
 
-        for eachArpeg in self.documentRoot.iterfind(
-                f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}arpeg'):
+        for eachArpeg in self._ppElementsWithTag('arpeg'):
             plistStr: str | None = eachArpeg.get('plist')
             plist: list[str] = []
             if plistStr:
@@ -1657,9 +1765,7 @@ class MeiReader:
 
         environLocal.printDebug('*** pre-processing pedals')
 
-        pedals: list[Element] = self.documentRoot.findall(
-            f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}pedal'
-        )
+        pedals: list[Element] = self._ppElementsWithTag('pedal')
 
         # pylint: disable=no-member
 
@@ -1817,14 +1923,10 @@ class MeiReader:
     def _ppDirsDynamsTempos(self) -> None:
         environLocal.printDebug('*** pre-processing dirs/dynams/tempos')
 
-        elems: list[Element] = self.documentRoot.findall(
-            f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}dir'
-        )
-        elems += self.documentRoot.findall(
-            f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}dynam'
-        )
-        elems += self.documentRoot.findall(
-            f'.//{MEI_NS}music//{MEI_NS}score//{MEI_NS}tempo'
+        elems: list[Element] = (
+            self._ppElementsWithTag('dir')
+            + self._ppElementsWithTag('dynam')
+            + self._ppElementsWithTag('tempo')
         )
 
         for eachElem in elems:
@@ -1930,14 +2032,26 @@ class MeiReader:
         '''
         environLocal.printDebug('*** concluding pre-processing')
 
+        if self._ppElementsByTag is None:
+            self._ppGatherElements()
+
+        # Find the elements via the @xml:id index built by _ppGatherElements.  Almost
+        # always, every referenced element is in the <score>, and thus in the index.
+        # If not, we fall back to searching the whole document.
+        elementsById: dict[str, list[Element]] = self._ppElementsById
+        if any(xmlId not in elementsById for xmlId in self.m21Attr):
+            elementsById = {}
+            for eachObject in self.documentRoot.iterfind('*//*'):
+                objXmlId: str | None = eachObject.get(_XMLID)
+                # we have a defaultdict, so this "if" isn't strictly necessary; but without it,
+                # every single element with an @xml:id creates a new, empty dict, which would
+                # consume a lot of memory.
+                if objXmlId and objXmlId in self.m21Attr:
+                    elementsById.setdefault(objXmlId, []).append(eachObject)
+
         # conclude pre-processing by adding music21-specific attributes to their respective elements
-        for eachObject in self.documentRoot.iterfind('*//*'):
-            objXmlId: str | None = eachObject.get(_XMLID)
-            # we have a defaultdict, so this "if" isn't strictly necessary; but without it, every
-            # single element with an @xml:id creates a new, empty dict, which would consume a lot
-            # of memory.
-            if objXmlId and objXmlId in self.m21Attr:
-                objAttrs: dict = self.m21Attr[objXmlId]
+        for xmlId, objAttrs in self.m21Attr.items():
+            for eachObject in elementsById.get(xmlId, ()):
                 for eachAttr in objAttrs:
                     oldAttrValue: str = eachObject.get(eachAttr, '')
                     newAttrValue: str = objAttrs[eachAttr]
@@ -2912,6 +3026,94 @@ class MeiReader:
                 if b.type == 'continue':
                     b.type = 'start'
 
+    @staticmethod
+    def metadataFromDocument(theDocument: str | bytes) -> m21.metadata.Metadata:
+        '''
+        Returns the metadata in the <meiHead> of theDocument (a string, or the raw bytes
+        of a MEI file), without parsing any of the <music>: the document is parsed
+        incrementally, and parsing stops right after </meiHead>.
+
+        Unlike makeMetadata, this does not look for vocal text translations (which
+        live in <music>).
+
+        :raises: :exc:`MeiElementError` when the root element is not <mei>
+        :raises: :exc:`MeiValidityError` when the MEI file is not valid XML.
+        '''
+        def chunks(document: str | bytes) -> t.Iterator[str | bytes]:
+            for i in range(0, len(document), _METADATA_CHUNK_SIZE):
+                yield document[i:i + _METADATA_CHUNK_SIZE]
+
+        try:
+            return MeiReader._metadataFromChunks(chunks(theDocument))
+        except ParseError:
+            if isinstance(theDocument, str):
+                raise MeiValidityError(_INVALID_XML_DOC)
+
+        # try once more, as latin-1 (see _parseDocument)
+        try:
+            return MeiReader._metadataFromChunks(chunks(theDocument.decode('latin-1')))
+        except ParseError:
+            raise MeiValidityError(_INVALID_XML_DOC)
+
+    @staticmethod
+    def metadataFromFile(filePath: str | pathlib.Path) -> m21.metadata.Metadata:
+        '''
+        Like metadataFromDocument, but reads the MEI file in chunks, and stops reading
+        right after </meiHead>.
+        '''
+        def chunks() -> t.Iterator[bytes]:
+            with open(filePath, 'rb') as f:
+                while chunk := f.read(_METADATA_CHUNK_SIZE):
+                    yield chunk
+
+        try:
+            return MeiReader._metadataFromChunks(chunks())
+        except ParseError:
+            pass
+
+        # try once more, as latin-1 (see _parseDocument)
+        def latin1Chunks() -> t.Iterator[str]:
+            with open(filePath, encoding='latin-1') as f:
+                while chunk := f.read(_METADATA_CHUNK_SIZE):
+                    yield chunk
+
+        try:
+            return MeiReader._metadataFromChunks(latin1Chunks())
+        except ParseError:
+            raise MeiValidityError(_INVALID_XML_DOC)
+
+    @staticmethod
+    def _metadataFromChunks(chunks: t.Iterable[str | bytes]) -> m21.metadata.Metadata:
+        # Feeds chunks to an incremental parser until </meiHead> (or <music>, if
+        # there is no <meiHead>), then hands the <meiHead> to MeiMetadataReader.
+        parser = XMLPullParser(events=('start', 'end'))
+        sawRoot: bool = False
+        meiHead: Element | None = None
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if not sawRoot:
+                    sawRoot = True
+                    if elem.tag != f'{MEI_NS}mei':
+                        raise MeiElementError(_WRONG_ROOT_ELEMENT.format(elem.tag))
+                if event == 'end' and elem.tag == f'{MEI_NS}meiHead':
+                    meiHead = elem
+                    break
+                if event == 'start' and elem.tag == f'{MEI_NS}music':
+                    break
+            else:
+                continue
+            break
+        else:
+            parser.close()
+
+        if meiHead is None:
+            return m21.metadata.Metadata()
+
+        meiMetadataReader = MeiMetadataReader(meiHead)
+        meiMetadataReader.processMetadata()
+        return meiMetadataReader.m21Metadata
+
     def makeMetadata(self) -> m21.metadata.Metadata:
         '''
         Produce metadata objects for all the metadata stored in the MEI header.
@@ -9002,6 +9204,9 @@ class MeiReader:
                 measureResult = self.measureFromElement(
                     eachElem, allPartNs
                 )
+                if self.releaseMeasureElements:
+                    # we're done with this <measure>; free its subtree.
+                    eachElem.clear()
 
                 # process and append each part's stuff to the staff
                 for eachN in allPartNs:
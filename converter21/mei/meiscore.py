@@ -10,6 +10,7 @@
 # ------------------------------------------------------------------------------
 import sys
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from xml.etree.ElementTree import Element  # , TreeBuilder
 
 import music21 as m21
@@ -26,6 +27,7 @@ from converter21.shared import M21TemporarySpanner
 from converter21.shared import M21BeamSpanner
 from converter21.shared import M21TupletSpanner
 from converter21.shared import M21TieSpanner
+from converter21.shared import M21SpannerIndex
 from converter21.shared import M21Utilities
 from converter21.shared import M21StaffGroupTree
 from converter21.shared import DebugTreeBuilder as TreeBuilder  # put this back before shipping
@@ -42,7 +44,12 @@ funcName = lambda n=0: sys._getframe(n + 1).f_code.co_name + ':'  # pragma no co
 # pylint: enable=protected-access
 
 class MeiScore:
-    def __init__(self, m21Score: m21.stream.Score, meiVersion: str) -> None:
+    def __init__(
+        self,
+        m21Score: m21.stream.Score,
+        meiVersion: str,
+        parallelStaves: bool = False
+    ) -> None:
         def getUniqueVoiceIds(part: m21.stream.Part) -> list[int | str]:
             output: list[int | str] = ['']  # fake id for Measure
             for meas in part[m21.stream.Measure]:
@@ -53,6 +60,8 @@ class MeiScore:
 
         self.m21Score: m21.stream.Score = m21Score
         self.meiVersion: str = meiVersion
+        # if parallelStaves, each MeiMeasure makes its staves on separate threads
+        self.parallelStaves: bool = parallelStaves
 
         self.customM21AttrsToDelete: dict[m21.base.Music21Object, list[str]] = {}
 
@@ -83,7 +92,9 @@ class MeiScore:
 
         # annotateScore put a bunch of stuff in the spannerBundle, so we can't
         # copy it until now.  Which is just in time, since makeXmlIds/assureAllXmlIds needs it.
-        self.spannerBundle = self.m21Score.spannerBundle
+        # We make it an M21SpannerIndex, so the many "is this spanner in the bundle?"
+        # checks during export are O(1).
+        self.spannerBundle = M21SpannerIndex(self.m21Score.spannerBundle)
 
         # once annotated, check to see if any of these objects need xml:id.
         # self.makeXmlIds()
@@ -113,7 +124,7 @@ class MeiScore:
             )
         )
 
-        self.measures: list[MeiMeasure] = self._getMeiMeasures()
+        # The MeiMeasures are not made here; emitRootElement makes them one at a time.
         self.metadata: MeiMetadata = MeiMetadata(m21Score.metadata)
 
     def _getStaffNumbersForM21Parts(self) -> dict[m21.stream.Part, int]:
@@ -126,33 +137,41 @@ class MeiScore:
             output[part] = staffIdx + 1  # staff numbers are 1-based
         return output
 
-    def _getMeiMeasures(self) -> list[MeiMeasure]:
-        output: list[MeiMeasure] = []
-
-        measureStacks: list[list[m21.stream.Measure]] = []
+    def _iterMeiMeasures(self) -> t.Iterator[MeiMeasure]:
+        # Creates the MeiMeasures one at a time, as they are needed, so that a caller
+        # that emits each one as it is yielded doesn't have to hold all of them at once.
+        # Each MeiMeasure is yielded only after the next one has been created, since it
+        # needs to see the next one's left barline.
         parts: list[m21.stream.Part] = list(self.m21Score.parts)
         partMeasures: list[list[m21.stream.Measure]] = []
         for part in parts:
             partMeasures.append(list(part.getElementsByClass(m21.stream.Measure)))
 
-        # invert partMeasures into measureStacks
-        measureStacks = [list(measureStack) for measureStack in zip(*partMeasures)]
-
-        meiMeas: MeiMeasure | None = None
-        for measureStack in measureStacks:
-            prevMeiMeasure: MeiMeasure | None = meiMeas
-            meiMeas = MeiMeasure(
-                measureStack,
+        # zip(*partMeasures) inverts partMeasures into measure stacks
+        prevMeiMeasure: MeiMeasure | None = None
+        for measureStack in zip(*partMeasures):
+            meiMeas: MeiMeasure = MeiMeasure(
+                list(measureStack),
                 prevMeiMeasure,
                 self,
                 self.customM21AttrsToDelete,
                 self.spannerBundle)
-            output.append(meiMeas)
+            if prevMeiMeasure is not None:
+                yield prevMeiMeasure
+            prevMeiMeasure = meiMeas
 
-        return output
+        if prevMeiMeasure is not None:
+            yield prevMeiMeasure
 
     def makeRootElement(self) -> Element:
         tb: TreeBuilder = TreeBuilder(insert_comments=True, insert_pis=True)
+        self.emitRootElement(tb)
+        root: Element = tb.close()
+        return root
+
+    def emitRootElement(self, tb: TreeBuilder) -> None:
+        # Emits the whole document to tb.  If tb is an XmlStreamWriter, each <measure>
+        # is written (and released) as soon as it has been made.
         if self.meiVersion.startswith('4'):
             tb.start('mei', {
                 'xmlns': 'http://www.music-encoding.org/ns/mei',
@@ -178,8 +197,18 @@ class MeiScore:
         self.makeScoreDefElement(tb)
 
         tb.start('section', {})
-        for meim in self.measures:
-            meim.makeRootElement(tb)
+        executor: ThreadPoolExecutor | None = None
+        if self.parallelStaves:
+            executor = ThreadPoolExecutor()
+        try:
+            for meim in self._iterMeiMeasures():
+                meim.makeRootElement(tb, executor)
+                # meim is done; don't let the next measure keep it (and, transitively,
+                # all the measures before it) alive.
+                meim.prevMeiMeasure = None
+        finally:
+            if executor is not None:
+                executor.shutdown()
         tb.end('section')
 
         tb.end('score')
@@ -217,8 +246,6 @@ class MeiScore:
 
         tb.end('music')
         tb.end('mei')
-        root: Element = tb.close()
-        return root
 
     def makeStaffDefElement(
         self,
@@ -189,7 +189,7 @@ class MeiShared:
     @staticmethod
     def textFromElem(elem: Element | MeiElement, endAt: str = '') -> tuple[str, dict[str, str]]:
         # can take Element by converting directly to MeiElement
-        if isinstance(elem, Element):
+        if not isinstance(elem, MeiElement):
             elem = MeiElement(elem)
 
         styleDict: dict[str, str] = {}
@@ -10,7 +10,6 @@
 # ------------------------------------------------------------------------------
 import sys
 # import typing as t
-from xml.etree.ElementTree import Element, ElementTree, indent
 
 import music21 as m21
 # from music21.common import opFrac
@@ -20,6 +19,7 @@ from converter21.mei import MeiExportError
 from converter21.mei import MeiScore
 
 from converter21.shared import M21Utilities
+from converter21.shared import XmlStreamWriter
 
 # For debug or unit test print, a simple way to get a string which is the current function name
 # with a colon appended.
@@ -48,6 +48,10 @@ class MeiWriter:
         # client can set to '4' or '5' (or anything starting with '4' or '5')
         self.meiVersion: str = '5'
 
+        # client can set to True to make each measure's staves on separate threads.
+        # This is only faster on free-threaded Python; the output is the same.
+        self.parallelStaves: bool = False
+
     def write(self, fp) -> bool:
         if self.makeNotation:
             self._m21Score = M21Utilities.makeScoreFromObject(self._m21Object)
@@ -76,11 +80,9 @@ class MeiWriter:
         # the object structure is MEI-like. For example:
         #   music21 scores are {Staff1(Measure1 .. MeasureN), Staff2(Measure1 .. MeasureN)}
         #   but MEI scores are {Measure1{Staff1, Staff2} .. MeasureN{Staff1, Staff2}}.
-        meiScore: MeiScore = MeiScore(self._m21Score, self.meiVersion)
-
-        # Here we convert the MeiScore to an in-memory tree of Elements
-        meiElement: Element = meiScore.makeRootElement()
-        indent(meiElement, space='   ', level=0)
+        meiScore: MeiScore = MeiScore(
+            self._m21Score, self.meiVersion, parallelStaves=self.parallelStaves
+        )
 
         # Write to the output MEI XML file
         # pylint: disable=line-too-long
@@ -106,7 +108,10 @@ class MeiWriter:
         # pylint: enable=line-too-long
 
         fp.write(prefix)
-        ElementTree(meiElement).write(fp, encoding='unicode')
+
+        # Here we convert the MeiScore to XML, written (and indented) as it is generated,
+        # measure by measure, rather than building an in-memory tree of the whole document.
+        meiScore.emitRootElement(XmlStreamWriter(fp, space='   '))
         fp.write('\n')
 
         # clean up all the notes-to-self MeiScore wrote in the score.
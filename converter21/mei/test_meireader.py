@@ -112,10 +112,102 @@ class Test(unittest.TestCase):
                 theError.args[0]
             )
 
+    def testInit5(self):
+        '''__init__(): bytes are decoded by the XML parser, using the XML declaration or BOM'''
+        inputFile = '''<?xml version="1.0" encoding="UTF-16"?>
+                       <mei xmlns="http://www.music-encoding.org/ns/mei" meiversion="4.0">
+                       <music><score></score></music></mei>'''
+        actual = MeiReader(inputFile.encode('utf-16'))
+        self.assertEqual(f'{MEI_NS}mei', actual.documentRoot.tag)
+        self.assertEqual('4.0', actual.meiVersion)
+
+        # undeclared latin-1 still works
+        inputFile = '''<?xml version="1.0" encoding="UTF-8"?>
+                       <mei xmlns="http://www.music-encoding.org/ns/mei" meiversion="4.0">
+                       <music><score><section><dir>Café</dir></section></score></music></mei>'''
+        actual = MeiReader(inputFile.encode('latin-1'))
+        self.assertEqual('Café', actual.documentRoot.find(f'.//{MEI_NS}dir').text)
+
+        self.assertRaises(meiexceptions.MeiValidityError, MeiReader, b'this is not an XML file')
+
+    def testReleaseMeasureElements(self):
+        '''run(): releaseMeasureElements frees each <measure> once it has been converted'''
+        inputFile = '''<?xml version="1.0" encoding="UTF-8"?>
+                       <mei xmlns="http://www.music-encoding.org/ns/mei" meiversion="4.0">
+                       <music><score>
+                           <scoreDef><staffGrp><staffDef n="1" lines="5"/></staffGrp></scoreDef>
+                           <section><measure n="1">
+                               <staff n="1"><layer n="1">
+                                   <note pname="c" oct="4" dur="1"/>
+                               </layer></staff>
+                           </measure></section>
+                       </score></music></mei>'''
+        kept = MeiReader(inputFile.encode('utf-8'))
+        released = MeiReader(inputFile.encode('utf-8'), releaseMeasureElements=True)
+        keptScore = kept.run()
+        releasedScore = released.run()
+        self.assertEqual(
+            [n.nameWithOctave for n in keptScore.recurse().notes],
+            [n.nameWithOctave for n in releasedScore.recurse().notes]
+        )
+        self.assertEqual(1, len(kept.documentRoot.find(f'.//{MEI_NS}measure')))
+        self.assertEqual(0, len(released.documentRoot.find(f'.//{MEI_NS}measure')))
+
     # -----------------------------------------------------------------------------
     # class TestThings(unittest.TestCase):
     # '''Tests for utility functions.'''
 
+    def testPreprocessSinglePass(self):
+        '''_ppGatherElements() and _ppConclude(): control events are found in one pass,
+        and m21Attr attributes land on the referenced elements'''
+        inputFile = '''<?xml version="1.0" encoding="UTF-8"?>
+                       <mei xmlns="http://www.music-encoding.org/ns/mei" meiversion="4.0">
+                       <music><score><section><measure>
+                           <staff n="1"><layer n="1">
+                               <note xml:id="n1"/><note xml:id="n2"/>
+                           </layer></staff>
+                           <tie startid="#n1" endid="#n2"/>
+                           <slur startid="#n1" endid="#n2"/>
+                       </measure></section></score></music></mei>'''
+        actual = MeiReader(inputFile)
+        actual._ppGatherElements()
+        self.assertEqual(1, len(actual._ppElementsWithTag('tie')))
+        self.assertEqual(1, len(actual._ppElementsWithTag('slur')))
+        self.assertEqual([], actual._ppElementsWithTag('hairpin'))
+        actual._ppTies()
+        actual._ppSlurs()
+        actual._ppConclude()
+        n1 = actual._ppElementsById['n1'][0]
+        n2 = actual._ppElementsById['n2'][0]
+        self.assertEqual('i', n1.get('tie'))
+        self.assertEqual('t', n2.get('tie'))
+        self.assertIsNotNone(n1.get('m21SlurStart'))
+        self.assertIsNotNone(n2.get('m21SlurEnd'))
+
+    def testMetadataFromDocument(self):
+        '''metadataFromDocument() and metadataFromFile(): same as makeMetadata(), and
+        nothing after </meiHead> is parsed'''
+        fp = Path('tests') / 'files' / 'valid' / 'ChopinSpring.mei'
+        expected = MeiReader(fp.read_bytes()).makeMetadata()
+        self.assertEqual(expected.all(), MeiReader.metadataFromFile(fp).all())
+        self.assertEqual(
+            expected.all(), MeiReader.metadataFromDocument(fp.read_text(encoding='utf-8')).all()
+        )
+
+        inputFile = b'''<?xml version="1.0" encoding="UTF-8"?>
+                        <mei xmlns="http://www.music-encoding.org/ns/mei" meiversion="5.0">
+                        <meiHead><fileDesc><titleStmt><title>Header Only</title></titleStmt>
+                        </fileDesc></meiHead>
+                        <music><this is not well-formed XML'''
+        actual = MeiReader.metadataFromDocument(inputFile)
+        self.assertEqual('Header Only', actual.title)
+
+        self.assertRaises(
+            meiexceptions.MeiElementError,
+            MeiReader.metadataFromDocument,
+            '<notMei><meiHead/></notMei>'
+        )
+
     def testSafePitch1(self):
         '''safePitch(): when ``name`` is a valid pitch name'''
         name = 'D#6'
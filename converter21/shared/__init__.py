@@ -18,6 +18,7 @@ from .m21utilities import M21TemporarySpanner
 from .m21utilities import M21BeamSpanner
 from .m21utilities import M21TupletSpanner
 from .m21utilities import M21TieSpanner
+from .m21utilities import M21SpannerIndex
 from .m21utilities import M21Utilities
 from .m21utilities import M21StaffGroupTree
 from .m21utilities import M21StaffGroupDescriptionTree
@@ -27,3 +28,10 @@ from .m21utilities import CannotMakeScoreFromObjectError
 from .m21utilities import NoMusic21VersionError
 
 from .debugutilities import DebugTreeBuilder
+from .xmlstreamwriter import XmlStreamWriter
+from .xmlstreamwriter import TreeBuilderRecorder
+
+from .phasetimings import PhaseTiming
+from .phasetimings import PhaseTimings
+
+from .parsecache import ParseCache
@@ -19,6 +19,8 @@ import typing as t
 from fractions import Fraction
 from copy import copy, deepcopy
 
+import copyreg
+import io
 import pickle
 import zlib
 
@@ -187,6 +189,45 @@ class M21TieSpanner(M21TemporarySpanner):
         self.startParentChord: m21.chord.Chord | None = startParentChord
 
 
+class M21SpannerIndex(m21.spanner.SpannerBundle):
+    '''
+    A frozen SpannerBundle, with indexes keyed by id() that make identity membership
+    checks (M21Utilities.isIn), and lookups by first or last spanned element, O(1).
+    getByClass is inherited (SpannerBundle caches it).  Make one from the score's
+    spannerBundle once, at the start of an export; it does not see spanners that are
+    added to (or removed from) the score later.
+    '''
+    def __init__(self, spanners: t.Iterable[m21.spanner.Spanner]) -> None:
+        super().__init__(list(spanners))
+        self._spannerIds: frozenset[int] = frozenset(id(sp) for sp in self._storage)
+        self._spannersByFirstElement: dict[int, list[m21.spanner.Spanner]] = {}
+        self._spannersByLastElement: dict[int, list[m21.spanner.Spanner]] = {}
+        for sp in self._storage:
+            first: m21.base.Music21Object | None = sp.getFirst()
+            if first is None:
+                continue
+            self._spannersByFirstElement.setdefault(id(first), []).append(sp)
+            last: m21.base.Music21Object | None = sp.getLast()
+            if last is not None:
+                self._spannersByLastElement.setdefault(id(last), []).append(sp)
+
+    def __contains__(self, obj: object) -> bool:
+        # identity, not equality
+        return id(obj) in self._spannerIds
+
+    def getByFirstElement(self, obj: m21.base.Music21Object) -> list[m21.spanner.Spanner]:
+        return self._spannersByFirstElement.get(id(obj), [])
+
+    def getByLastElement(self, obj: m21.base.Music21Object) -> list[m21.spanner.Spanner]:
+        return self._spannersByLastElement.get(id(obj), [])
+
+    def append(self, other: m21.spanner.Spanner):
+        raise Converter21InternalError('M21SpannerIndex is frozen; cannot append')
+
+    def remove(self, item: m21.spanner.Spanner):
+        raise Converter21InternalError('M21SpannerIndex is frozen; cannot remove')
+
+
 # This FreezeThaw stuff comes from music21, and then I modified it to do everything
 # without writing to a file.
 class StreamFreezeThawBase:
@@ -194,19 +235,81 @@ class StreamFreezeThawBase:
         self.stream = None
 
 
+def _setLiveFrozenState(obj: m21.base.Music21Object, state: dict[str, t.Any]) -> None:
+    # Unpickling counterpart of _LiveStreamPickler.reducer_override: put back the
+    # (empty) attributes that were left out of the pickled state.  The stream's
+    # elements are restored later, by StreamThawer, from _storedElementOffsetTuples.
+    state['sites'] = m21.sites.Sites()
+    state['_cache'] = {}
+    if '_storedElementOffsetTuples' in state:
+        state['_elements'] = []
+        state['_endElements'] = []
+        state['_offsetDict'] = {}
+    object.__setattr__(obj, '__dict__', state)
+
+
+class _LiveStreamPickler(pickle.Pickler):
+    '''
+    Pickles a stream hierarchy straight from the live objects, without copying or
+    altering them.  Each Music21Object is pickled from a copy of its __dict__ that
+    leaves out sites, activeSite, derivation and cache, and each Stream's elements
+    are pickled as _storedElementOffsetTuples (the same form that
+    StreamFreezer.setupSerializationScaffold produces), so StreamThawer can thaw
+    the result as usual.
+    '''
+    def reducer_override(self, obj):
+        if not isinstance(obj, m21.base.Music21Object):
+            return NotImplemented
+
+        state: dict[str, t.Any] = obj.__dict__.copy()
+        state.pop('sites', None)
+        state.pop('_cache', None)
+        state['_activeSite'] = None
+        state['_activeSiteStoredOffset'] = None
+        state['_derivation'] = None
+        if isinstance(obj, m21.stream.Stream):
+            storedElementOffsetTuples: list[tuple[m21.base.Music21Object, t.Any]] = [
+                (e, obj.elementOffset(e)) for e in obj._elements
+            ]
+            storedElementOffsetTuples.extend((e, 'end') for e in obj._endElements)
+            state['_storedElementOffsetTuples'] = storedElementOffsetTuples
+            del state['_elements']
+            del state['_endElements']
+            del state['_offsetDict']
+
+        return (copyreg.__newobj__, (type(obj),), state, None, None, _setLiveFrozenState)
+
+
 # -----------------------------------------------------------------------------
 class StreamFreezer(StreamFreezeThawBase):
-    def __init__(self, streamObj=None, fastButUnsafe=False, topLevel=True, streamIds=None):
+    '''
+    Freezes a Stream (to a pickle or jsonpickle).  If fromLiveStream is True, the
+    stream is pickled directly from the live objects, without deep-copying it (or
+    altering it); this is much faster and uses much less memory than the default,
+    but only supports the 'pickle' format.
+    '''
+    def __init__(
+        self,
+        streamObj=None,
+        fastButUnsafe=False,
+        topLevel=True,
+        streamIds=None,
+        fromLiveStream=False
+    ):
         super().__init__()
         # must make a deepcopy, as we will be altering .sites
         self.stream = None
         # clear all sites only if the top level.
         self.topLevel = topLevel
         self.streamIds = streamIds
+        self.fromLiveStream = fromLiveStream
 
         self.subStreamFreezers = {}  # this will keep track of sub freezers for spanners
 
-        if streamObj is not None and fastButUnsafe is False:
+        if streamObj is not None and fromLiveStream:
+            # nothing will be altered, so no deepcopy needed
+            self.stream = streamObj
+        elif streamObj is not None and fastButUnsafe is False:
             # deepcopy necessary because we mangle sites in the objects
             # before serialization
             self.stream = deepcopy(streamObj)
@@ -460,6 +563,22 @@ class StreamFreezer(StreamFreezeThawBase):
 
         fmt = self.parseWriteFmt(fmt)
 
+        if self.fromLiveStream:
+            if fmt != 'pickle':
+                raise FreezeThawError('fromLiveStream only supports the pickle format')
+            try:
+                f = io.BytesIO()
+                _LiveStreamPickler(f).dump(
+                    {'stream': self.stream, 'm21Version': m21.base.VERSION}
+                )
+                output = f.getvalue()
+                if zipType == 'zlib':
+                    output = zlib.compress(output)
+            except Exception as e:
+                print(f'StreamFreezer: failed {e}')
+                output = b''
+            return output
+
         storage = self.packStream(self.stream)
 
         if fmt == 'pickle':
@@ -1022,7 +1141,9 @@ class M21Utilities:
     ) -> bool:
         # same as doing 'obj in iterable', except it uses "is" instead of "==",
         # because that's what we want, and it's a lot cheaper than "==" for
-        # Music21Objects.
+        # Music21Objects.  An M21SpannerIndex can answer in O(1).
+        if isinstance(iterable, M21SpannerIndex):
+            return obj in iterable
         for it in iterable:
             if it is obj:
                 return True
@@ -1034,6 +1155,16 @@ class M21Utilities:
             spannerBundle: m21.spanner.SpannerBundle
     ) -> list[m21.dynamics.DynamicWedge]:
         output: list[m21.dynamics.DynamicWedge] = []
+        if isinstance(spannerBundle, M21SpannerIndex):
+            for spanner in spannerBundle.getByFirstElement(gnote):
+                if isinstance(spanner, m21.dynamics.DynamicWedge):
+                    output.append(spanner)
+            for spanner in spannerBundle.getByLastElement(gnote):
+                if isinstance(spanner, m21.dynamics.DynamicWedge):
+                    if not M21Utilities.isIn(spanner, output):
+                        output.append(spanner)
+            return output
+
         spanners: list[m21.spanner.Spanner] = gnote.getSpannerSites('DynamicWedge')
         for spanner in spanners:
             if not M21Utilities.isIn(spanner, spannerBundle):
@@ -1051,6 +1182,12 @@ class M21Utilities:
             spannerBundle: m21.spanner.SpannerBundle
     ) -> list[m21.dynamics.DynamicWedge]:
         output: list[m21.dynamics.DynamicWedge] = []
+        if isinstance(spannerBundle, M21SpannerIndex):
+            for spanner in spannerBundle.getByFirstElement(gnote):
+                if isinstance(spanner, m21.dynamics.DynamicWedge):
+                    output.append(spanner)
+            return output
+
         spanners: list[m21.spanner.Spanner] = gnote.getSpannerSites('DynamicWedge')
         for spanner in spanners:
             if not M21Utilities.isIn(spanner, spannerBundle):
@@ -1078,6 +1215,80 @@ class M21Utilities:
 
         return True
 
+    @staticmethod
+    def transposeInstrumentRangesToWrittenPitch(
+        s: m21.stream.Stream,
+        preserveAccidentalDisplay: bool = True
+    ) -> None:
+        '''
+        Transposes (in place) the notes, chords and key signatures in the range of each
+        of s's transposing instruments to written pitch, just like s.toWrittenPitch would.
+        But this is done in one walk of s, without flattening s (once per instrument),
+        and it does nothing else: ottavas are not touched, and s (and its substreams)
+        are not marked as being at written pitch.
+        '''
+        instIter = s.recurse().getElementsByClass(m21.instrument.Instrument)
+        instsWithOffsets: list[tuple[OffsetQL, m21.instrument.Instrument]] = [
+            (instIter.currentHierarchyOffset(), inst) for inst in instIter
+        ]
+        if not instsWithOffsets:
+            return
+        instsWithOffsets.sort(key=lambda io: io[0])
+
+        # each instrument's range ends where the next one starts (or at the end of s)
+        ranges: list[tuple[OffsetQL, OffsetQL, m21.interval.Interval]] = []
+        for i, (start, inst) in enumerate(instsWithOffsets):
+            if inst.transposition is None:
+                continue
+            end: OffsetQL
+            if i + 1 < len(instsWithOffsets):
+                end = instsWithOffsets[i + 1][0]
+            else:
+                end = max(start, s.highestTime)
+            ranges.append((start, end, inst.transposition.reverse()))
+        if not ranges:
+            return
+
+        displayStatusesAreSet: bool = False
+        if preserveAccidentalDisplay:
+            displayStatusesAreSet = bool(s.haveAccidentalsBeenMade())
+
+        elIter = s.recurse().getElementsByClass(
+            (m21.note.Note, m21.chord.Chord, m21.key.KeySignature)
+        )
+        for el in elIter:
+            offset: OffsetQL = elIter.currentHierarchyOffset()
+            for start, end, trans in ranges:
+                if start <= offset < end or offset == start == end:
+                    if displayStatusesAreSet:
+                        M21Utilities._transposePreservingAccidentalDisplay(el, trans)
+                    else:
+                        el.transpose(trans, inPlace=True)
+
+    @staticmethod
+    def _transposePreservingAccidentalDisplay(
+        el: m21.note.Note | m21.chord.Chord | m21.key.KeySignature,
+        trans: m21.interval.Interval
+    ) -> None:
+        # same as m21.stream.makeNotation.saveAccidentalDisplayStatus, for one element
+        pitches: t.Iterable[m21.pitch.Pitch] = getattr(el, 'pitches', ())
+        displayStatuses: dict[int, bool | None] = {}
+        for p in pitches:
+            if p.accidental is not None:
+                displayStatuses[id(p)] = p.accidental.displayStatus
+            else:
+                displayStatuses[id(p)] = False
+
+        el.transpose(trans, inPlace=True)
+
+        for p in getattr(el, 'pitches', ()):
+            if p.accidental is not None:
+                p.accidental.displayStatus = displayStatuses.get(id(p), None)
+                continue
+            if displayStatuses.get(id(p), False) is True:
+                p.accidental = m21.pitch.Accidental(0)
+                p.accidental.displayStatus = True
+
     @staticmethod
     def isMultiStaffInstrument(inst: m21.instrument.Instrument | None) -> bool:
         if inst is None:
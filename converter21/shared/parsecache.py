@@ -0,0 +1,179 @@
+# ------------------------------------------------------------------------------
+# Name:          parsecache.py
+# Purpose:       ParseCache, a content-addressed (and size-bounded) on-disk cache
+#                of parsed scores.
+#
+# Authors:       Greg Chapman <gregc@mac.com>
+#
+# Copyright:     (c) 2023 Greg Chapman
+# License:       MIT, see LICENSE
+# ------------------------------------------------------------------------------
+import hashlib
+import os
+import tempfile
+import time
+import typing as t
+from pathlib import Path
+
+import music21 as m21
+
+from converter21.shared.m21utilities import StreamFreezer
+from converter21.shared.m21utilities import StreamThawer
+
+# Bump this if the cache entry format (or anything else that makes old entries
+# unusable) changes.
+PARSE_CACHE_FORMAT: int = 1
+
+DEFAULT_PARSE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
+_ENTRY_SUFFIX: str = '.p.zlib'
+
+
+def _converter21Version() -> str:
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            return version('converter21')
+        except PackageNotFoundError:
+            return 'unknown'
+    except ImportError:
+        return 'unknown'
+
+
+class ParseCache:
+    '''
+    An on-disk cache of parsed scores, keyed by the content of the input (not by
+    its file name or location), plus the input format, any parse options that
+    change the parse result, and the converter21 and music21 versions.  So
+    re-ingesting an unchanged input is a cache hit, wherever it now lives.
+
+    Scores are stored with StreamFreezer (fromLiveStream, so no copy of the score
+    is made) as zlib-compressed pickles.  Those entries are somewhat bigger than
+    StreamFreezer's default (copying) ones, but are much faster to write, and just as
+    fast to read (see the freeze/thaw stages of tests/benchmark.py).  Whenever the
+    total size of the entries in the cache directory grows beyond maxBytes, the
+    least recently used entries are removed.
+
+    If directory is None, a 'converter21-parse-cache' directory in the system's
+    temporary directory is used.
+    '''
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        maxBytes: int = DEFAULT_PARSE_CACHE_MAX_BYTES
+    ) -> None:
+        if directory is None:
+            directory = Path(tempfile.gettempdir()) / 'converter21-parse-cache'
+        self.directory: Path = Path(directory)
+        self.maxBytes: int = maxBytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # last access time we stamped on an entry (in ns), so our stamps always increase
+        self._lastUsedNs: int = 0
+
+    @staticmethod
+    def makeKey(data: bytes | str, fmt: str, **options: t.Any) -> str:
+        '''
+        Returns the cache key (a hex digest) for parsing data (the contents of the
+        input file) as format fmt, with the given parse options.
+        '''
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        h = hashlib.sha256()
+        h.update(
+            f'{PARSE_CACHE_FORMAT}\0{_converter21Version()}\0'
+            f'{m21.base.VERSION_STR}\0{fmt}\0'.encode('utf-8')
+        )
+        for name in sorted(options):
+            h.update(f'{name}={options[name]!r}\0'.encode('utf-8'))
+        h.update(data)
+        return h.hexdigest()
+
+    def _entryPath(self, key: str) -> Path:
+        return self.directory / (key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> m21.stream.Stream | None:
+        '''
+        Returns the cached score for key, or None if there isn't one.
+        '''
+        path: Path = self._entryPath(key)
+        try:
+            fileData: bytes = path.read_bytes()
+        except OSError:
+            return None
+
+        thawer = StreamThawer()
+        thawer.open(fileData, zipType='zlib')
+        if thawer.stream is None:
+            # unreadable entry (StreamThawer has already complained); drop it
+            path.unlink(missing_ok=True)
+            return None
+
+        self._markUsed(path)
+        return thawer.stream
+
+    def _markUsed(self, path: Path) -> None:
+        # Stamps path with an explicit access (and modification) time later than any
+        # we have stamped before, since two uses can get the same time.time_ns().
+        self._lastUsedNs = max(time.time_ns(), self._lastUsedNs + 1)
+        try:
+            os.utime(path, ns=(self._lastUsedNs, self._lastUsedNs))
+        except OSError:
+            pass
+
+    def put(self, key: str, score: m21.stream.Stream) -> None:
+        '''
+        Caches score (which is not modified) as the parse result for key, and then
+        evicts least recently used entries if the cache is now too big.
+        '''
+        fileData = StreamFreezer(score, fromLiveStream=True).write(
+            fmt='pickle', zipType='zlib'
+        )
+        if not fileData:
+            # StreamFreezer couldn't freeze it (and has already complained)
+            return
+        if t.TYPE_CHECKING:
+            assert isinstance(fileData, bytes)
+
+        # write to a temporary file and rename it into place, so a reader (perhaps
+        # in another process) never sees a partially written entry.
+        fd, tempName = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(fileData)
+            os.replace(tempName, self._entryPath(key))
+        except OSError:
+            Path(tempName).unlink(missing_ok=True)
+            return
+
+        self._markUsed(self._entryPath(key))
+        self.evict()
+
+    def evict(self) -> None:
+        '''
+        Removes least recently used entries until the cache is no bigger than maxBytes.
+        '''
+        entries: list[tuple[int, int, Path]] = []
+        totalBytes: int = 0
+        for path in self.directory.glob('*' + _ENTRY_SUFFIX):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+            totalBytes += st.st_size
+
+        if totalBytes <= self.maxBytes:
+            return
+
+        # oldest first (by path if the filesystem's timestamps are too coarse to tell)
+        entries.sort(key=lambda entry: (entry[0], str(entry[2])))
+        for _mtimeNs, size, path in entries:
+            if totalBytes <= self.maxBytes:
+                break
+            path.unlink(missing_ok=True)
+            totalBytes -= size
+
+    def clear(self) -> None:
+        for path in self.directory.glob('*' + _ENTRY_SUFFIX):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,89 @@
+# ------------------------------------------------------------------------------
+# Name:          phasetimings.py
+# Purpose:       PhaseTimings, a simple collector of wall time (and object counts)
+#                for the phases of a conversion.
+#
+# Authors:       Greg Chapman <gregc@mac.com>
+#
+# Copyright:     (c) 2023 Greg Chapman
+# License:       MIT, see LICENSE
+# ------------------------------------------------------------------------------
+import typing as t
+import time
+from contextlib import contextmanager
+
+class PhaseTiming:
+    '''
+    The wall time (in seconds) spent in one named phase, plus any object counts
+    (e.g. number of measures converted) that the phase chose to record.
+    '''
+    __slots__ = ('name', 'seconds', 'counts')
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.seconds: float = 0.
+        self.counts: dict[str, int] = {}
+
+    def count(self, what: str, num: int) -> None:
+        self.counts[what] = self.counts.get(what, 0) + num
+
+    def __repr__(self) -> str:
+        return f'<PhaseTiming {self.name}: {self.seconds:.4f}s {self.counts}>'
+
+    def __getstate__(self) -> tuple[str, float, dict[str, int]]:
+        return (self.name, self.seconds, self.counts)
+
+    def __setstate__(self, state: tuple[str, float, dict[str, int]]) -> None:
+        self.name, self.seconds, self.counts = state
+
+
+class PhaseTimings:
+    '''
+    Collects a PhaseTiming for each phase run inside a "with timings.phase(name)" block.
+    If callback is specified, it is called with each PhaseTiming as that phase ends.
+
+    >>> timings = PhaseTimings()
+    >>> with timings.phase('parse') as ph:
+    ...     ph.count('lines', 10)
+    >>> [p.name for p in timings.phases]
+    ['parse']
+    '''
+    def __init__(
+        self,
+        callback: t.Callable[[PhaseTiming], None] | None = None
+    ) -> None:
+        self.phases: list[PhaseTiming] = []
+        self.callback: t.Callable[[PhaseTiming], None] | None = callback
+
+    @contextmanager
+    def phase(self, name: str) -> t.Iterator[PhaseTiming]:
+        timing = PhaseTiming(name)
+        startTime: float = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.seconds = time.perf_counter() - startTime
+            self.phases.append(timing)
+            if self.callback is not None:
+                self.callback(timing)
+
+    @property
+    def totalSeconds(self) -> float:
+        return sum(p.seconds for p in self.phases)
+
+    @staticmethod
+    def formatPhases(phases: list[PhaseTiming]) -> str:
+        # One line per phase, plus a total.  Suitable for printing to stderr.
+        if not phases:
+            return ''
+        nameWidth: int = max(len(p.name) for p in phases)
+        nameWidth = max(nameWidth, len('total'))
+        lines: list[str] = []
+        for p in phases:
+            line: str = f'{p.name:<{nameWidth}}  {p.seconds:9.4f}s'
+            if p.counts:
+                line += '  ' + ', '.join(f'{k}: {v}' for k, v in p.counts.items())
+            lines.append(line)
+        total: float = sum(p.seconds for p in phases)
+        lines.append(f'{"total":<{nameWidth}}  {total:9.4f}s')
+        return '\n'.join(lines)
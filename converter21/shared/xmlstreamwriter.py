@@ -0,0 +1,189 @@
+# ------------------------------------------------------------------------------
+# Name:          xmlstreamwriter.py
+# Purpose:       XmlStreamWriter, a TreeBuilder lookalike that writes indented
+#                XML text as it goes, instead of building an Element tree.
+#
+# Authors:       Greg Chapman <gregc@mac.com>
+#
+# Copyright:     (c) 2023 Greg Chapman
+# License:       MIT, see LICENSE
+# ------------------------------------------------------------------------------
+import typing as t
+from xml.etree.ElementTree import Element
+
+# We use ElementTree's own escaping routines, so that our output is exactly what
+# ElementTree.write would produce.
+from xml.etree.ElementTree import _escape_attrib, _escape_cdata  # type: ignore
+
+from converter21.shared.debugutilities import DebugTreeBuilder, DebugError
+
+class _OpenElement:
+    __slots__ = ('tag', 'level', 'text', 'hasChildren', 'lastChildTail')
+
+    def __init__(self, tag: str, level: int) -> None:
+        self.tag: str = tag
+        self.level: int = level
+        self.text: str = ''
+        self.hasChildren: bool = False
+        self.lastChildTail: str = ''
+
+
+class XmlStreamWriter(DebugTreeBuilder):
+    '''
+    Takes the same start/data/end/close calls as a TreeBuilder, but instead of building
+    an Element tree, it writes the XML to fp as it goes, so only the currently open
+    elements are held in memory.  The output is exactly what you would get by building
+    the tree, calling xml.etree.ElementTree.indent(root, space=space) on it, and then
+    calling ElementTree(root).write(fp, encoding='unicode').
+
+    >>> import io
+    >>> fp = io.StringIO()
+    >>> tb = XmlStreamWriter(fp, space='   ')
+    >>> tb.start('a', {'n': '1'})
+    >>> tb.start('b', {})
+    >>> tb.data('x & y')
+    >>> tb.end('b')
+    >>> tb.start('c', {})
+    >>> tb.end('c')
+    >>> tb.end('a')
+    >>> tb.close().tag
+    'a'
+    >>> print(fp.getvalue())
+    <a n="1">
+       <b>x &amp; y</b>
+       <c />
+    </a>
+    '''
+    def __init__(  # pylint: disable=super-init-not-called
+        self,
+        fp: t.TextIO,
+        space: str = '  '
+    ) -> None:
+        # we deliberately don't call DebugTreeBuilder.__init__; we don't want a tree.
+        self.fp: t.TextIO = fp
+        self.space: str = space
+        self.stack: list[str] = []
+        self._openElements: list[_OpenElement] = []
+        self._indentations: list[str] = ['\n']
+        self._root: Element | None = None
+
+    def _indentation(self, level: int) -> str:
+        while len(self._indentations) <= level:
+            self._indentations.append(self._indentations[-1] + self.space)
+        return self._indentations[level]
+
+    def _textOrIndentation(self, text: str, level: int) -> str:
+        # ElementTree.indent replaces any whitespace-only text/tail with indentation
+        if not text.strip():
+            return self._indentation(level)
+        return _escape_cdata(text)
+
+    def start(self, name: str, attr: dict[str, str]):
+        self.stack.append(name)
+        if self._openElements:
+            parent: _OpenElement = self._openElements[-1]
+            if not parent.hasChildren:
+                # first child: finish parent's start tag and write parent's text
+                parent.hasChildren = True
+                self.fp.write('>')
+                self.fp.write(self._textOrIndentation(parent.text, parent.level + 1))
+            else:
+                # write the previous child's tail
+                self.fp.write(self._textOrIndentation(parent.lastChildTail, parent.level + 1))
+                parent.lastChildTail = ''
+        elif self._root is None:
+            self._root = Element(name, attr)
+
+        self.fp.write('<' + name)
+        for k, v in attr.items():
+            self.fp.write(f' {k}="{_escape_attrib(v)}"')
+        self._openElements.append(_OpenElement(name, len(self._openElements)))
+
+    def end(self, name: str):
+        expected: str = self.stack[-1] if self.stack else ''
+        if expected != name:
+            raise DebugError(
+                f'mismatched tb.end call: is "{name}", should be "{expected}"'
+            )
+        self.stack.pop()
+
+        elem: _OpenElement = self._openElements.pop()
+        if elem.hasChildren:
+            # the last child's tail gets this element's indentation
+            self.fp.write(self._textOrIndentation(elem.lastChildTail, elem.level))
+            self.fp.write(f'</{name}>')
+        elif elem.text:
+            self.fp.write('>' + _escape_cdata(elem.text) + f'</{name}>')
+        else:
+            self.fp.write(' />')
+
+    def data(self, theData: str):
+        # (TreeBuilder tolerates None, so we do too)
+        if not theData or not self._openElements:
+            return
+        elem: _OpenElement = self._openElements[-1]
+        if elem.hasChildren:
+            elem.lastChildTail += theData
+        else:
+            elem.text += theData
+
+    def close(self) -> Element:
+        # Returns the root element, without any of its children (they have already
+        # been written, and were never kept).
+        if self.stack or self._root is None:
+            raise DebugError('XmlStreamWriter closed with unclosed (or no) elements')
+        return self._root
+
+
+class TreeBuilderRecorder(DebugTreeBuilder):
+    '''
+    Takes the same start/data/end calls as a TreeBuilder, but just records them, so they
+    can be played back (in order) into a real TreeBuilder (or XmlStreamWriter) later.
+    This lets pieces of a document be made on different threads, and then be emitted
+    in document order.
+
+    >>> import io
+    >>> recorder = TreeBuilderRecorder()
+    >>> recorder.start('b', {})
+    >>> recorder.data('x')
+    >>> recorder.end('b')
+    >>> fp = io.StringIO()
+    >>> tb = XmlStreamWriter(fp)
+    >>> tb.start('a', {})
+    >>> recorder.replay(tb)
+    >>> tb.end('a')
+    >>> print(fp.getvalue())
+    <a>
+      <b>x</b>
+    </a>
+    '''
+    _START: int = 0
+    _END: int = 1
+    _DATA: int = 2
+
+    def __init__(self) -> None:  # pylint: disable=super-init-not-called
+        # we deliberately don't call DebugTreeBuilder.__init__; we don't want a tree.
+        self.calls: list[tuple[int, str, dict[str, str] | None]] = []
+
+    def start(self, name: str, attr: dict[str, str]):
+        self.calls.append((self._START, name, attr))
+
+    def end(self, name: str):
+        self.calls.append((self._END, name, None))
+
+    def data(self, theData: str):
+        self.calls.append((self._DATA, theData, None))
+
+    def close(self) -> Element:
+        raise DebugError('TreeBuilderRecorder cannot be closed; replay it into a TreeBuilder')
+
+    def replay(self, tb: DebugTreeBuilder) -> None:
+        for call, value, attr in self.calls:
+            if call == self._START:
+                if t.TYPE_CHECKING:
+                    assert attr is not None
+                tb.start(value, attr)
+            elif call == self._END:
+                tb.end(value)
+            else:
+                tb.data(value)
@@ -0,0 +1,169 @@
+# ------------------------------------------------------------------------------
+# Name:          syntheticscores.py
+# Purpose:       Generates synthetic scores of parameterized size and shape (and
+#                exports them as **kern or MEI) for benchmarks and scaling tests.
+#
+# Authors:       Greg Chapman <gregc@mac.com>
+#
+# Copyright:     (c) 2021-2025 Greg Chapman
+# License:       MIT, see LICENSE
+# ------------------------------------------------------------------------------
+import io
+import random
+
+import music21 as m21
+
+from converter21.humdrum import HumdrumWriter
+from converter21.mei import MeiWriter
+
+# pitches (per voice) are chosen from these, so nothing needs ottavas (every staff has a
+# treble clef, so the lower voices do need a few ledger lines)
+_VOICE_PITCH_NAMES: tuple[tuple[str, ...], ...] = (
+    ('E4', 'F4', 'G4', 'A4', 'B4', 'C5', 'D5', 'E5', 'F5'),
+    ('C4', 'D4', 'E4', 'F4', 'G4', 'A4'),
+    ('G3', 'A3', 'B3', 'C4', 'D4'),
+    ('E3', 'F3', 'G3', 'A3'),
+)
+
+
+def makeSyntheticScore(
+    numParts: int = 4,
+    numMeasures: int = 32,
+    voicesPerStaff: int = 1,
+    splitDensity: float = 0.,
+    tupletDensity: float = 0.,
+    tremoloDensity: float = 0.,
+    slurDensity: float = 0.,
+    numVerses: int = 0,
+    seed: int = 0
+) -> m21.stream.Score:
+    '''
+    Returns a synthetic (but well-formed) Score of numParts parts of numMeasures 4/4
+    measures each.  The shape of the score is controlled by:
+
+        voicesPerStaff: the number of voices in a measure that has been split
+        splitDensity: the fraction of measures that are split into voicesPerStaff
+            voices (on export to **kern, each change between a split and an unsplit
+            measure causes spine splits or merges)
+        tupletDensity: the fraction of beats that are eighth note triplets
+        tremoloDensity: the fraction of beats that are single-note tremolos
+        slurDensity: the fraction of beats (that aren't tremolos) that are slurred
+        numVerses: the number of lyric verses (on the first voice of each part)
+
+    The same parameters (including seed) always produce the same score.
+
+    >>> score = makeSyntheticScore(numParts=2, numMeasures=3)
+    >>> len(score.parts), len(score.parts[0].getElementsByClass('Measure'))
+    (2, 3)
+    '''
+    if voicesPerStaff < 1 or voicesPerStaff > len(_VOICE_PITCH_NAMES):
+        raise ValueError(f'voicesPerStaff must be 1 through {len(_VOICE_PITCH_NAMES)}')
+
+    rng = random.Random(seed)
+    score = m21.stream.Score()
+    score.metadata = m21.metadata.Metadata()
+    score.metadata.title = f'Synthetic Score ({numParts} parts, {numMeasures} measures)'
+
+    # split the same measures in every part, like a real score would
+    isSplit: list[bool] = [
+        voicesPerStaff > 1 and rng.random() < splitDensity for _ in range(numMeasures)
+    ]
+
+    syllableNum: int = 0
+    for partIndex in range(numParts):
+        part = m21.stream.Part()
+        part.id = f'P{partIndex + 1}'
+        part.insert(0, m21.instrument.Instrument(f'Synth {partIndex + 1}'))
+
+        for measureIndex in range(numMeasures):
+            measure = m21.stream.Measure(number=measureIndex + 1)
+            if measureIndex == 0:
+                measure.insert(0, m21.clef.TrebleClef())
+                measure.insert(0, m21.key.KeySignature(1))
+                measure.insert(0, m21.meter.TimeSignature('4/4'))
+
+            numVoices: int = voicesPerStaff if isSplit[measureIndex] else 1
+            for voiceIndex in range(numVoices):
+                container: m21.stream.Stream = measure
+                if numVoices > 1:
+                    container = m21.stream.Voice(id=str(voiceIndex + 1))
+                    measure.insert(0, container)
+
+                pitchNames: tuple[str, ...] = _VOICE_PITCH_NAMES[voiceIndex]
+                for _ in range(4):
+                    beatNotes: list[m21.note.Note] = _makeBeat(
+                        rng, pitchNames, tupletDensity, tremoloDensity
+                    )
+                    if numVoices > 1:
+                        stemDirection: str = 'up' if voiceIndex % 2 == 0 else 'down'
+                        for n in beatNotes:
+                            n.stemDirection = stemDirection
+                    if voiceIndex == 0:
+                        for n in beatNotes:
+                            syllableNum += 1
+                            for verse in range(numVerses):
+                                n.addLyric(f'la{syllableNum}', lyricNumber=verse + 1)
+                    for n in beatNotes:
+                        container.append(n)
+                    if (len(beatNotes) > 1
+                            and not beatNotes[0].expressions
+                            and rng.random() < slurDensity):
+                        part.insert(0, m21.spanner.Slur(beatNotes))
+
+            part.append(measure)
+
+        score.insert(0, part)
+
+    return score
+
+
+def _makeBeat(
+    rng: random.Random,
+    pitchNames: tuple[str, ...],
+    tupletDensity: float,
+    tremoloDensity: float
+) -> list[m21.note.Note]:
+    # returns the notes of one quarter-note beat
+    roll: float = rng.random()
+    if roll < tremoloDensity:
+        n = m21.note.Note(rng.choice(pitchNames), quarterLength=1.)
+        tremolo = m21.expressions.Tremolo()
+        tremolo.numberOfMarks = 2
+        n.expressions.append(tremolo)
+        return [n]
+
+    if roll < tremoloDensity + tupletDensity:
+        notes: list[m21.note.Note] = []
+        for i in range(3):
+            n = m21.note.Note(rng.choice(pitchNames), type='eighth')
+            tuplet = m21.duration.Tuplet(3, 2, 'eighth')
+            tuplet.type = 'start' if i == 0 else 'stop' if i == 2 else None
+            n.duration.appendTuplet(tuplet)
+            notes.append(n)
+        return notes
+
+    if rng.random() < 0.5:
+        return [m21.note.Note(rng.choice(pitchNames), quarterLength=1.)]
+
+    return [
+        m21.note.Note(rng.choice(pitchNames), quarterLength=0.5),
+        m21.note.Note(rng.choice(pitchNames), quarterLength=0.5),
+    ]
+
+
+def syntheticHumdrum(**keywords) -> str:
+    '''
+    Returns the **kern export (via HumdrumWriter) of makeSyntheticScore(**keywords).
+    '''
+    output = io.StringIO()
+    HumdrumWriter(makeSyntheticScore(**keywords)).write(output)
+    return output.getvalue()
+
+
+def syntheticMei(**keywords) -> str:
+    '''
+    Returns the MEI export (via MeiWriter) of makeSyntheticScore(**keywords).
+    '''
+    output = io.StringIO()
+    MeiWriter(makeSyntheticScore(**keywords)).write(output)
+    return output.getvalue()
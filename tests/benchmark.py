@@ -0,0 +1,424 @@
+import io
+import sys
+import gc
+import functools
+import json
+import time
+import argparse
+import subprocess
+import platform
+import tracemalloc
+import typing as t
+from pathlib import Path
+
+import music21 as m21
+import converter21
+from converter21.humdrum import HumdrumFile
+from converter21.humdrum import HumdrumWriter
+from converter21.mei import MeiReader
+from converter21.mei import MeiWriter
+from converter21.shared import SharedConstants
+from converter21.shared import StreamFreezer
+from converter21.shared import StreamThawer
+from converter21 import syntheticscores
+
+# Measures the throughput of each stage of conversion (separately), over the files in
+# tests/files/valid and (optionally) synthetic scores of growing size (generated by
+# converter21.syntheticscores, as both **kern and MEI), as well as freezing/thawing
+# the parsed score the way ParseCache does.  For each input and stage we record the
+# best wall time of N repeats, notes/sec and the peak memory allocated during the
+# stage (measured by tracemalloc, in one extra untimed run, since tracing slows
+# everything down).  Results can be saved as a baseline JSON file, and later runs
+# can be compared against that baseline (exit status 1 if any stage got slower, or
+# needed more memory, by more than the tolerance).
+#
+#   python3 tests/benchmark.py --save baseline.json
+#   python3 tests/benchmark.py --synthetic 50,200,800 --compare baseline.json
+#   python3 tests/benchmark.py --import-time
+
+STAGES: tuple[str, ...] = (
+    'humdrumRead',          # HumdrumFile read + structure analysis
+    'createMusic21Stream',  # HumdrumFile.createMusic21Stream
+    'meiRead',              # MeiReader.run
+    'humdrumWrite',         # HumdrumWriter.write
+    'meiWrite',             # MeiWriter.write
+    'freeze',               # StreamFreezer write (deepcopy first), zlib pickle
+    'freezeLive',           # StreamFreezer write (fromLiveStream=True), zlib pickle
+    'thaw',                 # StreamThawer open of the 'freeze' result
+    'thawLive',             # StreamThawer open of the 'freezeLive' result
+)
+
+# the shape of the synthetic scores (see syntheticscores.makeSyntheticScore)
+SYNTHETIC_SHAPE: dict[str, t.Any] = {
+    'numParts': 4,
+    'voicesPerStaff': 2,
+    'splitDensity': 0.25,
+    'tupletDensity': 0.1,
+    'tremoloDensity': 0.05,
+    'slurDensity': 0.2,
+    'numVerses': 1,
+}
+
+def peakKB(func: t.Callable[[], t.Any]) -> int:
+    # The peak memory allocated (by Python) during one call of func, in kilobytes.
+    # Memory that was already allocated before the call doesn't count.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak: int = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak // 1024
+
+def countNotes(score: m21.stream.Stream) -> int:
+    # chords count as one note per pitch
+    return sum(len(n.pitches) for n in score.recurse().notes)
+
+def _timeIt(func: t.Callable[[], t.Any], repeat: int) -> tuple[float, int, t.Any]:
+    # returns (best wall time, peak memory in KB, result of the last call)
+    best: float = float('inf')
+    result: t.Any = None
+    for _ in range(repeat):
+        gc.collect()
+        startTime: float = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - startTime)
+    return best, peakKB(func), result
+
+def _record(
+    results: dict[str, dict[str, float]],
+    inputName: str,
+    stage: str,
+    seconds: float,
+    stagePeakKB: int,
+    numNotes: int,
+    **extra: float
+) -> None:
+    results[f'{inputName}::{stage}'] = {
+        'seconds': seconds,
+        'notes': numNotes,
+        'notesPerSecond': numNotes / seconds if seconds > 0 else 0.,
+        'peakKB': stagePeakKB,
+        **extra,
+    }
+
+def benchmarkHumdrum(
+    inputName: str,
+    data: str,
+    repeat: int,
+    results: dict[str, dict[str, float]]
+) -> None:
+    def read() -> HumdrumFile:
+        hf = HumdrumFile()
+        hf.readString(data)
+        return hf
+
+    seconds, readPeakKB, _ = _timeIt(read, repeat)
+    readSeconds: float = seconds
+
+    # createMusic21Stream can only be run once per HumdrumFile, so we read a
+    # fresh one each time (and subtract the read time).  The peak memory is of
+    # the read and createMusic21Stream together.
+    seconds, stagePeakKB, score = _timeIt(lambda: read().createMusic21Stream(), repeat)
+    numNotes: int = countNotes(score)
+    _record(results, inputName, 'humdrumRead', readSeconds, readPeakKB, numNotes)
+    _record(
+        results, inputName, 'createMusic21Stream',
+        max(seconds - readSeconds, 0.), stagePeakKB, numNotes
+    )
+    benchmarkWriters(inputName, score, numNotes, repeat, results)
+
+def benchmarkMei(
+    inputName: str,
+    data: bytes,
+    repeat: int,
+    results: dict[str, dict[str, float]]
+) -> None:
+    seconds, stagePeakKB, score = _timeIt(lambda: MeiReader(data).run(), repeat)
+    numNotes: int = countNotes(score)
+    _record(results, inputName, 'meiRead', seconds, stagePeakKB, numNotes)
+    benchmarkWriters(inputName, score, numNotes, repeat, results)
+
+def benchmarkWriters(
+    inputName: str,
+    score: m21.stream.Score,
+    numNotes: int,
+    repeat: int,
+    results: dict[str, dict[str, float]]
+) -> None:
+    if not score.elements:
+        return
+
+    def writeHumdrum() -> bool:
+        # HumdrumWriter.write copies the score before modifying it
+        return HumdrumWriter(score).write(io.StringIO())
+
+    def writeMei() -> bool:
+        return MeiWriter(score).write(io.StringIO())
+
+    seconds, stagePeakKB, _ = _timeIt(writeHumdrum, repeat)
+    _record(results, inputName, 'humdrumWrite', seconds, stagePeakKB, numNotes)
+    seconds, stagePeakKB, _ = _timeIt(writeMei, repeat)
+    _record(results, inputName, 'meiWrite', seconds, stagePeakKB, numNotes)
+    benchmarkFreezer(inputName, score, numNotes, repeat, results)
+
+def benchmarkFreezer(
+    inputName: str,
+    score: m21.stream.Score,
+    numNotes: int,
+    repeat: int,
+    results: dict[str, dict[str, float]]
+) -> None:
+    # The two ways of freezing a score (as ParseCache stores them: zlib-compressed
+    # pickles), their compressed sizes, and thawing each of them.
+    for stage, thawStage, fromLiveStream in (
+        ('freeze', 'thaw', False),
+        ('freezeLive', 'thawLive', True),
+    ):
+        seconds, stagePeakKB, frozen = _timeIt(
+            functools.partial(_freeze, score, fromLiveStream), repeat
+        )
+        _record(
+            results, inputName, stage, seconds, stagePeakKB, numNotes, zlibBytes=len(frozen)
+        )
+        seconds, stagePeakKB, _ = _timeIt(functools.partial(_thaw, frozen), repeat)
+        _record(results, inputName, thawStage, seconds, stagePeakKB, numNotes)
+
+def _freeze(score: m21.stream.Score, fromLiveStream: bool) -> bytes:
+    return StreamFreezer(score, fromLiveStream=fromLiveStream).write(
+        fmt='pickle', zipType='zlib'
+    )
+
+def _thaw(frozen: bytes) -> m21.stream.Stream | None:
+    thawer = StreamThawer()
+    thawer.open(frozen, zipType='zlib')
+    return thawer.stream
+
+def runBenchmarks(
+    paths: list[Path],
+    syntheticSizes: list[int],
+    repeat: int = 3,
+    stages: tuple[str, ...] = STAGES
+) -> dict[str, t.Any]:
+    results: dict[str, dict[str, float]] = {}
+    for path in paths:
+        print(f'{path}', file=sys.stderr)
+        try:
+            if path.suffix == '.mei':
+                benchmarkMei(path.name, path.read_bytes(), repeat, results)
+            else:
+                benchmarkHumdrum(
+                    path.name, path.read_text(encoding='utf-8'), repeat, results
+                )
+        except Exception as e:
+            # these are benchmarks, not correctness tests: skip inputs that fail
+            print(f'\tskipped: {e}', file=sys.stderr)
+
+    for numMeasures in syntheticSizes:
+        print(f'synthetic {numMeasures} measures', file=sys.stderr)
+        shape: dict[str, t.Any] = dict(SYNTHETIC_SHAPE, numMeasures=numMeasures)
+        benchmarkHumdrum(
+            f'synthetic{numMeasures}.krn',
+            syntheticscores.syntheticHumdrum(**shape),
+            repeat,
+            results
+        )
+        benchmarkMei(
+            f'synthetic{numMeasures}.mei',
+            syntheticscores.syntheticMei(**shape).encode('utf-8'),
+            repeat,
+            results
+        )
+
+    return {
+        'python': platform.python_version(),
+        'music21': m21.VERSION_STR,
+        'converter21': SharedConstants._CONVERTER21_VERSION,
+        'repeat': repeat,
+        'results': {
+            k: v for k, v in results.items() if k.rsplit('::', 1)[1] in stages
+        },
+    }
+
+def measureImportTime(
+    statement: str = 'import converter21; converter21.register()',
+    repeat: int = 3
+) -> dict[str, t.Any]:
+    # Runs statement in a fresh 'python -X importtime' process (repeat times), and
+    # returns the best cumulative import time of converter21 (in microseconds), and
+    # which of the big converter21 subpackages got imported.
+    # The subpackages are asked for by sys.modules (in the child process), since
+    # -X importtime doesn't log the packages that converter21 imports lazily, via
+    # importlib.import_module.
+    subpackages: tuple[str, ...] = ('converter21.humdrum', 'converter21.mei')
+    reportLoaded: str = (
+        f'import sys; print(*(m for m in {subpackages!r} if m in sys.modules))'
+    )
+    bestMicroseconds: int = 0
+    loaded: list[str] = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', statement + '\n' + reportLoaded],
+            capture_output=True, text=True, check=True
+        )
+        loaded = proc.stdout.split()
+        for line in proc.stderr.splitlines():
+            # 'import time:   self [us] | cumulative | imported package'
+            fields: list[str] = line.split('|')
+            if len(fields) != 3 or not line.startswith('import time:'):
+                continue
+            moduleName: str = fields[2].strip()
+            if moduleName == 'converter21':
+                microseconds: int = int(fields[1])
+                if bestMicroseconds == 0 or microseconds < bestMicroseconds:
+                    bestMicroseconds = microseconds
+    return {
+        'statement': statement,
+        'microseconds': bestMicroseconds,
+        'subpackagesLoaded': loaded,
+    }
+
+def totals(report: dict[str, t.Any]) -> dict[str, dict[str, float]]:
+    # per-stage totals over all inputs
+    output: dict[str, dict[str, float]] = {}
+    for key, value in report['results'].items():
+        stage: str = key.rsplit('::', 1)[1]
+        total = output.setdefault(stage, {'seconds': 0., 'notes': 0})
+        total['seconds'] += value['seconds']
+        total['notes'] += value['notes']
+        if 'zlibBytes' in value:
+            total['zlibBytes'] = total.get('zlibBytes', 0) + value['zlibBytes']
+    for total in output.values():
+        total['notesPerSecond'] = (
+            total['notes'] / total['seconds'] if total['seconds'] > 0 else 0.
+        )
+    return output
+
+def compareToBaseline(
+    report: dict[str, t.Any],
+    baseline: dict[str, t.Any],
+    tolerance: float = 0.2,
+    minSeconds: float = 0.01,
+    minPeakKB: int = 1024
+) -> list[str]:
+    '''
+    Returns a list of regressions (empty if there are none).  A regression is a
+    stage total (or a single input's stage, if the baseline took at least minSeconds)
+    that is more than tolerance (a fraction) slower than in the baseline, or a single
+    input's stage whose peak memory is more than tolerance bigger than in the baseline
+    (if the baseline needed at least minPeakKB).
+    '''
+    regressions: list[str] = []
+    limit: float = 1. + tolerance
+
+    baseTotals = totals(baseline)
+    for stage, total in totals(report).items():
+        base = baseTotals.get(stage)
+        if base is None or base['seconds'] <= 0:
+            continue
+        if total['seconds'] > base['seconds'] * limit:
+            regressions.append(
+                f'{stage} (total): {total["seconds"]:.3f}s vs {base["seconds"]:.3f}s'
+            )
+
+    baseResults: dict[str, dict[str, float]] = baseline['results']
+    for key, value in report['results'].items():
+        baseValue = baseResults.get(key)
+        if baseValue is None:
+            continue
+        if (baseValue['seconds'] >= minSeconds
+                and value['seconds'] > baseValue['seconds'] * limit):
+            regressions.append(
+                f'{key}: {value["seconds"]:.3f}s vs {baseValue["seconds"]:.3f}s'
+            )
+        basePeakKB: float = baseValue.get('peakKB', 0)
+        if basePeakKB >= minPeakKB and value['peakKB'] > basePeakKB * limit:
+            regressions.append(
+                f'{key} (peak memory): {value["peakKB"]:.0f}KB vs {basePeakKB:.0f}KB'
+            )
+
+    return regressions
+
+def printReport(report: dict[str, t.Any]) -> None:
+    nameWidth: int = max((len(k) for k in report['results']), default=0)
+    for key, value in report['results'].items():
+        print(
+            f'{key:<{nameWidth}}  {value["seconds"]:9.4f}s'
+            f'  {value["notesPerSecond"]:12.0f} notes/s'
+            f'  {value["peakKB"]:9d}KB peak'
+            + (f'  {value["zlibBytes"]:9d} bytes (zlib)' if 'zlibBytes' in value else '')
+        )
+    print('')
+    for stage, total in totals(report).items():
+        print(
+            f'{stage:<{nameWidth}}  {total["seconds"]:9.4f}s'
+            f'  {total["notesPerSecond"]:12.0f} notes/s'
+            + (f'  {total["zlibBytes"]:9d} bytes (zlib)' if 'zlibBytes' in total else '')
+        )
+
+# ------------------------------------------------------------------------------
+
+'''
+    main entry point (parse arguments and run benchmarks)
+'''
+if __name__ == '__main__':
+    converter21.register()
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark Humdrum/MEI parse and export throughput over tests/files/valid'
+        ' (and optional synthetic scores), and optionally compare against a saved baseline.'
+    )
+    parser.add_argument(
+        'paths', nargs='*',
+        help='.krn/.mei files or folders to benchmark (default: tests/files/valid)')
+    parser.add_argument(
+        '--synthetic', default='',
+        help='comma-separated measure counts of synthetic scores to add (e.g. 50,200)')
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='number of runs per stage (the best time is reported)')
+    parser.add_argument(
+        '--import-time', action='store_true', default=False,
+        help='just measure the import time of converter21 (python -X importtime) and exit')
+    parser.add_argument('--save', help='save the results to this JSON file')
+    parser.add_argument('--compare', help='compare the results against this baseline JSON file')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.2,
+        help='allowed slowdown (fraction) before --compare reports a regression')
+
+    args = parser.parse_args()
+
+    if args.import_time:
+        importTime = measureImportTime(repeat=args.repeat)
+        print(f'{importTime["statement"]}: {importTime["microseconds"] / 1000:.1f}ms')
+        print(f'subpackages loaded: {importTime["subpackagesLoaded"] or "none"}')
+        sys.exit(0)
+
+    benchPaths: list[Path] = []
+    for p in (args.paths or ['tests/files/valid']):
+        if Path(p).is_dir():
+            benchPaths.extend(
+                sorted(list(Path(p).glob('*.krn')) + list(Path(p).glob('*.mei')), key=str)
+            )
+        else:
+            benchPaths.append(Path(p))
+
+    sizes: list[int] = [int(s) for s in args.synthetic.split(',') if s.strip()]
+    theReport = runBenchmarks(benchPaths, sizes, repeat=args.repeat)
+    printReport(theReport)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(theReport, f, indent=1)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            theBaseline = json.load(f)
+        found: list[str] = compareToBaseline(theReport, theBaseline, args.tolerance)
+        if found:
+            print('\nREGRESSIONS:')
+            for regression in found:
+                print(f'\t{regression}')
+            sys.exit(1)
+        print('\nno regressions')
@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+
+import pytest
+
+# The things we're testing
+from converter21 import batchconvert
+
+VALID_FOLDER = Path('tests/files/valid')
+
+def test_collectBatchInputs_directory_glob_and_manifest(tmp_path):
+    fromDir = batchconvert.collectBatchInputs(str(VALID_FOLDER), ['.krn'])
+    assert len(fromDir) > 0
+    assert all(p.suffix == '.krn' for p in fromDir)
+
+    fromGlob = batchconvert.collectBatchInputs(str(VALID_FOLDER / '*.krn'), ['.krn'])
+    assert [str(p) for p in fromGlob] == [str(p) for p in fromDir]
+
+    manifest = tmp_path / 'manifest.txt'
+    manifest.write_text(
+        '# comment\n\n' + str(fromDir[0].resolve()) + '\n', encoding='utf-8'
+    )
+    fromManifest = batchconvert.collectBatchInputs('@' + str(manifest), ['.krn'])
+    assert fromManifest == [fromDir[0].resolve()]
+
+def test_computeBatchOutputPaths_preserves_structure(tmp_path):
+    inputs = [Path('a/b/one.krn'), Path('a/c/two.mei')]
+    outputs = batchconvert.computeBatchOutputPaths(inputs, tmp_path, '.musicxml')
+    assert outputs == [tmp_path / 'b' / 'one.musicxml', tmp_path / 'c' / 'two.musicxml']
+
+def test_computeBatchOutputPaths_keeps_extension_of_clashing_inputs(tmp_path):
+    # a.krn and a.mei would both be a.mei
+    inputs = [Path('a/a.krn'), Path('a/a.mei'), Path('a/b.krn')]
+    outputs = batchconvert.computeBatchOutputPaths(inputs, tmp_path, '.mei')
+    assert outputs == [tmp_path / 'a.krn.mei', tmp_path / 'a.mei.mei', tmp_path / 'b.mei']
+
+    # converting in place, with the same extension
+    inputs = [Path('a/one.krn'), Path('a/two.krn')]
+    outputs = batchconvert.computeBatchOutputPaths(inputs, 'a', '.krn')
+    assert outputs == [Path('a/one.krn.krn'), Path('a/two.krn.krn')]
+
+def test_computeBatchOutputPaths_rejects_remaining_clashes(tmp_path):
+    # a.krn.mei would be the output of a.krn, and is also an input
+    inputs = [Path('a/a.krn'), Path('a/a.krn.mei'), Path('a/a.mei')]
+    with pytest.raises(ValueError):
+        batchconvert.computeBatchOutputPaths(inputs, 'a', '.mei')
+
+def test_runBatch_report_and_resume(tmp_path):
+    inputs = batchconvert.collectBatchInputs(str(VALID_FOLDER / '*.krn'), ['.krn'])[:2]
+    outputs = batchconvert.computeBatchOutputPaths(inputs, tmp_path, '.krn')
+    report = tmp_path / 'report.jsonl'
+
+    counts = batchconvert.runBatch(inputs, outputs, None, 'humdrum', report)
+    assert counts[batchconvert.BATCH_STATUS_OK] == 2
+    with open(report, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [r['status'] for r in records] == ['ok', 'ok']
+    assert all(Path(r['output']).exists() for r in records)
+
+    counts = batchconvert.runBatch(inputs, outputs, None, 'humdrum', report, resume=True)
+    assert counts['skipped'] == 2
+    assert counts[batchconvert.BATCH_STATUS_OK] == 0
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+# The things we're testing
+from tests import benchmark
+
+def test_runBenchmarks_and_compareToBaseline():
+    report = benchmark.runBenchmarks(
+        [Path('tests/files/valid/ChopinSpring.krn')], [2], repeat=1
+    )
+    assert set(benchmark.totals(report)) == set(benchmark.STAGES)
+    assert all(v['notes'] > 0 for v in report['results'].values())
+    assert all(
+        v['zlibBytes'] > 0 for k, v in report['results'].items()
+        if k.endswith(('::freeze', '::freezeLive'))
+    )
+
+    # every stage has its own peak memory (not just the peak of the process so far)
+    peaks = [v['peakKB'] for v in report['results'].values()]
+    assert all(peak > 0 for peak in peaks)
+    assert len(set(peaks)) > 1
+
+    # no regressions against itself
+    assert not benchmark.compareToBaseline(report, report)
+
+    # a baseline that was twice as fast
+    fasterBaseline = {
+        'results': {
+            k: dict(v, seconds=v['seconds'] / 2) for k, v in report['results'].items()
+        }
+    }
+    regressions = benchmark.compareToBaseline(report, fasterBaseline, tolerance=0.2)
+    assert any(r.startswith('createMusic21Stream (total)') for r in regressions)
+
+    # a baseline that needed half the memory
+    smallerBaseline = {
+        'results': {
+            k: dict(v, peakKB=v['peakKB'] // 2) for k, v in report['results'].items()
+        }
+    }
+    regressions = benchmark.compareToBaseline(
+        report, smallerBaseline, tolerance=0.2, minPeakKB=0
+    )
+    assert any('(peak memory)' in r for r in regressions)
+
+def test_register_does_not_import_humdrum_or_mei():
+    importTime = benchmark.measureImportTime(repeat=1)
+    assert importTime['microseconds'] > 0
+    assert importTime['subpackagesLoaded'] == []
+
+    # but they are there on first use
+    importTime = benchmark.measureImportTime(
+        'import converter21; converter21.humdrum.HumdrumFile', repeat=1
+    )
+    assert importTime['subpackagesLoaded'] == ['converter21.humdrum']
@@ -0,0 +1,84 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+# The things we're testing
+from converter21 import conversionserver
+
+KRN_PATH = Path('tests/files/valid/7tupletOf16thNotes.krn')
+
+def test_convertData_humdrum_to_mei_and_back():
+    krnData = KRN_PATH.read_bytes()
+    meiData = conversionserver.convertData(krnData, 'humdrum', 'mei')
+    assert meiData.startswith(b'<?xml')
+    assert b'<mei ' in meiData
+
+    krnData2 = conversionserver.convertData(meiData, 'mei', 'humdrum')
+    assert b'**kern' in krnData2
+
+def test_socket_server_roundtrip(tmp_path):
+    socketPath = str(tmp_path / 'c21.sock')
+    server = conversionserver.ConversionServer(numWorkers=1, maxJobsPerWorker=1)
+    unixServer = conversionserver._UnixConversionServer(socketPath, server)
+    thread = threading.Thread(target=unixServer.serve_forever, daemon=True)
+    thread.start()
+    try:
+        krnData = KRN_PATH.read_bytes()
+        # two jobs, so the (recycled) worker is replaced in between
+        for _ in range(2):
+            meiData = conversionserver.requestConversion(socketPath, krnData, 'humdrum', 'mei')
+            assert b'<mei ' in meiData
+
+        with pytest.raises(conversionserver.ConversionServerError):
+            conversionserver.requestConversion(socketPath, b'not mei', 'mei', 'humdrum')
+    finally:
+        unixServer.shutdown()
+        unixServer.server_close()
+        server.close()
+
+def test_http_server_roundtrip_and_bad_requests():
+    import http.client
+
+    server = conversionserver.ConversionServer(numWorkers=1)
+    httpServer = conversionserver._HttpConversionServer(0, server)  # any free port
+    port: int = httpServer.server_address[1]
+    thread = threading.Thread(target=httpServer.serve_forever, daemon=True)
+    thread.start()
+
+    def post(
+        path: str,
+        body: bytes = b'',
+        headers: dict[str, str] | None = None
+    ) -> tuple[int, bytes]:
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        try:
+            connection.putrequest('POST', path)
+            for name, value in (headers or {}).items():
+                connection.putheader(name, value)
+            connection.endheaders(body)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+    try:
+        krnData = KRN_PATH.read_bytes()
+        status, meiData = post(
+            '/convert?from=humdrum&to=mei', krnData, {'Content-Length': str(len(krnData))}
+        )
+        assert status == 200
+        assert b'<mei ' in meiData
+
+        status, _ = post('/convert?from=mei&to=humdrum', b'not mei', {'Content-Length': '7'})
+        assert status == 500
+
+        assert post('/elsewhere', b'', {'Content-Length': '0'})[0] == 400
+        assert post('/convert?from=humdrum&to=mei')[0] == 411
+        for badLength in ('abc', '-1'):
+            status, _ = post('/convert?from=humdrum&to=mei', b'', {'Content-Length': badLength})
+            assert status == 400
+    finally:
+        httpServer.shutdown()
+        httpServer.server_close()
+        server.close()
@@ -96,3 +96,35 @@ def test_getMetronomeMarkInfo():
     CheckIsNone(mmStr)
     CheckString(refStr, 'quarter')
     CheckString(bpmStr, '128')
+
+def test_recipToDuration_cache_is_keyed_by_scale():
+    Convert.clearRhythmCaches()
+    assert Convert.recipToDuration('4.') == 1.5
+    assert Convert.recipToDuration('4.', 1) == 0.375
+    assert Convert.recipToDuration('4.') == 1.5
+    assert Convert.recipToDurationNoDots('4.') == 1.0
+
+    info = Convert.rhythmCacheInfo()['recipToDuration']
+    assert info.hits >= 1
+    assert info.maxsize is not None
+
+    Convert.clearRhythmCaches()
+    assert Convert.rhythmCacheInfo()['recipToDuration'].currsize == 0
+
+def test_kernToPitch():
+    pitch = Convert.kernToPitch('4cc#L 4ee')
+    assert pitch.diatonic == 0
+    assert pitch.octave == 5
+    assert pitch.accidentals == 1
+    assert pitch.base7 == 35
+    assert pitch.base40 == 203
+    assert pitch.midi == 73
+    assert Convert.kernToBase40('4cc#L') == pitch.base40
+
+    rest = Convert.kernToPitch('4r')
+    assert rest.diatonic == -1000
+    assert rest.octave == -1000
+
+    nothing = Convert.kernToPitch('.')
+    assert nothing.diatonic == -2000
+    assert nothing.base40 == -2000
@@ -0,0 +1,34 @@
+# The things we're testing
+from converter21.humdrum import HumGrid
+from converter21.humdrum import GridMeasure
+from converter21.humdrum import GridSlice
+from converter21.humdrum import SliceType
+
+def test_GridMeasure_slices_stay_sorted_by_timestamp():
+    gm = GridMeasure(HumGrid())
+    gm.timestamp = 0
+    gm.duration = 4
+    staffCounts = [1]
+
+    for ts in (3, 0, 2, 1):
+        gm.addDataToken('4c', ts, 0, 0, 0, staffCounts)
+    clefSlice = gm.addTokenOfSliceType('*clefG2', 2, SliceType.Clefs, 0, 0, 0, staffCounts)
+    lateSlice = GridSlice(gm, 2, SliceType.Notes, staffCounts)
+    gm.insertSliceByTimestamp(lateSlice)
+
+    assert [gs.timestamp for gs in gm.slices] == [0, 1, 2, 2, 2, 3]
+    # clef goes before the data slice, lateSlice after all the slices at its timestamp
+    assert gm.slices[2] is clefSlice
+    assert gm.slices[4] is lateSlice
+
+    assert gm.sliceIndexAtOrAfter(2) == 2
+    assert gm.sliceIndexAfter(2) == 5
+    assert gm.sliceIndexAfter(10) == len(gm.slices)
+
+    for idx, gs in enumerate(gm.slices):
+        assert gm.sliceIndex(gs) == idx
+    assert gm.sliceIndex(GridSlice(gm, 2, SliceType.Notes, staffCounts)) is None
+
+    # a slice whose timestamp has been changed is still found
+    lateSlice.timestamp = 0
+    assert gm.sliceIndex(lateSlice) == 4
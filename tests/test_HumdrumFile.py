@@ -33,6 +33,256 @@ def test_HumdrumFile_default_init():
     results = HumdrumFileTestResults()
     CheckHumdrumFile(f, results)
 
+def test_HumdrumFile_readStream_matches_readString():
+    contents = (
+        '!!!COM: Nobody\n'
+        + '**kern\t**kern\n'
+        + '*^\t*\n'
+        + '4c\t4e\t4g\n'
+        + '*v\t*v\t*\n'
+        + '=\t=\n'
+        + '*-\t*-\n'
+    )
+    fromString = HumdrumFile()
+    assert fromString.readString(contents)
+
+    # a generator of lines (some without the trailing '\n')
+    fromStream = HumdrumFile()
+    assert fromStream.readStream(line.rstrip('\n') for line in contents.splitlines(True))
+
+    assert str(fromStream) == str(fromString)
+    assert fromStream.lineCount == fromString.lineCount == 7
+    assert [line.lineIndex for line in fromStream.lines()] == list(range(7))
+
+def test_HumdrumFile_readStream_fails_fast_on_spine_count_mismatch():
+    linesRead: list[str] = []
+    def lineSource():
+        for line in ('**kern\t**kern', '4c\t4e', '4d', '4e\t4g', '*-\t*-'):
+            linesRead.append(line)
+            yield line
+
+    hf = HumdrumFile()
+    assert not hf.readStream(lineSource())
+    assert 'Expected 2 fields, but found 1' in hf.parseError
+    # nothing after the bad line was read
+    assert linesRead == ['**kern\t**kern', '4c\t4e', '4d']
+
+def test_HumdrumFile_insertNullLines_by_timestamp():
+    contents = (
+        '**kern\n'
+        + '*M2/4\n'
+        + '2c\n'
+        + '=\n'
+        + '!comment\n'
+        + '4d\n'
+        + '4e\n'
+        + '*-\n'
+    )
+    hf = HumdrumFile()
+    assert hf.readString(contents)
+
+    # existing data lines are returned, not duplicated
+    assert hf.insertNullDataLine(2).text == '4d'
+    assert hf.insertNullDataLine(3).text == '4e'
+    # new null data line splits the duration of the previous data line
+    newLine = hf.insertNullDataLine(1)
+    assert newLine.text == '.'
+    assert newLine.durationFromStart == 1
+    assert newLine.duration == 1
+    assert hf[2].duration == 1
+
+    assert hf.insertNullInterpretationLine(3).text == '*'
+    assert hf.insertNullInterpretationLineAbove(2).text == '*'
+
+    # nothing before the first data line
+    assert hf.insertNullDataLine(-1) is None
+    assert hf.insertNullInterpretationLine(-1) is None
+
+    assert [line.text for line in hf.lines()] == [
+        '**kern', '*M2/4', '2c', '.', '*', '=', '!comment', '4d', '*', '4e', '*-'
+    ]
+    assert [line.durationFromStart for line in hf.lines()] == sorted(
+        line.durationFromStart for line in hf.lines()
+    )
+
+def test_HumdrumFile_insertLines_and_deferredLineIndexing():
+    hf = HumdrumFile()
+    assert hf.readString('**kern\n4c\n4d\n*-\n')
+
+    hf.insertLines(1, ['!!one', '!!two'], asGlobalToken=True)
+    assert [line.text for line in hf.lines()] == [
+        '**kern', '!!one', '!!two', '4c', '4d', '*-'
+    ]
+    assert [line.lineIndex for line in hf.lines()] == list(range(6))
+
+    with hf.deferredLineIndexing():
+        with hf.deferredLineIndexing():
+            hf.insertLine(0, '!!!COM: Nobody', asGlobalToken=True)
+        # still deferred (we're in the outer block)
+        assert hf[-1].lineIndex == 5
+        hf.insertLines(4, ['!!three'], asGlobalToken=True)
+    assert [line.text for line in hf.lines()] == [
+        '!!!COM: Nobody', '**kern', '!!one', '!!two', '!!three', '4c', '4d', '*-'
+    ]
+    assert [line.lineIndex for line in hf.lines()] == list(range(8))
+
+def test_HumdrumFile_readBytes_decodes_like_read(tmp_path):
+    # latin-1 (not utf-8), with CRLF line endings
+    contents: bytes = b'!!!COM: Dvor\xe1k\r\n**kern\r\n4c\r\n*-\r\n'
+    krnPath = tmp_path / 'latin1.krn'
+    krnPath.write_bytes(contents)
+
+    fromFile = HumdrumFile(krnPath)
+    fromBytes = HumdrumFile()
+    assert fromBytes.readBytes(contents)
+    assert [line.text for line in fromBytes.lines()] == [line.text for line in fromFile.lines()]
+    assert fromBytes[0].text == '!!!COM: Dvor\u00e1k'
+
+@pytest.mark.parametrize('fileName', ['DifficultOttavas.krn', 'HaydnSymphony44Snippet.krn'])
+def test_HumdrumFile_keepSoundingPitch(fileName):
+    def allPitchNames(score):
+        return [
+            [p.nameWithOctave for n in part.recurse().notes for p in n.pitches]
+            for part in score.parts
+        ]
+
+    krnPath = Path('tests/files/valid') / fileName
+    written = HumdrumFile(krnPath).createMusic21Stream()
+
+    hf = HumdrumFile(krnPath)
+    hf.keepSoundingPitch = True
+    sounding = hf.createMusic21Stream()
+    assert all(part.atSoundingPitch is True for part in sounding.parts)
+    assert allPitchNames(sounding) != allPitchNames(written)
+
+    # music21's own (whole-part) transposition to written pitch agrees with ours
+    sounding.toWrittenPitch(inPlace=True)
+    assert allPitchNames(sounding) == allPitchNames(written)
+
+def test_HumdrumFile_createMusic21Stream_measureRange():
+    import music21 as m21
+
+    krnPath = Path('tests/files/valid/ChopinSpring.krn')
+    whole = HumdrumFile(krnPath).createMusic21Stream()
+    ranged = HumdrumFile(krnPath).createMusic21Stream(measureRange=(10, 20))
+
+    assert len(ranged.parts) == len(whole.parts)
+    for wholePart, rangedPart in zip(whole.parts, ranged.parts):
+        wholeMeasures = list(wholePart.getElementsByClass(m21.stream.Measure))[10:20]
+        rangedMeasures = list(rangedPart.getElementsByClass(m21.stream.Measure))
+        assert [m.measureNumber for m in rangedMeasures] == [
+            m.measureNumber for m in wholeMeasures
+        ]
+        assert rangedMeasures[0].getOffsetBySite(rangedPart) == 0
+        assert [n.fullName for n in rangedPart.recurse().notes] == [
+            n.fullName for m in wholeMeasures for n in m.recurse().notes
+        ]
+
+        # the current clef/keysig/timesig are in the first measure
+        firstMeasure = rangedMeasures[0]
+        for cls in (m21.clef.Clef, m21.key.KeySignature, m21.meter.TimeSignature):
+            assert firstMeasure.recurse().getElementsByClass(cls).first() is not None
+
+    with pytest.raises(ValueError):
+        HumdrumFile(krnPath).createMusic21Stream(measureRange=(5, 5))
+
+def test_HumdrumFile_createMusic21Stream_measureRange_spanners():
+    import music21 as m21
+
+    # slurs (and a phrase) that start before, inside and after measures 2-3
+    kern = '\n'.join([
+        '**kern', '*clefG2', '*M4/4',
+        '=1', '4c', '4d', '({4e', '(4f',
+        '=2', '4g)', '(4a', '4b', '4cc',
+        '=3', '4dd)', '(4ee', '4ff', '4gg',
+        '=4', '4aa)', '4bb)}', '4ccc', '4ddd',
+        '=5', '(4c', '4d)',
+        '*-', ''
+    ])
+    hf = HumdrumFile()
+    assert hf.readString(kern)
+    ranged = hf.createMusic21Stream(measureRange=(1, 3))
+    assert [n.nameWithOctave for n in ranged.recurse().notes] == [
+        'G4', 'A4', 'B4', 'C5', 'D5', 'E5', 'F5', 'G5'
+    ]
+
+    def describe(el) -> str:
+        if isinstance(el, m21.spanner.SpannerAnchor):
+            measure = el.getContextByClass(m21.stream.Measure)
+            return f'anchor@{measure.measureNumber}:{el.offset}'
+        return el.nameWithOctave
+
+    slurs = sorted(
+        (describe(slur.getFirst()), describe(slur.getLast()))
+        for slur in ranged.recurse().getElementsByClass(m21.spanner.Slur)
+    )
+    assert slurs == [
+        ('A4', 'D5'),                   # inside the range
+        ('E5', 'anchor@3:4.0'),         # starts inside, ends after the range
+        ('anchor@2:0.0', 'G4'),         # starts before, ends inside the range
+        ('anchor@2:0.0', 'anchor@3:4.0'),  # starts before, ends after the range
+    ]
+    inScore: set[int] = {id(el) for el in ranged.recurse()}
+    for slur in ranged.recurse().getElementsByClass(m21.spanner.Slur):
+        for el in slur.getSpannedElements():
+            assert id(el) in inScore
+
+    # HumdrumFile does not import phrases (yet), so the phrase is not in the slurs above
+    # (and the whole score just has the 5 slurs).
+    whole = HumdrumFile()
+    assert whole.readString(kern)
+    assert len(whole.createMusic21Stream().recurse().getElementsByClass(m21.spanner.Slur)) == 5
+
+def test_HumdrumFile_scanNotationFeatures():
+    hf = HumdrumFile()
+    assert hf.readString('**kern\n*clefG2\n4c\n4d\n*-\n')
+    features = hf.scanNotationFeatures()
+    assert not any(
+        getattr(features, name) for name in features.__slots__
+    )
+
+    hf = HumdrumFile()
+    assert hf.readString(
+        '!!LO:PB:g=z\n**kern\t**text\n*8va\t*ij\n*rscale:2\t*\n'
+        + '{(4c\tla\n4d)}\tli\n*-\t*-\n'
+    )
+    features = hf.scanNotationFeatures()
+    assert all(
+        getattr(features, name) for name in features.__slots__ if name != 'linkedTies'
+    )
+    assert not features.linkedTies
+
+def test_HumdrumFile_analyzeNotation_restPositions_after_clef_in_split_spine():
+    # D3 is on the middle line of a bass clef staff (stepShift 0).  The null
+    # interpretation next to the new clef must not be taken as a clef of its own,
+    # in either subspine, nor when the analysis is rerun.
+    hf = HumdrumFile()
+    assert hf.readString(
+        '**kern\n*clefG2\n*^\n*clefF4\t*\n4Dr\t4Dr\n*v\t*v\n4Dr\n*-\n'
+    )
+    for _ in range(2):
+        hf.analyzeNotation()
+        stepShifts: list[str | None] = [
+            tok.getValueString('auto', 'stepShift')
+            for line in hf.lines() for tok in line.tokens() if tok.isRest
+        ]
+        assert stepShifts == ['0', '0', '0']
+
+@pytest.mark.parametrize(
+    'fileName', ['allMetadata.krn', 'metadata.krn', 'R731_Mes-w16b3p9m24-28.krn']
+)
+def test_HumdrumFile_metadataFromFile_matches_createMusic21Stream(fileName):
+    from converter21.humdrum import HumSignifiers
+
+    krnPath = Path('tests/files/valid') / fileName
+    hf = HumdrumFile(krnPath)
+    score = hf.createMusic21Stream()
+
+    signifiers = HumSignifiers()
+    md = HumdrumFile.metadataFromFile(krnPath, signifiers)
+    assert md.all() == score.metadata.all()
+    assert signifiers.signifierCount == hf._signifiers.signifierCount
+
 def ReadAllTestFilesInFolder(folder: str):
     krnPaths: [Path] = sorted(list(Path(folder).glob('**/*.krn')), key=str)
     print('numTestFiles in', folder, ' =', len(krnPaths))
@@ -199,3 +449,24 @@ def test_HumdrumFile_read_all_humdrum_files_in_tasso_scores_FromFile():
     ReadAllTestFilesInFolder('/Users/gregc/Documents/test/tasso-scores')
 
 # add more tests for coverage...
+
+def test_HumdrumConverter_collects_phase_timings():
+    import pickle
+    from converter21 import HumdrumConverter
+    score = HumdrumConverter().parseData(
+        '**kern\n*M2/4\n=1\n4c\n4d\n=2\n2e\n==\n*-\n',
+        collectTimings=True
+    )
+    phases = score.c21_timings
+    names = [p.name for p in phases]
+    assert names[0] == 'read'
+    assert 'analyzeNotation' in names
+    assert 'toWrittenPitch' in names
+    secondPass = phases[names.index('secondPass')]
+    assert secondPass.counts['measures'] >= 2
+    assert all(p.seconds >= 0 for p in phases)
+    assert [p.name for p in pickle.loads(pickle.dumps(phases))] == names
+
+    # timings are only attached to the score if requested
+    score = HumdrumConverter().parseData('**kern\n4c\n*-\n')
+    assert not hasattr(score, 'c21_timings')
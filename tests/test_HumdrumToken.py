@@ -22,6 +22,26 @@ def test_HumdrumToken_exinterp_kern():
                         expectedDuration=-1,
                         )
 
+def test_HumdrumToken_cached_properties_follow_text_changes():
+    token = HumdrumToken('*^')
+    assert token.isInterpretation
+    assert token.isSplitInterpretation
+    assert token.isManipulator
+    assert not token.isData
+
+    token.text = '4c'
+    assert not token.isInterpretation
+    assert not token.isSplitInterpretation
+    assert not token.isManipulator
+    assert token.isData
+
+def test_HumdrumToken_is_slotted():
+    token = HumdrumToken('4c')
+    assert not hasattr(token, '__dict__')
+    assert not token.hasParameters()
+    token.setValue('auto', 'foo', 'bar')
+    assert token.getValue('auto', 'foo') == 'bar'
+
 def test_HumdrumToken_global_param():
     hf = HumdrumFile()
     hf.readString(\
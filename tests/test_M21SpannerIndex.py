@@ -0,0 +1,36 @@
+import pytest
+
+# The things we're testing
+import music21 as m21
+from converter21.shared import M21SpannerIndex
+from converter21.shared import M21Utilities
+from converter21.shared.m21utilities import Converter21InternalError
+
+def test_M21SpannerIndex():
+    notes = [m21.note.Note(p) for p in ('C4', 'D4', 'E4', 'F4')]
+    slur = m21.spanner.Slur(notes[0], notes[2])
+    cresc = m21.dynamics.Crescendo(notes[1], notes[3])
+    dim = m21.dynamics.Diminuendo(notes[2], notes[3])
+    notInIndex = m21.spanner.Slur(notes[0], notes[1])
+
+    index = M21SpannerIndex([slur, cresc, dim])
+    assert len(index) == 3
+    assert list(index) == [slur, cresc, dim]
+    assert M21Utilities.isIn(cresc, index)
+    assert not M21Utilities.isIn(notInIndex, index)
+
+    assert index.getByFirstElement(notes[0]) == [slur]
+    assert index.getByLastElement(notes[3]) == [cresc, dim]
+    assert index.getByLastElement(notes[0]) == []
+    assert list(index.getByClass(m21.dynamics.DynamicWedge)) == [cresc, dim]
+
+    assert M21Utilities.getDynamicWedgesStartedWithGeneralNote(notes[2], index) == [dim]
+    assert M21Utilities.getDynamicWedgesStartedOrStoppedWithGeneralNote(
+        notes[3], index
+    ) == [cresc, dim]
+    assert M21Utilities.getDynamicWedgesStartedOrStoppedWithGeneralNote(
+        notes[2], index
+    ) == [dim]
+
+    with pytest.raises(Converter21InternalError):
+        index.append(notInIndex)
@@ -0,0 +1,47 @@
+import io
+from pathlib import Path
+
+import pytest
+
+# The things we're testing
+from converter21.mei import meireader
+from converter21.mei import MeiReader
+from converter21.humdrum import HumdrumWriter
+
+lxmlEtree = pytest.importorskip('lxml.etree')
+
+MEI_PATHS = sorted(Path('tests/files/valid').glob('*.mei'), key=str)
+
+def humdrumFromMeiBytes(meiData: bytes, useLxml: bool, monkeypatch) -> str:
+    monkeypatch.setattr(meireader, 'lxmlEtree', lxmlEtree if useLxml else None)
+    reader = MeiReader(meiData)
+    assert isinstance(reader.documentRoot, lxmlEtree._Element) == useLxml
+    score = reader.run()
+
+    output = io.StringIO()
+    assert HumdrumWriter(score).write(output)
+    return output.getvalue()
+
+@pytest.mark.parametrize('meiPath', MEI_PATHS, ids=lambda p: p.name)
+def test_lxml_parse_matches_ElementTree(meiPath, monkeypatch):
+    meiData: bytes = meiPath.read_bytes()
+    assert (
+        humdrumFromMeiBytes(meiData, True, monkeypatch)
+        == humdrumFromMeiBytes(meiData, False, monkeypatch)
+    )
+
+def test_lxml_parse_resolves_internal_entities_like_ElementTree(monkeypatch):
+    meiData: bytes = b'''<?xml version="1.0" encoding="UTF-8"?>
+        <!DOCTYPE mei [<!ENTITY composer "Fr&#233;d&#233;ric">]>
+        <mei xmlns="http://www.music-encoding.org/ns/mei" meiversion="4.0">
+        <!-- a comment -->
+        <music><score><section><dir>&composer; <?pi ignored?>Chopin</dir></section></score></music>
+        </mei>'''
+    dirTexts: list[str] = []
+    for useLxml in (True, False):
+        monkeypatch.setattr(meireader, 'lxmlEtree', lxmlEtree if useLxml else None)
+        root = MeiReader(meiData).documentRoot
+        dirElement = root.find('.//{http://www.music-encoding.org/ns/mei}dir')
+        assert len(dirElement) == 0
+        dirTexts.append(''.join(dirElement.itertext()))
+    assert dirTexts == ['Frédéric Chopin', 'Frédéric Chopin']
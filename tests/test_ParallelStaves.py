@@ -0,0 +1,115 @@
+import io
+import re
+from pathlib import Path
+
+import pytest
+import music21 as m21
+
+# The things we're testing
+from converter21 import syntheticscores
+from converter21.humdrum import HumdrumFile
+from converter21.humdrum import HumdrumWriter
+from converter21.mei import MeiWriter
+from converter21.shared import M21Utilities
+
+def syntheticScore(numParts: int = 12) -> m21.stream.Score:
+    return syntheticscores.makeSyntheticScore(
+        numParts=numParts, numMeasures=8, voicesPerStaff=2, splitDensity=0.3,
+        tupletDensity=0.2, slurDensity=0.3, numVerses=1, seed=3
+    )
+
+def crossStaffWedgeScore() -> m21.stream.Score:
+    # a crescendo and a diminuendo from a note in one staff to a note in the next
+    score = syntheticScore(numParts=4)
+    parts: list[m21.stream.Part] = list(score.parts)
+    for (startPart, endPart), wedgeClass in zip(
+            ((parts[0], parts[1]), (parts[3], parts[2])),
+            (m21.dynamics.Crescendo, m21.dynamics.Diminuendo)):
+        startNote = startPart[m21.note.Note].first()
+        endNote = endPart[m21.note.Note].last()
+        score.insert(0, wedgeClass(startNote, endNote))
+    return score
+
+def coloredNotesScore() -> m21.stream.Score:
+    # every color wants the same RDF signifier ('i'), so all but the first one
+    # to get there need some other signifier
+    score = syntheticScore(numParts=6)
+    colors: tuple[str, ...] = ('red', 'blue', 'green')
+    for partIndex, part in enumerate(score.parts):
+        for noteIndex, note in enumerate(part[m21.note.Note]):
+            if noteIndex % 3 == 0:
+                note.style.color = colors[(partIndex + noteIndex) % len(colors)]
+    return score
+
+def parsedScores():
+    for name in ('ChopinSpring.krn', 'Haydn_312_voices.krn', 'HaydnSymphony44Snippet.krn'):
+        hf = HumdrumFile(str(Path('tests/files/valid') / name))
+        yield name, hf.createMusic21Stream()
+    yield 'synthetic', syntheticScore()
+    yield 'crossStaffWedges', crossStaffWedgeScore()
+
+def canonicalXmlIds(output: str) -> str:
+    # Some xml:ids (e.g. of the beams) are made up during the export, so rename
+    # every xml:id (and every reference to it) in order of first appearance.
+    xmlIds: dict[str, str] = {}
+    for xmlId in re.findall(r'xml:id="([^"]+)"', output):
+        xmlIds.setdefault(xmlId, f'id{len(xmlIds) + 1}')
+    if not xmlIds:
+        return output
+    pattern = re.compile(
+        r'(?<=["# ])(' + '|'.join(re.escape(xmlId) for xmlId in xmlIds) + r')(?=[" ])'
+    )
+    return pattern.sub(lambda m: xmlIds[m.group(1)], output)
+
+def writeBothWays(
+    writerClass,
+    score: m21.stream.Score,
+    reservedRDFKernSignifiers: str = ''
+) -> list[str]:
+    # so both MEI exports get the same xml:ids (at least for the score's own objects)
+    M21Utilities.assureAllXmlIds(score)
+    outputs: list[str] = []
+    for parallelStaves in (False, True):
+        writer = writerClass(score)
+        writer.parallelStaves = parallelStaves
+        if reservedRDFKernSignifiers:
+            writer.reservedRDFKernSignifiers = reservedRDFKernSignifiers
+        output = io.StringIO()
+        assert writer.write(output)
+        outputs.append(output.getvalue())
+    if writerClass is MeiWriter:
+        outputs = [canonicalXmlIds(output) for output in outputs]
+    return outputs
+
+@pytest.mark.parametrize('writerClass', [HumdrumWriter, MeiWriter])
+def test_parallelStaves_output_matches(writerClass):
+    for name, score in parsedScores():
+        outputs: list[str] = writeBothWays(writerClass, score)
+        assert outputs[0] == outputs[1], name
+
+def test_parallelStaves_crossStaffWedges_are_exported():
+    outputs: list[str] = writeBothWays(MeiWriter, crossStaffWedgeScore())
+    assert outputs[0] == outputs[1]
+    assert outputs[0].count('<hairpin ') == 2
+
+    outputs = writeBothWays(HumdrumWriter, crossStaffWedgeScore())
+    assert outputs[0] == outputs[1]
+    tokens: list[str] = [
+        token for line in outputs[0].splitlines() if not line.startswith('!')
+        for token in line.split('\t')
+    ]
+    assert '<' in tokens and '>' in tokens
+
+def test_parallelStaves_rdfSignifierFallback():
+    # with the favorite signifier reserved, every color needs a fallback signifier
+    score = coloredNotesScore()
+    outputs: list[str] = writeBothWays(HumdrumWriter, score, reservedRDFKernSignifiers='i')
+    assert outputs[0] == outputs[1]
+    assert '!!!RDF**kern: i' not in outputs[0]
+    assert outputs[0].count('= marked note, color=') == 3
+
+    writer = HumdrumWriter(score)
+    writer.parallelStaves = True
+    writer.reservedRDFKernSignifiers = 'i'
+    assert writer.write(io.StringIO())
+    assert writer._rdfSignifierFallbackChosen
@@ -0,0 +1,90 @@
+import os
+import shutil
+from pathlib import Path
+
+# The things we're testing
+import music21 as m21
+import converter21
+from converter21.shared import ParseCache
+from converter21 import batchconvert
+
+converter21.register()
+
+VALID_FOLDER = Path('tests/files/valid')
+
+def test_ParseCache_hits_by_content_not_path(tmp_path):
+    cache = ParseCache(tmp_path / 'cache')
+
+    krnPath = VALID_FOLDER / 'ChopinSpring.krn'
+    movedPath = tmp_path / 'renamed.krn'
+    shutil.copyfile(krnPath, movedPath)
+
+    first = m21.converter.parse(krnPath, forceSource=True, parseCache=cache)
+    assert len(list(cache.directory.iterdir())) == 1
+
+    # same contents, different name and location: a cache hit (no new entry)
+    second = m21.converter.parse(movedPath, forceSource=True, parseCache=cache)
+    assert len(list(cache.directory.iterdir())) == 1
+    assert second is not first
+    assert len(second.recurse().notes) == len(first.recurse().notes)
+    assert second.c21_parse_err == first.c21_parse_err
+
+    # different parse options: a different entry
+    key1 = ParseCache.makeKey(krnPath.read_bytes(), 'humdrum', acceptSyntaxErrors=False)
+    key2 = ParseCache.makeKey(krnPath.read_bytes(), 'humdrum', acceptSyntaxErrors=True)
+    assert key1 != key2
+
+    meiPath = VALID_FOLDER / 'ChopinSpring.mei'
+    mei1 = m21.converter.parse(meiPath, forceSource=True, parseCache=cache)
+    mei2 = m21.converter.parse(meiPath, forceSource=True, parseCache=cache)
+    assert len(list(cache.directory.iterdir())) == 2
+    assert len(mei2.recurse().notes) == len(mei1.recurse().notes)
+
+def test_ParseCache_miss_does_not_read_the_file_again(tmp_path, monkeypatch):
+    from converter21.humdrum import HumdrumFile
+
+    krnPath = VALID_FOLDER / 'ChopinSpring.krn'
+    uncached = m21.converter.parse(krnPath, forceSource=True)
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError('the file was read again')
+    monkeypatch.setattr(HumdrumFile, 'read', fail)
+
+    cached = m21.converter.parse(
+        krnPath, forceSource=True, parseCache=ParseCache(tmp_path / 'cache')
+    )
+    assert (
+        [n.pitches for n in cached.recurse().notes]
+        == [n.pitches for n in uncached.recurse().notes]
+    )
+
+def test_ParseCache_evicts_least_recently_used(tmp_path):
+    cache = ParseCache(tmp_path / 'cache')
+    keys = [ParseCache.makeKey(str(i), 'test') for i in range(3)]
+    for key in keys:
+        cache.put(key, m21.stream.Score([m21.note.Note('C4')]))
+
+    # every get stamps a later time than the one before
+    for key in keys:
+        assert cache.get(key) is not None
+    stamps = [cache._entryPath(key).stat().st_mtime_ns for key in keys]
+    assert stamps == sorted(stamps)
+
+    # keys[1], then keys[2], then keys[0] were used (whole seconds apart, so this
+    # works even on filesystems with coarse timestamps)
+    for seconds, key in enumerate((keys[1], keys[2], keys[0])):
+        ns = (1_000_000 + seconds) * 1_000_000_000
+        os.utime(cache._entryPath(key), ns=(ns, ns))
+
+    # room for exactly the two most recently used entries
+    cache.maxBytes = sum(cache._entryPath(key).stat().st_size for key in (keys[0], keys[2]))
+    cache.evict()
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+def test_formatSupportsParseCache():
+    assert batchconvert.formatSupportsParseCache(None, 'a/b.krn')
+    assert batchconvert.formatSupportsParseCache(None, 'a/b.mei')
+    assert batchconvert.formatSupportsParseCache('humdrum', 'a/b.txt')
+    assert not batchconvert.formatSupportsParseCache(None, 'a/b.musicxml')
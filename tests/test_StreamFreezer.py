@@ -0,0 +1,50 @@
+import io
+from pathlib import Path
+
+import pytest
+
+# The things we're testing
+import music21 as m21
+import converter21
+from converter21.shared import StreamFreezer
+from converter21.shared import StreamThawer
+from converter21.shared.m21utilities import FreezeThawError
+from converter21.humdrum import HumdrumWriter
+
+converter21.register()
+
+def _exportHumdrum(score):
+    fp = io.StringIO()
+    assert HumdrumWriter(score).write(fp)
+    return fp.getvalue()
+
+def _freezeAndThaw(score, fromLiveStream):
+    frozen = StreamFreezer(score, fromLiveStream=fromLiveStream).write(zipType='zlib')
+    thawer = StreamThawer()
+    thawer.open(frozen, zipType='zlib')
+    assert thawer.stream is not None
+    return thawer.stream
+
+@pytest.mark.parametrize('fileName', ['ChopinSpring.krn', 'Haydn_180_voices.krn'])
+def test_StreamFreezer_fromLiveStream(fileName):
+    krnPath = Path('tests/files/valid') / fileName
+    score = m21.converter.parse(krnPath, forceSource=True)
+    firstNote = score.recurse().notes.first()
+    activeSite = firstNote.activeSite
+    numNotes = len(score.recurse().notes)
+
+    liveThawed = _freezeAndThaw(score, fromLiveStream=True)
+
+    # the original score has not been altered
+    assert firstNote.activeSite is activeSite
+    assert score.streamStatus.client is score
+    assert len(score.recurse().notes) == numNotes
+
+    copyThawed = _freezeAndThaw(score, fromLiveStream=False)
+    assert len(liveThawed.recurse().notes) == numNotes
+    assert len(liveThawed.spannerBundle) == len(copyThawed.spannerBundle)
+    assert _exportHumdrum(liveThawed) == _exportHumdrum(copyThawed)
+
+def test_StreamFreezer_fromLiveStream_pickle_only():
+    with pytest.raises(FreezeThawError):
+        StreamFreezer(m21.stream.Score(), fromLiveStream=True).write(fmt='jsonpickle')
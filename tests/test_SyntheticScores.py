@@ -0,0 +1,49 @@
+import pytest
+
+# The things we're testing
+from converter21 import syntheticscores
+from converter21.humdrum import HumdrumFile
+from converter21.mei import MeiReader
+
+SHAPE = {
+    'numParts': 2,
+    'numMeasures': 6,
+    'voicesPerStaff': 2,
+    'splitDensity': 0.5,
+    'tupletDensity': 0.2,
+    'tremoloDensity': 0.1,
+    'slurDensity': 0.3,
+    'numVerses': 2,
+    'seed': 7,
+}
+
+def test_makeSyntheticScore_shape():
+    import music21 as m21
+    score = syntheticscores.makeSyntheticScore(**SHAPE)
+    assert score.isWellFormedNotation()
+    assert len(score.parts) == 2
+    for part in score.parts:
+        measures = list(part.getElementsByClass(m21.stream.Measure))
+        assert len(measures) == 6
+        assert all(m.duration.quarterLength == 4 for m in measures)
+
+    # deterministic
+    again = syntheticscores.makeSyntheticScore(**SHAPE)
+    assert [n.fullName for n in again.recurse().notes] == [
+        n.fullName for n in score.recurse().notes
+    ]
+
+    with pytest.raises(ValueError):
+        syntheticscores.makeSyntheticScore(voicesPerStaff=0)
+
+def test_synthetic_exports_reimport():
+    kern = syntheticscores.syntheticHumdrum(**SHAPE)
+    assert '*^' in kern  # some measures were split into two voices
+    hf = HumdrumFile()
+    assert hf.readString(kern)
+    score = hf.createMusic21Stream()
+    assert len(score.parts) == 2
+
+    mei = syntheticscores.syntheticMei(**SHAPE)
+    score = MeiReader(mei).run()
+    assert len(score.parts) == 2
@@ -0,0 +1,39 @@
+import io
+from pathlib import Path
+
+import pytest
+
+# The things we're testing
+import music21 as m21
+import converter21
+from converter21.humdrum import HumdrumFile
+from converter21.humdrum import HumdrumWriter
+from converter21.humdrum import humdrumwriter
+
+converter21.register()
+
+TEST_FILES = [
+    'allMetadata.krn',
+    'ChopinSpring.krn',
+    'dynamicsStopStart.krn',
+    'Haydn_180_voices.krn',
+    'REHAboveAndBelowSystem_Bach.krn',
+    'internalTremolo.krn',  # (exports via HumdrumFile either way)
+]
+
+@pytest.mark.parametrize('fileName', TEST_FILES)
+def test_TextOnlyHumdrumFile_export_matches_HumdrumFile_export(fileName, monkeypatch):
+    krnPath = Path('tests/files/valid') / fileName
+
+    # (export can modify the score, so we parse a fresh one for each export)
+    score = m21.converter.parse(krnPath, format='humdrum', forceSource=True)
+    textOnly = io.StringIO()
+    assert HumdrumWriter(score).write(textOnly)
+
+    # force HumdrumWriter to export via a full HumdrumFile
+    monkeypatch.setattr(humdrumwriter, 'TextOnlyHumdrumFile', HumdrumFile)
+    score = m21.converter.parse(krnPath, format='humdrum', forceSource=True)
+    fullFile = io.StringIO()
+    assert HumdrumWriter(score).write(fullFile)
+
+    assert textOnly.getvalue() == fullFile.getvalue()
@@ -0,0 +1,61 @@
+import io
+from xml.etree.ElementTree import TreeBuilder, ElementTree, indent
+
+# The things we're testing
+import music21 as m21
+from converter21.shared import XmlStreamWriter
+from converter21.mei import MeiWriter
+
+def emitTestDocument(tb):
+    tb.start('mei', {'xmlns': 'http://www.music-encoding.org/ns/mei', 'meiversion': '5.0+CMN'})
+    tb.start('meiHead', {})
+    tb.start('title', {'xml:lang': 'en', 'type': 'a "quoted" <title>'})
+    tb.data('Fish & Chips')
+    tb.end('title')
+    tb.start('empty', {})
+    tb.end('empty')
+    tb.start('spaces', {})
+    tb.data('   ')
+    tb.end('spaces')
+    tb.end('meiHead')
+    tb.start('music', {})
+    tb.data('  \n ')
+    tb.start('section', {})
+    for i in range(3):
+        tb.start('measure', {'n': str(i + 1)})
+        tb.start('staff', {'n': '1'})
+        tb.start('dir', {})
+        tb.data('mixed ')
+        tb.start('rend', {'fontweight': 'bold'})
+        tb.data('content')
+        tb.end('rend')
+        tb.data(' tail')
+        tb.end('dir')
+        tb.end('staff')
+        tb.end('measure')
+    tb.end('section')
+    tb.end('music')
+    tb.end('mei')
+
+def test_XmlStreamWriter_matches_ElementTree():
+    tb = TreeBuilder()
+    emitTestDocument(tb)
+    root = tb.close()
+    indent(root, space='   ', level=0)
+    expected = io.StringIO()
+    ElementTree(root).write(expected, encoding='unicode')
+
+    actual = io.StringIO()
+    stb = XmlStreamWriter(actual, space='   ')
+    emitTestDocument(stb)
+    assert stb.close().tag == 'mei'
+
+    assert actual.getvalue() == expected.getvalue()
+
+def test_MeiWriter_streams_measures():
+    score = m21.converter.parse('tinyNotation: 4/4 c4 d e f g1 a2 b')
+    output = io.StringIO()
+    assert MeiWriter(score).write(output)
+    text = output.getvalue()
+    assert text.count('<measure') == 3
+    assert text.endswith('</mei>\n')